@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 import time
 
 from app.core.auth import auth_handler
-from app.database.db import get_db
+from app.database.db import get_async_db
+from app.core.principals import Principal
 from app.models.users import User
 from app.schemas.users import UserCreate, UserUpdate, UserResponse, Token, UserLogin
 from app.dependencies import get_current_active_user
-from app.utils.logging import create_log
+from app.utils.logging import acreate_log
 
 
 router = APIRouter(
@@ -17,14 +19,14 @@ router = APIRouter(
 )
 
 @router.post("/register", response_model=UserResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new User."""
     start_time = time.perf_counter()
     try:
-        if db.query(User).filter(User.email == user.email).first():
+        if await db.scalar(select(User).where(User.email == user.email)):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
         
-        if db.query(User).filter(User.username == user.username).first():
+        if await db.scalar(select(User).where(User.username == user.username)):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already taken")
         
         hashed_password = auth_handler.get_password_hash(user.password)
@@ -40,19 +42,11 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         )
 
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-        total_time = time.perf_counter() - start_time
-        create_log(
-            db=db,
-            log_name="user_register",
-            log_type="PERF",
-            function_name="register",
-            time_taken=total_time
-        )
+        await db.commit()
+        await db.refresh(new_user)
         return new_user
     except Exception as e:
-        create_log(
+        await acreate_log(
             db=db,
             log_name="user_register_failed",
             log_type="ERROR",
@@ -62,7 +56,7 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     finally:
         total_time = time.perf_counter() - start_time
-        create_log(
+        await acreate_log(
             db=db,
             log_name="user_register",
             log_type="PERF",
@@ -71,12 +65,12 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         )        
 
 @router.post("/login", response_model=Token)
-async def login(user: UserLogin, response: Response, db: Session = Depends(get_db)):
+async def login(user: UserLogin, response: Response, db: AsyncSession = Depends(get_async_db)):
     """Login User and return JWT token"""
     start_time = time.perf_counter()
 
     try:
-        db_user = db.query(User).filter(User.email == user.email).first()
+        db_user = await db.scalar(select(User).where(User.email == user.email))
         
         if not db_user or not auth_handler.verify_password(user.password, db_user.hashed_password):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
@@ -105,7 +99,7 @@ async def login(user: UserLogin, response: Response, db: Session = Depends(get_d
         
         return token_response
     except Exception as e:
-        create_log(
+        await acreate_log(
             db=db,
             log_name="user_login_failed",
             log_type="ERROR",
@@ -116,7 +110,7 @@ async def login(user: UserLogin, response: Response, db: Session = Depends(get_d
     
     finally:
         total_time = time.perf_counter() - start_time
-        create_log(
+        await acreate_log(
             db=db,
             log_name="user_login",
             log_type="PERF",
@@ -125,11 +119,11 @@ async def login(user: UserLogin, response: Response, db: Session = Depends(get_d
         )
 
 @router.post("/logout")
-async def logout(response: Response, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
+async def logout(response: Response, current_user: Principal = Depends(get_current_active_user), db: AsyncSession = Depends(get_async_db)):
     """Logout the user"""
     response.delete_cookie("access_token")
 
-    create_log(
+    await acreate_log(
         db=db,
         log_name="user_logout",
         log_type="INFO",
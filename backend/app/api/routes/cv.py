@@ -1,72 +1,91 @@
 import time
-from fastapi import APIRouter, Depends, FastAPI, UploadFile, File, HTTPException
+from hashlib import sha256
+from typing import Optional
+from fastapi import APIRouter, Depends, FastAPI, UploadFile, File, HTTPException, Header, Query, Response, status
 from fastapi.concurrency import run_in_threadpool
-from app.core.parser import parser
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 
-from app.core.extractor import cv_extractor
-from app.schemas.cvs import CVResponse
-from app.models.cvs import CV, CVEmbedding
-from app.dependencies import get_current_active_user
-from app.models.users import User
-from app.database.db import get_db
-from app.core.vector_store import vector_store
-from app.utils.logging import create_log
+from app.core.config import settings
+from app.core.deadline import Deadline, DeadlineExceeded
+from app.core.ingestion import run_pipeline, build_cv, ingestion_workers
+from app.core.metrics import stage_timer, uploads_in_flight
+from app.schemas.cvs import CVResponse, CVProcessingAccepted, CVProcessingJobResponse
+from app.models.cvs import CV
+from app.models.cv_processing import CVProcessingJob
+from app.dependencies import get_current_active_user, profile_request
+from app.core.principals import Principal
+from app.database.db import get_async_db, get_db
+from app.utils.logging import acreate_log
+from app.utils.pagination import keyset_select, parse_fields, rows_to_dicts, split_page
+from app.utils.serialization import FastJSONResponse
 
 router = APIRouter(
     prefix="/cvs",
     tags=["cvs"]
 )  
 
-@router.post("/upload")
-async def upload_pdf(file: UploadFile = File(...), current_user:User= Depends(get_current_active_user), db: Session = Depends(get_db)):
-    """Upload the cv in pdf form and parse into a json object"""
+CV_FIELDS = (*CVResponse.model_fields, "created_at")
+
+@router.post(
+    "/upload",
+    responses={202: {"model": CVProcessingAccepted}},
+    dependencies=[Depends(profile_request)]
+)
+async def upload_pdf(
+    file: UploadFile = File(...),
+    mode: Optional[str] = Query(None, pattern="^(sync|async)$"),
+    idempotency_key: Optional[str] = Header(None, max_length=128),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Upload the cv in pdf form and parse into a json object.
+
+    In async mode the upload is queued and answered with 202 and a processing
+    id to poll at /cvs/jobs/{processing_id}. Re-sending the same file (or the
+    same Idempotency-Key header) returns the existing processing job.
+    """
     start_time = time.perf_counter()
+    deadline = Deadline(settings.CV_UPLOAD_DEADLINE_SECONDS)
     if file.content_type != "application/pdf":
         raise HTTPException(status_code=400, detail="Only PDF files allowed")
 
+    if (mode or settings.CV_UPLOAD_MODE) == "async":
+        return await enqueue_pdf(file, idempotency_key, current_user, db)
+
+    uploads_in_flight.labels("sync").inc()
     try:
         pdf_bytes = await file.read()
 
-        result = await run_in_threadpool(
-            parser.parse_pdf,
+        extracted, embedding, _ = await run_in_threadpool(
+            run_pipeline,
             pdf_bytes,
-            file.filename
+            file.filename,
+            None,
+            deadline
         )
-        cv_text = result['raw_text']
-        extracted = cv_extractor.extract(cv_text)
-        cv = CV(
-            user_id=current_user.id,  
-            name=extracted.get("name"),
-            email=extracted.get("email"),
-            phone=extracted.get("phone"),
-            location=extracted.get("location"),
-            summary=extracted.get("summary"),
-            work=extracted.get("work"),
-            education=extracted.get("education"),
-            skills=extracted.get("skills"),
-            languages=extracted.get("languages"),
-            certifications=extracted.get("certifications"),
-            category=extracted.get("category"),
-        )
-        db.add(cv)
-        db.commit()
-        db.refresh(cv)
-
-        embeddings = vector_store.generate_embedding(cv_text)
-        cv_embedding = CVEmbedding(
-            cv_id=cv.id,    
-            embedding=embeddings
-        )
-        
-        db.add(cv_embedding)
-        db.commit()
-        db.refresh(cv_embedding)
-        
+        db.add(build_cv(current_user.id, extracted, embedding))
+        await db.commit()
+
         return {"extracted_data": extracted}
 
+    except DeadlineExceeded as e:
+        await acreate_log(
+            db=db,
+            log_name="cv_upload_timeout",
+            log_type="ERROR",
+            function_name="upload_pdf",
+            description=str(e)
+        )
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
+
     except Exception as e:
-        create_log(
+        await acreate_log(
             db=db,
             log_name="cv_upload_failed",
             log_type="ERROR",
@@ -75,9 +94,9 @@ async def upload_pdf(file: UploadFile = File(...), current_user:User= Depends(ge
         )
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        
+        uploads_in_flight.labels("sync").dec()
         total_time = time.perf_counter() - start_time
-        create_log(
+        await acreate_log(
             db=db,
             log_name="cv_upload",
             log_type="PERF",
@@ -86,8 +105,66 @@ async def upload_pdf(file: UploadFile = File(...), current_user:User= Depends(ge
         )
 
 
+async def enqueue_pdf(file: UploadFile, idempotency_key: Optional[str], current_user: Principal, db: AsyncSession) -> JSONResponse:
+    """Queue an uploaded PDF for the ingestion workers"""
+    pdf_bytes = await file.read()
+    key = idempotency_key or sha256(pdf_bytes).hexdigest()
+
+    job = await db.scalar(select(CVProcessingJob).where(
+        CVProcessingJob.user_id == current_user.id,
+        CVProcessingJob.idempotency_key == key
+    ))
+
+    if job is None:
+        job = CVProcessingJob(
+            user_id=current_user.id,
+            idempotency_key=key,
+            filename=file.filename,
+            pdf_bytes=pdf_bytes,
+            max_attempts=settings.INGESTION_MAX_ATTEMPTS,
+        )
+        db.add(job)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # A concurrent request with the same key won the insert
+            await db.rollback()
+            job = await db.scalar(select(CVProcessingJob).where(
+                CVProcessingJob.user_id == current_user.id,
+                CVProcessingJob.idempotency_key == key
+            ))
+    elif job.status == "failed":
+        # Explicit re-submission of a failed upload starts a fresh set of attempts
+        job.status = "queued"
+        job.stage = "queued"
+        job.attempts = 0
+        job.error = None
+        job.pdf_bytes = pdf_bytes
+        job.next_attempt_at = func.now()
+        await db.commit()
+        await db.refresh(job)
+
+    ingestion_workers.notify()
+
+    status_url = f"{settings.API_PREFIX}{router.prefix}/jobs/{job.id}"
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=CVProcessingAccepted(processing_id=job.id, status=job.status, status_url=status_url).model_dump(),
+        headers={"Location": status_url}
+    )
+
+
+@router.get("/jobs/{processing_id}", response_model=CVProcessingJobResponse)
+def read_processing_job(processing_id: str, current_user: Principal = Depends(get_current_active_user), db: Session = Depends(get_db)):
+    """Report stage, timings and result of a queued CV upload"""
+    job = db.query(CVProcessingJob).filter(CVProcessingJob.id == processing_id).first()
+    if job is None or (job.user_id != current_user.id and current_user.role != "admin"):
+        raise HTTPException(status_code=404, detail="Processing job not found")
+    return job
+
+
 @router.get("/{cv_id}", response_model=CVResponse)
-def read_cv(cv_id: int, current_user:User= Depends(get_current_active_user), db: Session = Depends(get_db)):
+def read_cv(cv_id: int, current_user: Principal = Depends(get_current_active_user), db: Session = Depends(get_db)):
     cv = db.query(CV).filter(CV.id == cv_id).first()
     if cv is None:
         raise HTTPException(status_code=404, detail="CV not found")
@@ -95,7 +172,35 @@ def read_cv(cv_id: int, current_user:User= Depends(get_current_active_user), db:
 
 
 @router.get("/", response_model=list[CVResponse])
-def read_cvss(skip: int = 0, limit: int = 100, current_user:User= Depends(get_current_active_user), db: Session = Depends(get_db)):
-    cvs = db.query(CV).offset(skip).limit(limit).all()
+def read_cvss(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieve CVs, newest first.
+
+    Paged with the X-Next-Cursor header like /jobs; fields= selects only the
+    given columns, which avoids loading the large JSONB ones.
+    """
+    try:
+        columns = parse_fields(fields, CV_FIELDS)
+        if columns:
+            stmt = keyset_select(select(*[getattr(CV, column) for column in columns]), CV, cursor, limit)
+            cvs, next_cursor = split_page(db.execute(stmt).all(), limit)
+        else:
+            stmt = keyset_select(select(CV), CV, cursor, limit)
+            cvs, next_cursor = split_page(db.scalars(stmt).all(), limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if columns:
+        with stage_timer("serialization"):
+            return FastJSONResponse(rows_to_dicts(cvs), headers=headers)
+    response.headers.update(headers)
     return cvs
 
@@ -1,50 +1,58 @@
-from datetime import datetime
 import time
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
-from app.database.db import get_db, SessionLocal
-from app.models.jobs import Job, JobEmbedding
-from app.schemas.jobs import JobCreate, JobUpdate, JobResponse
+from app.database.db import get_async_db, get_db
+from app.models.jobs import Job, JobEmbedding, upsert_job_embeddings
+from app.core.config import settings
+from app.schemas.jobs import JobCreate, JobUpdate, JobResponse, BulkJobInsertItem, BulkJobInsertResponse
 from app.dependencies import get_current_active_user
-from app.models.users import User
+from app.core.principals import Principal
+from app.core.events import job_events
+from app.core.metrics import stage_timer
+from app.core.reembedding import job_reembedder
 from app.core.vector_store import vector_store
-from app.utils.logging import create_log
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.utils.logging import acreate_log, create_log
+from app.utils.pagination import keyset_select, parse_fields, rows_to_dicts, split_page
+from app.utils.serialization import dumps, objects_to_dicts
 
 router = APIRouter(
     prefix="/jobs",
     tags=["jobs"]
 )
 
+JOB_FIELDS = tuple(JobResponse.model_fields)
+
 
 @router.post("/", response_model=JobResponse)
-def create_job(job: JobCreate, current_user:User= Depends(get_current_active_user), db: Session = Depends(get_db)):
+async def create_job(job: JobCreate, current_user: Principal = Depends(get_current_active_user), db: AsyncSession = Depends(get_async_db)):
     """Create a new job"""
     start_time = time.perf_counter()
     try:
-        db_job = Job(**job.model_dump())
-        db.add(db_job)
-        db.commit()
-        db.refresh(db_job)
+        # Embedding is CPU bound, keep it off the event loop
+        embeddings = await run_in_threadpool(vector_store.generate_embedding, job.to_embedding_text())
 
-        job_text = job.to_embedding_text()
-
-        embeddings = vector_store.generate_embedding(job_text)
-        job_embedding = JobEmbedding(
-                job_id=db_job.id,    
-                embedding=embeddings,
-                model_name = ""
-        )
-            
-        db.add(job_embedding)
-        db.commit()
-        db.refresh(job_embedding)
+        db_job = Job(**job.model_dump(), embedding_hash=job.embedding_hash())
+        db_job.embeddings.append(JobEmbedding(
+            embedding=embeddings,
+            model_name=settings.EMBEDDING_MODEL
+        ))
+        db.add(db_job)
+        await db.commit()
+        await db.refresh(db_job)
+        job_events.publish("created", [db_job.id])
         return db_job
     
     except Exception as e:
-        create_log(
+        await db.rollback()
+        await acreate_log(
             db=db,
             log_name="job_create_failed",
             log_type="ERROR",
@@ -54,7 +62,7 @@ def create_job(job: JobCreate, current_user:User= Depends(get_current_active_use
 
     finally:
         total_time = time.perf_counter() - start_time
-        create_log(
+        await acreate_log(
             db=db,
             log_name="job_create",
             log_type="PERF",
@@ -65,14 +73,78 @@ def create_job(job: JobCreate, current_user:User= Depends(get_current_active_use
 
 
 @router.get("/", response_model=list[JobResponse])
-def read_jobs(skip: int = 0, limit: int = 100, current_user:User= Depends(get_current_active_user), db: Session = Depends(get_db)):
-    """Retrieve jobs"""
+async def read_jobs(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    fields: Optional[str] = None,
+    industry: Optional[str] = None,
+    location: Optional[str] = None,
+    min_salary: Optional[float] = None,
+    max_salary: Optional[float] = None,
+    expired: Optional[bool] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retrieve jobs, newest first.
+
+    The next page is requested by passing the X-Next-Cursor response header
+    back as cursor= (the header is absent on the last page). fields= takes a
+    comma separated list of columns to return instead of the full job.
+
+    The ETag covers the query and the id and updated_at of every job on the
+    page, so a repeated poll gets a 304 when the page has not changed.
+    """
     strart_time = time.perf_counter()
     try:
-        jobs = db.query(Job).offset(skip).limit(limit).all()
-        return jobs
+        try:
+            columns = parse_fields(fields, JOB_FIELDS)
+            stmt = select(*[getattr(Job, column) for column in columns]) if columns else select(Job)
+
+            if industry is not None:
+                stmt = stmt.where(Job.company_industry == industry)
+            if location is not None:
+                stmt = stmt.where(Job.location == location)
+            if min_salary is not None:
+                stmt = stmt.where(Job.salary >= min_salary)
+            if max_salary is not None:
+                stmt = stmt.where(Job.salary <= max_salary)
+            if expired is not None:
+                stmt = stmt.where(Job.is_expired == expired)
+
+            stmt = keyset_select(stmt, Job, cursor, limit)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        if columns:
+            jobs, next_cursor = split_page((await db.execute(stmt)).all(), limit)
+        else:
+            jobs, next_cursor = split_page((await db.scalars(stmt)).all(), limit)
+
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        # Full jobs are versioned by updated_at, so a 304 skips encoding them.
+        # Projected rows may not carry it and are hashed once encoded
+        if columns:
+            with stage_timer("serialization"):
+                body = dumps(rows_to_dicts(jobs))
+            etag = make_etag("jobs", request.url.query, next_cursor, body)
+        else:
+            body = None
+            etag = make_etag("jobs", request.url.query, next_cursor, *((job.id, job.updated_at) for job in jobs))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        if body is None:
+            # Rows straight from the jobs table: encode them without
+            # validating each one against JobResponse
+            with stage_timer("serialization"):
+                body = dumps(objects_to_dicts(jobs, JOB_FIELDS))
+        return Response(body, media_type="application/json", headers={**headers, **etag_headers(etag)})
+    except HTTPException:
+        raise
     except Exception as e:
-        create_log(
+        await acreate_log(
             db=db,
             log_name="read_jobs_failed",
             log_type="ERROR",
@@ -81,7 +153,7 @@ def read_jobs(skip: int = 0, limit: int = 100, current_user:User= Depends(get_cu
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))   
     finally:
         total_time = time.perf_counter() - strart_time
-        create_log(
+        await acreate_log(
             db=db,
             log_name="read_jobs",
             log_type="PERF",
@@ -91,16 +163,28 @@ def read_jobs(skip: int = 0, limit: int = 100, current_user:User= Depends(get_cu
 
 
 @router.get("/{job_id}", response_model=JobResponse)
-def read_job(job_id: int, current_user:User= Depends(get_current_active_user), db: Session = Depends(get_db)):
-    """Retrieve a job by ID"""
+async def read_job(
+    job_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Retrieve a job by ID. Answers 304 while its updated_at is unchanged"""
     start_time = time.perf_counter()
     try:
-        job = db.query(Job).filter(Job.id == job_id).first()
+        job = await db.get(Job, job_id)
         if job is None:
             raise HTTPException(status_code=404, detail="Job not found")
+        etag = make_etag("job", job.id, job.updated_at)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        response.headers.update(etag_headers(etag))
         return job
+    except HTTPException:
+        raise
     except Exception as e:
-        create_log(
+        await acreate_log(
             db=db,
             log_name="read_job_failed",
             log_type="ERROR",
@@ -109,7 +193,7 @@ def read_job(job_id: int, current_user:User= Depends(get_current_active_user), d
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     finally:
         total_time = time.perf_counter() - start_time
-        create_log(
+        await acreate_log(
             db=db,
             log_name="read_job",
             log_type="PERF",
@@ -119,21 +203,42 @@ def read_job(job_id: int, current_user:User= Depends(get_current_active_user), d
 
 
 @router.put("/{job_id}", response_model=JobResponse)
-def update_job(job_id: int, job_update: JobUpdate, current_user:User= Depends(get_current_active_user), db: Session = Depends(get_db)):
-    """Update a job by ID"""
+async def update_job(job_id: int, job_update: JobUpdate, current_user: Principal = Depends(get_current_active_user), db: AsyncSession = Depends(get_async_db)):
+    """
+    Update a job by ID.
+
+    The embedding is refreshed in the background, and only when the text it
+    is computed from actually changed. is_expired is recomputed from
+    expires_at, so moving it into the future revives an expired job.
+    """
     start_time = time.perf_counter()
     try:
-        job = db.query(Job).filter(Job.id == job_id).first()
-        job.updated_at = datetime.utcnow()
+        job = await db.get(Job, job_id)
         if job is None:
             raise HTTPException(status_code=404, detail="Job not found")
         for key, value in job_update.model_dump(exclude_unset=True).items():
             setattr(job, key, value)
-        db.commit()
-        db.refresh(job)
+        # Compared with the database clock, like the expiry sweeper does
+        now = await db.scalar(select(func.localtimestamp()))
+        job.is_expired = job.expires_at is not None and job.expires_at <= now
+        # Mirrored onto the embeddings for the active-catalog partial indexes
+        await db.execute(
+            update(JobEmbedding)
+            .where(JobEmbedding.job_id == job.id, JobEmbedding.is_expired != job.is_expired)
+            .values(is_expired=job.is_expired)
+        )
+        await db.commit()
+        await db.refresh(job)
+
+        job_events.publish("updated", [job.id])
+        if JobCreate.model_validate(job).embedding_hash() != job.embedding_hash:
+            job_reembedder.enqueue([job.id])
         return job
+    except HTTPException:
+        raise
     except Exception as e:
-        create_log(
+        await db.rollback()
+        await acreate_log(
             db=db,
             log_name="update_job_failed",
             log_type="ERROR",
@@ -142,7 +247,7 @@ def update_job(job_id: int, job_update: JobUpdate, current_user:User= Depends(ge
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     finally:
         total_time = time.perf_counter() - start_time
-        create_log(
+        await acreate_log(
             db=db,
             log_name="update_job",
             log_type="PERF",
@@ -151,18 +256,22 @@ def update_job(job_id: int, job_update: JobUpdate, current_user:User= Depends(ge
         )
 
 @router.delete("/{job_id}")
-def delete_job(job_id: int, current_user:User= Depends(get_current_active_user), db: Session = Depends(get_db)):
+async def delete_job(job_id: int, current_user: Principal = Depends(get_current_active_user), db: AsyncSession = Depends(get_async_db)):
     """Delete a job by ID"""
     start_time = time.perf_counter()
     try:
-        job = db.query(Job).filter(Job.id == job_id).first()
+        job = await db.get(Job, job_id)
         if job is None:
             raise HTTPException(status_code=404, detail="Job not found")
-        db.delete(job)
-        db.commit()
+        await db.delete(job)
+        await db.commit()
+        job_events.publish("deleted", [job_id])
         return {"message": "Job deleted successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
-        create_log(
+        await db.rollback()
+        await acreate_log(
             db=db,
             log_name="delete_job_failed",
             log_type="ERROR",
@@ -171,7 +280,7 @@ def delete_job(job_id: int, current_user:User= Depends(get_current_active_user),
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     finally:
         total_time = time.perf_counter() - start_time
-        create_log(
+        await acreate_log(
             db=db,
             log_name="delete_job",
             log_type="PERF",
@@ -179,20 +288,58 @@ def delete_job(job_id: int, current_user:User= Depends(get_current_active_user),
             time_taken=total_time
         )
 
-@router.post("/bulk.insert", response_model=List[JobResponse])
-async def create_jobs(jobs: List[JobCreate], db: Session = Depends(get_db)):
-    """Create multiple jobs in bulk"""
+@router.post("/bulk.insert", response_model=BulkJobInsertResponse)
+def create_jobs(jobs: List[Dict[str, Any]], db: Session = Depends(get_db)):
+    """
+    Create multiple jobs in bulk.
+
+    Items are validated one by one; invalid items are reported and skipped.
+    Valid jobs and their embeddings are inserted in a single transaction.
+    """
     start_time = time.perf_counter()
     try:
-        job_data = [job.model_dump() for job in jobs]
+        items = []
+        valid_jobs = []
+        for index, raw_job in enumerate(jobs):
+            try:
+                valid_jobs.append((index, JobCreate.model_validate(raw_job)))
+            except ValidationError as e:
+                items.append(BulkJobInsertItem(index=index, status="invalid", error=str(e)))
 
-        db.bulk_insert_mappings(Job, job_data)
-        db.commit()
+        if valid_jobs:
+            # Embed before opening the write transaction so it stays short
+            embeddings = vector_store.generate_batch_embeddings(
+                [job.to_embedding_text() for _, job in valid_jobs],
+                batch_size=settings.EMBEDDING_BATCH_SIZE
+            )
 
-        inserted_jobs = db.query(Job).order_by(Job.id.desc()).limit(len(jobs)).all()
+            inserted_jobs = db.scalars(
+                insert(Job).returning(Job, sort_by_parameter_order=True),
+                [{**job.model_dump(), "embedding_hash": job.embedding_hash()} for _, job in valid_jobs]
+            ).all()
 
-        return inserted_jobs
+            db.execute(upsert_job_embeddings([
+                {"job_id": db_job.id, "embedding": embedding, "model_name": settings.EMBEDDING_MODEL, "is_expired": False}
+                for db_job, embedding in zip(inserted_jobs, embeddings)
+            ]))
+
+            # Build responses before commit expires the returned rows
+            items.extend(
+                BulkJobInsertItem(index=index, status="created", job=JobResponse.model_validate(db_job))
+                for (index, _), db_job in zip(valid_jobs, inserted_jobs)
+            )
+            created_ids = [db_job.id for db_job in inserted_jobs]
+            db.commit()
+            job_events.publish("created", created_ids)
+
+        items.sort(key=lambda item: item.index)
+        return BulkJobInsertResponse(
+            created=len(valid_jobs),
+            failed=len(jobs) - len(valid_jobs),
+            items=items
+        )
     except Exception as e:
+        db.rollback()
         create_log(
             db=db,
             log_name="bulk_job_create_failed",
@@ -1,15 +1,24 @@
 import time
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database.db import get_db
-from app.dependencies import get_current_active_user
-from app.models.cvs import CV
-from app.models.jobs import Job
+import numpy as np
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.db import get_async_db
+from app.dependencies import get_current_active_user, profile_request
+from app.models.cvs import CV, CVEmbedding
 from app.schemas.recommendations import JobRecommendationResponse
 from app.dependencies import get_current_active_user
-from typing import List
+from typing import List, Optional
 from app.core.recommender import job_recommender
-from app.utils.logging import create_log
+from app.core.config import settings
+from app.core.job_catalog import job_catalog
+from app.core.metrics import stage_timer
+from app.core.recommendation_cache import recommendation_cache
+from app.core.vector_store import vector_store
+from app.utils.logging import acreate_log
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.utils.serialization import dumps
 
 router = APIRouter(
     prefix="/recommendations",
@@ -17,39 +26,105 @@ router = APIRouter(
 )
 
 
-@router.get("/{cv_id}", response_model=List[JobRecommendationResponse])
+@router.get(
+    "/{cv_id}",
+    response_model=List[JobRecommendationResponse],
+    dependencies=[Depends(profile_request)]
+)
 async def get_recommendations(
     cv_id: int,
     top_k: int = 10,
+    mode: str = Query("category", pattern="^(category|hybrid)$"),
+    if_none_match: Optional[str] = Header(None),
     current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get job recommendations for a CV"""
+    """
+    Get job recommendations for a CV.
+
+    mode=category scores the nearest jobs of the CV's category, taken from
+    that category's vector index and its catalog snapshot. mode=hybrid
+    (also used for CVs in HYBRID_RETRIEVAL_CATEGORIES, e.g. "Other", which
+    the extractor falls back to) takes the nearest jobs of every category
+    from the vector index and re-ranks only those, with a boost for the CV's
+    category instead of a filter.
+
+    The ETag is derived from the CV and the watermark of the jobs it is
+    matched against (its category's snapshot, or the whole catalog in hybrid
+    mode). While neither changes, a matching If-None-Match gets a 304 and
+    other requests get the cached response, without scoring again.
+    """
     start_time = time.perf_counter()
-    cv = db.query(CV).filter(
-        CV.id == cv_id
-    ).first()
+    cv = await db.get(CV, cv_id)
     if not cv:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="CV not found"
         )
     
-    category = cv.category
-
-    jobs = db.query(Job).filter(
-        Job.company_industry == category,
-        Job.is_expired == False
-    ).all()
-    jobs_dict = [job.__dict__ for job in jobs]
     try:
-        recommendations = job_recommender.match_cv_to_jobs(cv.__dict__, jobs_dict, top_k=top_k)
+        hybrid = mode == "hybrid" or not cv.category or cv.category in settings.HYBRID_RETRIEVAL_CATEGORIES
+        # CVs are never updated in place, so id and created_at version them
+        if hybrid:
+            etag = make_etag(
+                "recommendations", "hybrid", cv.id, cv.created_at, cv.category, top_k, settings.EMBEDDING_MODEL,
+                settings.HYBRID_CANDIDATES, settings.HYBRID_CATEGORY_BOOST, *await job_catalog.watermark(db)
+            )
+        else:
+            snapshot = await job_catalog.get(db, cv.category)
+            etag = make_etag(
+                "recommendations", cv.id, cv.created_at, top_k, settings.EMBEDDING_MODEL,
+                settings.JOB_SHARD_CANDIDATES, snapshot.category, *snapshot.watermark
+            )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        cache_key = (cv.id, top_k, hybrid)
+        body = recommendation_cache.get(cache_key, etag)
+        if body is not None:
+            return Response(body, media_type="application/json", headers=etag_headers(etag))
+
+        cv_data = {column.key: getattr(cv, column.key) for column in CV.__table__.columns}
+        if hybrid:
+            candidates = await vector_store.anearest_jobs_for_cv(db, cv.id, max(settings.HYBRID_CANDIDATES, top_k))
+            records, education = await job_catalog.records(db, {job_id: updated_at for job_id, _, updated_at in candidates})
+            similarity = {job_id: score for job_id, score, _ in candidates}
+            semantic_scores = np.asarray([similarity[record.id] for record in records], dtype=np.float32)
+            # Only the candidates are scored, however large the catalog
+            recommendations = await run_in_threadpool(
+                job_recommender.match_cv_to_candidates, cv_data, records, semantic_scores, education, top_k, settings.HYBRID_CATEGORY_BOOST
+            )
+        else:
+            candidates = await vector_store.anearest_jobs_for_cv(db, cv.id, max(settings.JOB_SHARD_CANDIDATES, top_k), cv.category)
+            similarity = {job_id: score for job_id, score, _ in candidates}
+            # Jobs added since the snapshot was taken are left out until it is refreshed
+            rows = snapshot.rows(similarity)
+            if rows:
+                records = [snapshot.records[row] for row in rows]
+                semantic_scores = np.asarray([similarity[record.id] for record in records], dtype=np.float32)
+                # Scoring embeds the CV's education text, which is CPU bound
+                recommendations = await run_in_threadpool(
+                    job_recommender.match_cv_to_candidates, cv_data, records, semantic_scores, snapshot.education_embeddings[rows], top_k
+                )
+            else:
+                # No CV embedding or no embedded job in the category: score
+                # the whole snapshot without semantic similarity
+                cv_embedding = await db.scalar(
+                    select(CVEmbedding.embedding)
+                    .where(CVEmbedding.cv_id == cv.id, CVEmbedding.model_name == settings.EMBEDDING_MODEL)
+                )
+                recommendations = await run_in_threadpool(
+                    job_recommender.match_cv_to_snapshot, cv_data, cv_embedding, snapshot, top_k
+                )
 
-        recommendations = [JobRecommendationResponse(**rec) for rec in recommendations]
-        return recommendations
+        # Built from the catalog's pre-encoded jobs, so no response_model
+        # validation is needed
+        with stage_timer("serialization"):
+            body = dumps(recommendations)
+        recommendation_cache.set(cache_key, etag, body)
+        return Response(body, media_type="application/json", headers=etag_headers(etag))
     
     except Exception as e:
-        create_log(
+        await acreate_log(
             db=db,
             log_name="get_recommendations_failed",
             log_type="ERROR",
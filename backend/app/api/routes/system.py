@@ -0,0 +1,173 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.circuit_breaker import circuit_breakers
+from app.core.config import settings
+from app.core.job_catalog import job_catalog
+from app.core.job_shards import job_shard_indexer
+from app.core.log_rollups import log_rollups
+from app.core.principals import Principal, principal_cache
+from app.core.profiling import RequestProfile, request_profiles
+from app.core.recommendation_cache import recommendation_cache
+from app.database.db import get_async_db, get_db
+from app.dependencies import get_current_admin
+from app.models.system_logs import SystemLogRollup
+from app.utils.logging import log_writer
+
+router = APIRouter(
+    prefix="/system",
+    tags=["system"]
+)
+
+
+@router.get("/circuit-breakers", response_model=List[Dict])
+def read_circuit_breakers(current_user: Principal = Depends(get_current_admin)):
+    """State and counters of every circuit breaker"""
+    return [breaker.snapshot() for breaker in circuit_breakers.values()]
+
+
+@router.get("/log-writer", response_model=Dict)
+def read_log_writer(current_user: Principal = Depends(get_current_admin)):
+    """Queue depth and written/dropped/failed counters of the system log writer"""
+    return log_writer.stats()
+
+
+@router.get("/auth-cache", response_model=Dict)
+def read_auth_cache(current_user: Principal = Depends(get_current_admin)):
+    """Size and hit/miss counters of the authenticated principal cache"""
+    return principal_cache.stats()
+
+
+@router.get("/recommendation-cache", response_model=Dict)
+def read_recommendation_cache(current_user: Principal = Depends(get_current_admin)):
+    """Size and hit/miss counters of the cached recommendation responses"""
+    return recommendation_cache.stats()
+
+
+@router.get("/log-rollups", response_model=List[Dict])
+def read_log_rollups(
+    resolution: str = Query("hour", pattern="^(minute|hour)$"),
+    function_name: Optional[str] = None,
+    log_name: Optional[str] = None,
+    log_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(500, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """
+    Per-minute or per-hour system log aggregates, newest bucket first.
+
+    Times (total_time, p50, p95, p99, max_time) are in seconds and cover the
+    rows that had a time_taken.
+    """
+    stmt = select(SystemLogRollup).where(SystemLogRollup.resolution == resolution)
+    if function_name:
+        stmt = stmt.where(SystemLogRollup.function_name == function_name)
+    if log_name:
+        stmt = stmt.where(SystemLogRollup.log_name == log_name)
+    if log_type:
+        stmt = stmt.where(SystemLogRollup.log_type == log_type)
+    if since:
+        stmt = stmt.where(SystemLogRollup.bucket_start >= since)
+    if until:
+        stmt = stmt.where(SystemLogRollup.bucket_start < until)
+
+    rollups = db.scalars(
+        stmt.order_by(SystemLogRollup.bucket_start.desc(), SystemLogRollup.function_name).limit(limit)
+    ).all()
+    return [
+        {column.key: getattr(rollup, column.key) for column in SystemLogRollup.__table__.columns if column.key != "id"}
+        for rollup in rollups
+    ]
+
+
+@router.post("/log-rollups/run", response_model=Dict)
+def run_log_rollups(current_user: Principal = Depends(get_current_admin)):
+    """Roll up closed buckets and apply retention now instead of on the next interval"""
+    return log_rollups.run()
+
+
+@router.get("/job-shards", response_model=Dict)
+def read_job_shards(current_user: Principal = Depends(get_current_admin)):
+    """
+    Per shard: the in-memory catalog snapshot of this worker (None until a
+    recommendation or a reload loads it) and the partial HNSW index. The
+    "all" shard is the index over every category used by hybrid retrieval.
+    """
+    snapshots = job_catalog.shards()
+    shards = []
+    for index in job_shard_indexer.status():
+        snapshot = snapshots.get(index["shard"])
+        shards.append({
+            "shard": index["shard"],
+            "snapshot": snapshot.describe() if snapshot is not None else None,
+            "index": index,
+        })
+    return {"shards": shards, "index_error": job_shard_indexer.last_error}
+
+
+def _check_shard(shard: str, shards) -> str:
+    if shard not in shards:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown job shard")
+    return shard
+
+
+@router.post("/job-shards/{category}/reload", response_model=Dict)
+async def reload_job_shard(
+    category: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """
+    Rebuild one category's in-memory snapshot from the database: now in this
+    worker, and in the other workers on their next catalog check (within
+    JOB_CATALOG_CHECK_INTERVAL_SECONDS), through the category's reload
+    generation in the database.
+    """
+    snapshot = await job_catalog.reload(db, _check_shard(category, job_shard_indexer.categories))
+    return snapshot.describe()
+
+
+@router.post("/job-shards/{shard}/reindex", response_model=Dict, status_code=status.HTTP_202_ACCEPTED)
+def reindex_job_shard(shard: str, current_user: Principal = Depends(get_current_admin)):
+    """Rebuild one shard's HNSW index concurrently, in the background"""
+    if not settings.JOB_SHARD_INDEXES_ENABLED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job shard indexes are disabled")
+    job_shard_indexer.request_reindex(_check_shard(shard, job_shard_indexer.shards))
+    return {"shard": shard, "index": job_shard_indexer.index_name(shard), "reindex_pending": True}
+
+
+@router.get("/profiles", response_model=List[Dict])
+def read_profiles(current_user: Principal = Depends(get_current_admin)):
+    """Summaries of the stored request profiles, newest first"""
+    return [profile.summary() for profile in request_profiles.list()]
+
+
+def _get_profile(profile_id: str) -> RequestProfile:
+    profile = request_profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return profile
+
+
+@router.get("/profiles/{profile_id}", response_model=Dict)
+def read_profile(
+    profile_id: str,
+    top: int = Query(50, ge=1, le=1000),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """Stage timings and the most sampled stacks of a request profile"""
+    return _get_profile(profile_id).to_dict(top)
+
+
+@router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+def read_profile_collapsed(profile_id: str, current_user: Principal = Depends(get_current_admin)):
+    """All sampled stacks in collapsed format, for flamegraph.pl or speedscope"""
+    return _get_profile(profile_id).collapsed()
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 
 from app.core.auth import auth_handler
-from app.database.db import get_db
+from app.core.principals import Principal, principal_cache
+from app.database.db import get_async_db
 from app.models.users import User
 from app.schemas.users import UserCreate, UserUpdate, UserResponse, Token, UserLogin
 from app.dependencies import get_current_user
@@ -19,14 +20,14 @@ router = APIRouter(
 async def update_user(
     user_id: int,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update user information"""
     if current_user.id != user_id and current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this user")
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
@@ -36,8 +37,11 @@ async def update_user(
     if user_update.password is not None:
         user.hashed_password = auth_handler.get_password_hash(user_update.password)
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    # Also dropped on flush; again now so a request that read the old row
+    # in between does not keep it cached
+    principal_cache.invalidate_user(user.id)
+    await db.refresh(user)
     
     return user
 
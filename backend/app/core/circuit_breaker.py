@@ -0,0 +1,94 @@
+import threading
+import time
+from typing import Dict
+
+from app.core.config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Every breaker registers itself here so its state can be reported
+circuit_breakers: Dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After failure_threshold consecutive failures the breaker opens and
+    rejects calls for reset_timeout seconds; then a single probe call is let
+    through (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.opens_total = 0
+        self.rejected_total = 0
+        self.successes_total = 0
+        self.failures_total = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        circuit_breakers[name] = self
+
+    def allow_request(self) -> bool:
+        """Whether a call may be attempted now"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.rejected_total += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.successes_total += 1
+            self.consecutive_failures = 0
+            self.state = CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures_total += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.opens_total += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def snapshot(self) -> Dict:
+        """Current state and counters"""
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "seconds_since_open": round(time.monotonic() - self.opened_at, 3) if self.opened_at else None,
+                "opens_total": self.opens_total,
+                "rejected_total": self.rejected_total,
+                "successes_total": self.successes_total,
+                "failures_total": self.failures_total,
+            }
+
+
+llm_breaker = CircuitBreaker(
+    "llm",
+    settings.LLM_BREAKER_FAILURE_THRESHOLD,
+    settings.LLM_BREAKER_RESET_SECONDS,
+)
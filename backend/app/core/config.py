@@ -1,23 +1,113 @@
 import os
 from dotenv import load_dotenv
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 load_dotenv()
 
 class Settings(BaseSettings):
     LLM_API_KEY: str = ""
-    LLM_PROVIDER: str  = "ollama"
+    LLM_PROVIDER: str  = "google"
+    LLM_MODEL: str = "models/gemini-2.5-flash-lite"
+    # Stored extractions replayed by the "fake" provider, which needs it set,
+    # e.g. ../sample_data/extracted_data.json when running from backend/
+    FAKE_LLM_SAMPLES_PATH: Optional[str] = None
+    FAKE_LLM_LATENCY_MEDIAN_MS: float = 800
+    FAKE_LLM_LATENCY_SIGMA: float = 0.5
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_LLM_SEED: Optional[int] = None
+    # "hashing" embeds offline without a model; give it its own EMBEDDING_MODEL
+    # name so its vectors are never mixed with a real model's
+    EMBEDDING_PROVIDER: str = "sentence-transformers"
     EMBEDDING_MODEL: str ="sentence-transformers/all-MiniLM-L6-v2"
     EMBEDDING_DIMENSIONS: int = 384
+    EMBEDDING_BATCH_SIZE: int = 128
+    # Torch intra-op threads per process; 0 keeps torch's default of one per
+    # core. gunicorn.conf.py divides the cores between its workers
+    EMBEDDING_THREADS: int = 0
     POSTGRES_DB: str = ""
     POSTGRES_USER: str = ""
     POSTGRES_PASSWORD: str= ""
     POSTGRES_HOST: str= ""
     POSTGRES_PORT: int = 5432
     DATABASE_URL: str = f"postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    # Defaults to DATABASE_URL with the asyncpg driver
+    ASYNC_DATABASE_URL: Optional[str] = None
+    ASYNC_DB_POOL_SIZE: int = 10
+    ASYNC_DB_MAX_OVERFLOW: int = 20
 
 
+    LLM_TIMEOUT_SECONDS: float = 30
+    LLM_MAX_RETRIES: int = 1
+    LLM_MIN_BUDGET_SECONDS: float = 2.0
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30
+
+    EXTRACTION_MODE: str = "llm"
+
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_PATH: str = ".cache/extraction_cache.sqlite3"
+    EXTRACTION_CACHE_TTL_SECONDS: int = 60 * 60 * 24 * 7
+    EXTRACTION_CACHE_MAX_ENTRIES: int = 10000
+
+    CV_UPLOAD_MODE: str = "sync"
+    CV_UPLOAD_DEADLINE_SECONDS: float = 45
+    INGESTION_DEADLINE_SECONDS: float = 180
+    INGESTION_WORKERS: int = 2
+    INGESTION_MAX_ATTEMPTS: int = 3
+    INGESTION_RETRY_BACKOFF_SECONDS: float = 5.0
+    INGESTION_POLL_INTERVAL_SECONDS: float = 1.0
+    INGESTION_LEASE_SECONDS: int = 300
+
+    # Re-embedding of updated jobs
+    REEMBED_BATCH_SIZE: int = 64
+    REEMBED_FLUSH_INTERVAL_SECONDS: float = 2.0
+
+    JOB_EXPIRY_SWEEP_INTERVAL_SECONDS: float = 60.0
+    JOB_EXPIRY_BATCH_SIZE: int = 500
+    JOB_CATALOG_CHECK_INTERVAL_SECONDS: float = 5.0
+    # One partial HNSW index on job_embeddings per job category
+    JOB_SHARD_INDEXES_ENABLED: bool = True
+    JOB_SHARD_INDEX_CHECK_INTERVAL_SECONDS: float = 3600.0
+    JOB_SHARD_HNSW_M: int = 16
+    JOB_SHARD_HNSW_EF_CONSTRUCTION: int = 64
+    # Jobs taken from the category's index and scored per recommendation
+    JOB_SHARD_CANDIDATES: int = 200
+    # Hybrid retrieval: ANN over the active jobs of every category, then the
+    # candidates are re-ranked with a boost for the CV's category. Used for
+    # mode=hybrid and for CVs in these categories
+    HYBRID_RETRIEVAL_CATEGORIES: List[str] = ["Other"]
+    HYBRID_CANDIDATES: int = 200
+    HYBRID_CATEGORY_BOOST: float = 0.1
+    HYBRID_RECORD_CACHE_SIZE: int = 20000
+    # Encoded recommendation responses kept per (CV, top_k) until the
+    # category's catalog snapshot changes
+    RECOMMENDATION_CACHE_SIZE: int = 2048
+
+    # Buffered system_logs writer
+    LOG_QUEUE_MAX_SIZE: int = 10000
+    LOG_BATCH_SIZE: int = 500
+    LOG_FLUSH_INTERVAL_SECONDS: float = 1.0
+    LOG_ROLLUP_INTERVAL_SECONDS: float = 60.0
+    # Buckets closed for less than this are left for the next run, so rows
+    # still queued in the log writer are counted
+    LOG_ROLLUP_DELAY_SECONDS: float = 30.0
+    LOG_ROLLUP_CHUNK_HOURS: int = 6
+    LOG_RETENTION_DAYS: int = 7
+    LOG_MINUTE_ROLLUP_RETENTION_DAYS: int = 14
+    LOG_HOUR_ROLLUP_RETENTION_DAYS: int = 365
+    LOG_RETENTION_BATCH_SIZE: int = 5000
+
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_CACHE_MAX_SIZE: int = 10000
+
+    METRICS_ENABLED: bool = True
+
+    PROFILE_SAMPLE_INTERVAL_SECONDS: float = 0.005
+    PROFILE_MAX_STACK_DEPTH: int = 128
+    PROFILE_STORE_SIZE: int = 50
+
     API_PREFIX: str= "/api/v1"
     SECRET_KEY: str
     DEBUG: bool =False
@@ -0,0 +1,32 @@
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request runs past its deadline"""
+
+
+class Deadline:
+    """Absolute time budget for a request, passed down through each stage"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None for an unbounded deadline"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def check(self, stage: str):
+        """Raise DeadlineExceeded if no time is left to start the given stage"""
+        if self.expired():
+            raise DeadlineExceeded(f"Deadline exceeded before {stage}")
+
+    def budget(self, cap: float) -> float:
+        """Time allowed for a single call: the cap, or less if the deadline is closer"""
+        remaining = self.remaining()
+        return cap if remaining is None else min(cap, remaining)
@@ -0,0 +1,77 @@
+import re
+import sys
+import zlib
+from typing import List, Union
+
+import numpy as np
+
+EMBEDDING_PROVIDERS = ("sentence-transformers", "hashing")
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#.]+")
+
+
+class HashingEncoder:
+    """
+    Offline stand-in for a SentenceTransformer.
+
+    Texts are embedded by feature hashing their words and word pairs into a
+    fixed number of signed buckets. Vectors are deterministic across
+    processes and share words the way real embeddings share meaning, which is
+    enough for benchmarks and local runs without downloading a model. They
+    are not comparable with vectors of any real model.
+    """
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            digest = zlib.crc32(feature.encode())
+            vector[digest % self.dimension] += 1.0 if digest & 0x80000000 else -1.0
+        return vector
+
+    def encode(self, texts: Union[str, List[str]], normalize_embeddings: bool = False, batch_size: int = 32, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        embeddings = np.vstack([self._embed(text) for text in ([texts] if single else texts)]) if single or texts else np.zeros((0, self.dimension), dtype=np.float32)
+        if normalize_embeddings and len(embeddings):
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.where(norms == 0, 1.0, norms)
+        return embeddings[0] if single else embeddings
+
+
+def limit_torch_threads(threads: int):
+    """Cap torch's intra-op thread pool, if torch is loaded and threads is set"""
+    torch = sys.modules.get("torch")
+    if torch is not None and threads > 0:
+        torch.set_num_threads(threads)
+
+
+def get_embedding_model(provider: str, model: str, dimension: int, threads: int = 0):
+    """
+    Build the sentence encoder for the configured provider.
+
+    Args:
+        provider: One of EMBEDDING_PROVIDERS
+        model: Model name for sentence-transformers
+        dimension: Vector size for the hashing encoder
+        threads: Torch threads for sentence-transformers, 0 for torch's default
+
+    Returns:
+        An object with encode() and get_sentence_embedding_dimension()
+    """
+    if provider == "sentence-transformers":
+        from sentence_transformers import SentenceTransformer
+
+        encoder = SentenceTransformer(model)
+        limit_torch_threads(threads)
+        return encoder
+
+    if provider == "hashing":
+        return HashingEncoder(dimension)
+
+    raise ValueError(f"Unknown embedding provider: {provider}. Expected one of {EMBEDDING_PROVIDERS}")
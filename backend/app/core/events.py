@@ -0,0 +1,31 @@
+from typing import Callable, List
+
+JobEventListener = Callable[[str, List[int]], None]
+
+
+class JobEventBus:
+    """In-process notifications of job catalog changes, used to invalidate caches"""
+
+    def __init__(self):
+        self._listeners: List[JobEventListener] = []
+
+    def subscribe(self, listener: JobEventListener):
+        """Register a callback receiving (event, job_ids)"""
+        self._listeners.append(listener)
+
+    def publish(self, event: str, job_ids: List[int]):
+        """
+        Notify listeners of a change.
+
+        Args:
+            event: "created", "updated", "deleted", "reembedded" or "expired"
+            job_ids: Affected job ids
+        """
+        for listener in self._listeners:
+            try:
+                listener(event, job_ids)
+            except Exception as e:
+                print(f"Job event listener error: {e}")
+
+
+job_events = JobEventBus()
@@ -0,0 +1,78 @@
+from typing import List
+
+from sqlalchemy import select, update
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.core.events import job_events
+from app.database.db import SessionLocal
+from app.models.jobs import Job, JobEmbedding
+from app.utils.background import PeriodicTask
+from app.utils.logging import create_log
+
+
+class JobExpirySweeper(PeriodicTask):
+    """Marks jobs whose expires_at has passed as expired, in batches"""
+
+    name = "job-expiry-sweeper"
+
+    def __init__(self, interval: float, batch_size: int):
+        super().__init__(interval)
+        self.batch_size = batch_size
+
+    def tick(self):
+        while len(self.sweep_batch()) == self.batch_size:
+            pass
+
+    def sweep_batch(self) -> List[int]:
+        """
+        Expire up to batch_size due jobs in one short transaction.
+
+        Rows locked by a concurrent sweeper (another API worker) are skipped,
+        and the flag is mirrored onto job_embeddings so the active-catalog
+        partial indexes on both tables stay in sync.
+
+        Returns:
+            List[int]: Ids of the jobs that were expired
+        """
+        db = SessionLocal()
+        try:
+            due = select(Job.id).where(
+                Job.is_expired == False,
+                Job.expires_at <= func.now()
+            ).order_by(Job.id).limit(self.batch_size).with_for_update(skip_locked=True).scalar_subquery()
+
+            job_ids = db.scalars(
+                update(Job)
+                .where(Job.id.in_(due))
+                .values(is_expired=True, updated_at=func.now())
+                .returning(Job.id)
+            ).all()
+
+            if job_ids:
+                db.execute(
+                    update(JobEmbedding)
+                    .where(JobEmbedding.job_id.in_(job_ids))
+                    .values(is_expired=True)
+                )
+            db.commit()
+
+            if job_ids:
+                job_events.publish("expired", list(job_ids))
+            return job_ids
+
+        except Exception as e:
+            db.rollback()
+            create_log(
+                db=db,
+                log_name="job_expiry_sweep_failed",
+                log_type="ERROR",
+                function_name="JobExpirySweeper.sweep_batch",
+                description=str(e)
+            )
+            raise
+        finally:
+            db.close()
+
+
+job_expiry_sweeper = JobExpirySweeper(settings.JOB_EXPIRY_SWEEP_INTERVAL_SECONDS, settings.JOB_EXPIRY_BATCH_SIZE)
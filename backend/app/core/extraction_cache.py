@@ -0,0 +1,117 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.utils.hashing import text_hash
+
+
+class ExtractionCache:
+    """Persistent SQLite cache of LLM extraction results"""
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS extraction_cache (
+                key TEXT PRIMARY KEY,
+                prompt_version TEXT NOT NULL,
+                model_name TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_extraction_cache_last_access ON extraction_cache(last_access)"
+        )
+        self._conn.commit()
+
+    def reopen(self):
+        """
+        Open a new connection, e.g. in a forked worker.
+
+        A SQLite connection must not be used across a fork, not even to close
+        it (closing may checkpoint the parent's WAL), so the inherited one is
+        kept referenced and left alone.
+        """
+        self._inherited_conn = self._conn
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+
+    @staticmethod
+    def make_key(prompt_version: str, model_name: str, digest: str) -> str:
+        """Build the cache key for a text hash under a prompt/model pair"""
+        return f"{prompt_version}|{model_name}|{digest}"
+
+    def get(self, prompt_version: str, model_name: str, cv_text: str) -> Optional[Dict]:
+        """Return the cached extraction or None if missing or expired"""
+        key = self.make_key(prompt_version, model_name, text_hash(cv_text))
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM extraction_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            payload, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM extraction_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute(
+                "UPDATE extraction_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+        return json.loads(payload)
+
+    def set(self, prompt_version: str, model_name: str, cv_text: str, value: Dict):
+        """Store an extraction result and enforce TTL and size limits"""
+        digest = text_hash(cv_text)
+        key = self.make_key(prompt_version, model_name, digest)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO extraction_cache
+                    (key, prompt_version, model_name, text_hash, payload, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, prompt_version, model_name, digest, json.dumps(value), now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM extraction_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                """
+                DELETE FROM extraction_cache WHERE key IN (
+                    SELECT key FROM extraction_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM extraction_cache")
+            self._conn.commit()
+
+
+extraction_cache = ExtractionCache(
+    settings.EXTRACTION_CACHE_PATH,
+    settings.EXTRACTION_CACHE_TTL_SECONDS,
+    settings.EXTRACTION_CACHE_MAX_ENTRIES,
+) if settings.EXTRACTION_CACHE_ENABLED else None
@@ -1,9 +1,23 @@
-from typing import Dict
-from langchain_google_genai import ChatGoogleGenerativeAI
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Optional, Tuple
+from pydantic import create_model
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from app.schemas.cvs import CVData
 from app.core.config import settings
+from app.core.circuit_breaker import llm_breaker
+from app.core.deadline import Deadline
+from app.core.extraction_cache import ExtractionCache, extraction_cache
+from app.core.llm_providers import get_llm
+from app.core.metrics import stage_timer
+from app.core.rule_extractor import rule_extractor
+
+# Bump whenever the prompts or the shape of the extracted data change so that
+# cached extraction results from older prompts are not reused.
+PROMPT_VERSION = "1"
 
 CV_CATEGORIES = [
     "Software Engineering",
@@ -21,18 +35,40 @@ CV_CATEGORIES = [
     "Research & Development",
     "Other",]
 
+# "llm": full LLM extraction, "hybrid": rules first and the LLM only for the
+# remaining fields, "fast": rules only, no LLM call at all
+EXTRACTION_MODES = ("llm", "hybrid", "fast")
+LLM_FIELDS = tuple(name for name in CVData.model_fields if name != "category")
+
+
+class LLMUnavailable(Exception):
+    """The LLM was skipped: circuit breaker open, no free slot, call timed out or no time left"""
+
+
 class CVExtractor:
     """LLM-based CV information extraction"""
 
-    def __init__(self, llm_model: str = "models/gemini-2.5-flash-lite"):
-        self.llm = ChatGoogleGenerativeAI(
-            model=llm_model,
-            temperature=1.0,
-            max_tokens=None,
-            timeout=None,
-            max_retries=2,
-        )
+    def __init__(
+        self,
+        llm_model: str = "models/gemini-2.5-flash-lite",
+        mode: str = "llm",
+        provider: str = "google",
+        cache: Optional[ExtractionCache] = extraction_cache,
+    ):
+        if mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {mode}")
+        # Provider is part of the cache key so replayed fake results never
+        # shadow real extractions
+        self.model_name = f"{provider}/{llm_model}"
+        self.mode = mode
+        self.cache = cache
+        self.llm = get_llm(provider, llm_model)
+        # A slot is held for as long as a provider call runs, so the executor
+        # always has a free thread and calls never wait in its queue
+        self._slots = threading.BoundedSemaphore(settings.LLM_MAX_CONCURRENCY)
+        self._executor = ThreadPoolExecutor(max_workers=settings.LLM_MAX_CONCURRENCY, thread_name_prefix="llm")
         self.parser = PydanticOutputParser(pydantic_object=CVData)
+        self._partial_parsers: Dict[Tuple[str, ...], PydanticOutputParser] = {}
         self.categories = CV_CATEGORIES
 
         self.prompt = ChatPromptTemplate.from_messages([
@@ -43,35 +79,136 @@ class CVExtractor:
             ("user", "Extract information from this CV:\n\n{cv_text}")
         ])
 
-    def extract(self, cv_text: str) -> CVData:
-        """Extract structured data from CV text"""
+    def extract(self, cv_text: str, deadline: Optional[Deadline] = None) -> CVData:
+        """
+        Extract structured data from CV text.
+
+        LLM calls are bounded by the deadline; when the LLM is unavailable
+        (breaker open, timeout, deadline too close) the rule-based extractor
+        is used instead.
+        """
 
-        chain = self.prompt | self.llm | self.parser
+        if self.mode == "fast":
+            return self._rule_based_extraction(cv_text)
+
+        prompt_version = f"{PROMPT_VERSION}-{self.mode}"
+        if self.cache is not None:
+            cached = self.cache.get(prompt_version, self.model_name, cv_text)
+            if cached is not None:
+                return cached
+
+        prefilled = self._prefill_fields(cv_text) if self.mode == "hybrid" else {}
+        parser = self._partial_parser(
+            tuple(name for name in LLM_FIELDS if name not in prefilled)
+        ) if prefilled else self.parser
 
         try:
-            result = chain.invoke({
-                "cv_text": cv_text,
-                "format_instructions": self.parser.get_format_instructions()
-            })
+            with stage_timer("llm_extract"):
+                message = self._call_llm(self.prompt | self.llm, {
+                    "cv_text": cv_text,
+                    "format_instructions": parser.get_format_instructions()
+                }, deadline)
+                result = parser.invoke(message)
 
-            cv_data = result.model_dump()
-            cv_data['category'] = self._categorize_cv(cv_data, cv_text)
+            cv_data = {**result.model_dump(), **prefilled}
+            category = self._categorize_cv(cv_data, cv_text, deadline)
+            cv_data['category'] = category or rule_extractor.categorize(cv_data.get('skills') or [], cv_text)
+
+            # Only fully successful extractions are cached; a failed
+            # categorization should be retried on the next upload.
+            if self.cache is not None and category is not None:
+                self.cache.set(prompt_version, self.model_name, cv_text, cv_data)
             return cv_data
 
+        except LLMUnavailable as e:
+            print(f"Extraction degraded to rules: {e}")
+            return self._rule_based_extraction(cv_text)
+
         except Exception as e:
             print(f"Extraction error: {e}")
-            return self._fallback_extraction(cv_text)
+            return self._fallback_extraction(cv_text, deadline)
+
+    def _call_llm(self, runnable, inputs: Any, deadline: Optional[Deadline]) -> Any:
+        """
+        Invoke the LLM through the circuit breaker, bounded by the deadline.
+
+        Waiting for one of the LLM_MAX_CONCURRENCY slots is local saturation,
+        not a provider failure: it only shortens the budget, and running out
+        of time while waiting skips the LLM without touching the breaker. Only
+        the provider call itself is timed out and counted by the breaker.
+        """
+        budget = (deadline or Deadline()).budget(settings.LLM_TIMEOUT_SECONDS)
+        if budget < settings.LLM_MIN_BUDGET_SECONDS:
+            raise LLMUnavailable(f"only {budget:.1f}s left before the deadline")
+
+        waiting_since = time.monotonic()
+        if not self._slots.acquire(timeout=budget - settings.LLM_MIN_BUDGET_SECONDS):
+            raise LLMUnavailable(f"no free LLM slot within {budget - settings.LLM_MIN_BUDGET_SECONDS:.1f}s")
+        budget -= time.monotonic() - waiting_since
+        try:
+            if not llm_breaker.allow_request():
+                raise LLMUnavailable("circuit breaker is open")
+            future = self._executor.submit(runnable.invoke, inputs)
+        except BaseException:
+            self._slots.release()
+            raise
+        # A call that times out keeps its slot until it returns: it cannot be
+        # cancelled once running
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            result = future.result(timeout=budget)
+        except FutureTimeoutError:
+            llm_breaker.record_failure()
+            raise LLMUnavailable(f"LLM call timed out after {budget:.1f}s")
+        except Exception:
+            llm_breaker.record_failure()
+            raise
+
+        llm_breaker.record_success()
+        return result
 
-    def _categorize_cv(self, cv_data: Dict, cv_text: str) -> str:
+    def _rule_based_extraction(self, cv_text: str) -> Dict:
+        """Extraction without any LLM call"""
+        return rule_extractor.to_cv_data(rule_extractor.extract(cv_text), cv_text)
+
+    def _prefill_fields(self, cv_text: str) -> Dict:
+        """
+        Fields the rule-based extractor fills reliably enough to skip the LLM.
+
+        Skills are left to the LLM: the dictionary only recovers about half of
+        the skills the LLM finds on the sample CVs (see
+        app/scripts/evaluate_rule_extractor.py).
+        """
+        fields = rule_extractor.extract(cv_text)
+        return {
+            name: fields[name] for name in ("email", "phone", "languages") if name in fields
+        }
+
+    def _partial_parser(self, field_names: Tuple[str, ...]) -> PydanticOutputParser:
+        """Output parser for a CVData subset, so the prompt only describes the missing fields"""
+        if field_names not in self._partial_parsers:
+            partial_model = create_model(
+                "CVPartialData",
+                **{
+                    name: (CVData.model_fields[name].annotation, CVData.model_fields[name])
+                    for name in field_names
+                }
+            )
+            self._partial_parsers[field_names] = PydanticOutputParser(pydantic_object=partial_model)
+        return self._partial_parsers[field_names]
+
+    def _categorize_cv(self, cv_data: Dict, cv_text: str, deadline: Optional[Deadline] = None) -> Optional[str]:
         """
         Categorize CV using LLM with predefined categories
         
         Args:
             cv_data: Extracted CV data dictionary
             cv_text: Original CV text
+            deadline: Request deadline bounding the LLM call
         
         Returns:
-            str: Category name
+            Optional[str]: Category name, or None if the LLM call failed
         """
         
         categories_str = "\n".join([f"- {cat}" for cat in self.categories])
@@ -92,9 +229,10 @@ class CVExtractor:
         Category:"""
 
         try:
-            response = self.llm.invoke(categorization_prompt)
+            with stage_timer("llm_categorize"):
+                response = self._call_llm(self.llm, categorization_prompt, deadline)
             if response is None or not response.content:
-                return "Other"
+                return None
             category = response.content.strip()
             
             if category in CV_CATEGORIES:
@@ -103,26 +241,27 @@ class CVExtractor:
                 return "Other"
         except Exception as e:
             print(f"Categorization error: {e}")
-            return "Other"
+            return None
 
 
-    def _fallback_extraction(self, cv_text: str) -> Dict:
+    def _fallback_extraction(self, cv_text: str, deadline: Optional[Deadline] = None) -> Dict:
         """Simple fallback extraction"""
         messages = [
             {"role": "system", "content": "Extract CV information as JSON. Include name, email, phone, skills, work experience, education."},
             {"role": "user", "content": cv_text}
         ]
 
-        response = self.llm.invoke(messages)
-
         try:
+            with stage_timer("llm_extract"):
+                response = self._call_llm(self.llm, messages, deadline)
             json_str = response.content.strip()
             if "```json" in json_str:
                 json_str = json_str.split("```json")[1].split("```")[0]
             return json.loads(json_str)
-        except:
-            return {"name": "Unknown", "raw_text": cv_text}
+        except Exception as e:
+            print(f"Fallback extraction error: {e}")
+            return self._rule_based_extraction(cv_text)
 
 
 
-cv_extractor = CVExtractor(settings.LLM_PROVIDER)
+cv_extractor = CVExtractor(settings.LLM_MODEL, settings.EXTRACTION_MODE, settings.LLM_PROVIDER)
@@ -0,0 +1,242 @@
+import threading
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import or_, and_
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.core.deadline import Deadline
+from app.core.extractor import cv_extractor
+from app.core.metrics import uploads_in_flight
+from app.core.parser import parser
+from app.core.vector_store import vector_store
+from app.database.db import SessionLocal
+from app.models.cvs import CV, CVEmbedding
+from app.models.cv_processing import CVProcessingJob
+from app.utils.logging import create_log
+
+
+def parse_cv(pdf_bytes: bytes, filename: str, deadline: Deadline) -> str:
+    """Extract the raw text of an uploaded PDF"""
+    return parser.parse_pdf(pdf_bytes, filename, deadline)['raw_text']
+
+
+def extract_cv(cv_text: str, deadline: Deadline) -> Dict:
+    """Extract structured CV data from raw text"""
+    return cv_extractor.extract(cv_text, deadline)
+
+
+def embed_cv(cv_text: str, deadline: Deadline) -> List[float]:
+    """Embed the raw CV text"""
+    return vector_store.generate_embedding(cv_text)
+
+
+def build_cv(user_id: int, extracted: Dict, embedding: List[float]) -> CV:
+    """Build the CV row and its embedding from extracted data"""
+    cv = CV(
+        user_id=user_id,
+        name=extracted.get("name"),
+        email=extracted.get("email"),
+        phone=extracted.get("phone"),
+        location=extracted.get("location"),
+        summary=extracted.get("summary"),
+        work=extracted.get("work"),
+        education=extracted.get("education"),
+        skills=extracted.get("skills"),
+        languages=extracted.get("languages"),
+        certifications=extracted.get("certifications"),
+        category=extracted.get("category"),
+    )
+    cv.embeddings.append(CVEmbedding(embedding=embedding, model_name=settings.EMBEDDING_MODEL))
+    return cv
+
+
+def run_pipeline(
+    pdf_bytes: bytes,
+    filename: str,
+    on_stage: Optional[Callable[[str], None]] = None,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[Dict, List[float], Dict[str, float]]:
+    """
+    Run the parse -> extract -> embed stages of CV ingestion.
+
+    Args:
+        pdf_bytes: Uploaded PDF content
+        filename: Original filename
+        on_stage: Called with the stage name before each stage starts
+        deadline: Checked before every stage and passed down to each one;
+            DeadlineExceeded is raised once it has passed
+
+    Returns:
+        Tuple of extracted data, embedding and per-stage timings in seconds
+    """
+    timings = {}
+    deadline = deadline or Deadline()
+
+    def timed(stage: str, func, *args):
+        deadline.check(stage)
+        if on_stage is not None:
+            on_stage(stage)
+        start_time = time.perf_counter()
+        result = func(*args, deadline)
+        timings[stage] = round(time.perf_counter() - start_time, 4)
+        return result
+
+    cv_text = timed("parsing", parse_cv, pdf_bytes, filename)
+    extracted = timed("extracting", extract_cv, cv_text)
+    embedding = timed("embedding", embed_cv, cv_text)
+    return extracted, embedding, timings
+
+
+class IngestionWorkerPool:
+    """Local thread pool consuming the cv_processing_jobs table"""
+
+    def __init__(self, workers: int, poll_interval: float, lease_seconds: int, retry_backoff: float):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retry_backoff = retry_backoff
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+    def start(self):
+        """Start the worker threads"""
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"cv-ingestion-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0):
+        """Signal the workers to stop and wait for in-flight jobs"""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self):
+        """Wake an idle worker after a new job was queued"""
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                job_id = self._claim()
+            except Exception as e:
+                print(f"Ingestion claim error: {e}")
+                job_id = None
+
+            if job_id is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            self._process(job_id)
+
+    def _claim(self) -> Optional[str]:
+        """Lock the oldest runnable job; stale leases of crashed workers are reclaimed"""
+        db = SessionLocal()
+        try:
+            job = db.query(CVProcessingJob).filter(
+                or_(
+                    and_(CVProcessingJob.status == "queued", CVProcessingJob.next_attempt_at <= func.now()),
+                    and_(
+                        CVProcessingJob.status == "running",
+                        CVProcessingJob.locked_at < func.now() - timedelta(seconds=self.lease_seconds)
+                    ),
+                )
+            ).order_by(CVProcessingJob.created_at).with_for_update(skip_locked=True).first()
+
+            if job is None:
+                return None
+
+            job.status = "running"
+            job.attempts += 1
+            job.locked_at = func.now()
+            db.commit()
+            return job.id
+        finally:
+            db.close()
+
+    def _process(self, job_id: str):
+        db = SessionLocal()
+        start_time = time.perf_counter()
+        uploads_in_flight.labels("async").inc()
+        try:
+            job = db.query(CVProcessingJob).filter(CVProcessingJob.id == job_id).first()
+            timings = {"queue_wait": round((job.locked_at - job.created_at).total_seconds(), 4)}
+
+            def on_stage(stage: str):
+                job.stage = stage
+                db.commit()
+
+            extracted, embedding, stage_timings = run_pipeline(
+                job.pdf_bytes,
+                job.filename,
+                on_stage,
+                Deadline(settings.INGESTION_DEADLINE_SECONDS)
+            )
+            timings.update(stage_timings)
+
+            on_stage("saving")
+            save_start = time.perf_counter()
+            cv = build_cv(job.user_id, extracted, embedding)
+            db.add(cv)
+            db.flush()
+            timings["saving"] = round(time.perf_counter() - save_start, 4)
+
+            # The CV and the job status are committed together, so a retried
+            # job never creates a second CV.
+            job.cv_id = cv.id
+            job.result = extracted
+            job.timings = timings
+            job.status = "succeeded"
+            job.stage = "done"
+            job.error = None
+            job.pdf_bytes = None
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            job = db.query(CVProcessingJob).filter(CVProcessingJob.id == job_id).first()
+            job.error = str(e)
+            if job.attempts >= job.max_attempts:
+                job.status = "failed"
+            else:
+                job.status = "queued"
+                job.next_attempt_at = func.now() + timedelta(
+                    seconds=self.retry_backoff * 2 ** (job.attempts - 1)
+                )
+            db.commit()
+            create_log(
+                db=db,
+                log_name="cv_ingestion_failed",
+                log_type="ERROR",
+                function_name="IngestionWorkerPool._process",
+                description=f"{job_id} attempt {job.attempts}: {e}"
+            )
+
+        finally:
+            uploads_in_flight.labels("async").dec()
+            create_log(
+                db=db,
+                log_name="cv_ingestion",
+                log_type="PERF",
+                function_name="IngestionWorkerPool._process",
+                time_taken=time.perf_counter() - start_time
+            )
+            db.close()
+
+
+ingestion_workers = IngestionWorkerPool(
+    settings.INGESTION_WORKERS,
+    settings.INGESTION_POLL_INTERVAL_SECONDS,
+    settings.INGESTION_LEASE_SECONDS,
+    settings.INGESTION_RETRY_BACKOFF_SECONDS,
+)
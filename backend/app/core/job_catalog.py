@@ -0,0 +1,318 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.events import job_events
+from app.core.recommender import job_recommender
+from app.core.vector_store import vector_store
+from app.models.jobs import Job, JobCatalogReload, JobEmbedding, bump_job_catalog_reload
+from app.schemas.jobs import JobResponse
+
+# Active jobs with their embedding for the configured model (outer join: a
+# job may not have one yet)
+ACTIVE_JOBS = (
+    select(Job, JobEmbedding.embedding)
+    .outerjoin(JobEmbedding, (JobEmbedding.job_id == Job.id) & (JobEmbedding.model_name == settings.EMBEDDING_MODEL))
+    .where(Job.is_expired == False)
+    .order_by(Job.id)
+)
+
+
+class JobRecord:
+    """
+    Read-only scoring view of one active job.
+
+    job_json is the job's JobResponse encoded once when the snapshot is
+    built; responses embed it as is instead of validating the job again.
+    """
+    __slots__ = ("id", "category", "skills_lower", "experience_years", "job_json")
+
+    def __init__(self, id: int, category: str, skills_lower: Tuple[str, ...], experience_years: Tuple, job_json: bytes):
+        self.id = id
+        self.category = category
+        self.skills_lower = skills_lower
+        self.experience_years = experience_years
+        self.job_json = job_json
+
+
+class CategorySnapshot:
+    """
+    Immutable set of the active jobs of one category.
+
+    Row i of embeddings / education_embeddings belongs to records[i]. Both
+    matrices hold L2 normalized rows, so cosine similarity is a dot product.
+    A snapshot is never modified: refreshes publish a new one.
+    """
+    __slots__ = ("category", "version", "records", "embeddings", "education_embeddings", "watermark", "published_at", "_rows")
+
+    def __init__(self, category: str, version: int, records: Tuple[JobRecord, ...], embeddings: np.ndarray, education_embeddings: np.ndarray, watermark: Tuple):
+        embeddings.setflags(write=False)
+        education_embeddings.setflags(write=False)
+        self.category = category
+        self.version = version
+        self.records = records
+        self.embeddings = embeddings
+        self.education_embeddings = education_embeddings
+        self.watermark = watermark
+        self.published_at = time.time()
+        self._rows = {record.id: row for row, record in enumerate(records)}
+
+    def __len__(self):
+        return len(self.records)
+
+    def rows(self, job_ids: Iterable[int]) -> List[int]:
+        """Row indexes of the given jobs, in their order, leaving out jobs not in the snapshot"""
+        return [self._rows[job_id] for job_id in job_ids if job_id in self._rows]
+
+    def describe(self) -> Dict:
+        """Size and freshness of the snapshot, for the admin endpoints"""
+        return {
+            "category": self.category,
+            "version": self.version,
+            "jobs": len(self.records),
+            "watermark_updated_at": self.watermark[0],
+            "watermark_count": self.watermark[1],
+            "reload_generation": self.watermark[2],
+            "published_at": self.published_at,
+            "bytes": self.embeddings.nbytes + self.education_embeddings.nbytes + sum(len(record.job_json) for record in self.records),
+        }
+
+
+def _normalized(embedding) -> np.ndarray:
+    if embedding is None:
+        return np.zeros(settings.EMBEDDING_DIMENSIONS, dtype=np.float32)
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _empty_matrix() -> np.ndarray:
+    return np.zeros((0, settings.EMBEDDING_DIMENSIONS), dtype=np.float32)
+
+
+def build_records(rows: Iterable) -> Tuple[List[JobRecord], np.ndarray, np.ndarray]:
+    """
+    Turn (Job, embedding) rows into records and their embedding matrices.
+
+    Job education requirements are embedded here once, in a batch, instead of
+    per request.
+    """
+    latest = {}
+    for job, embedding in rows:
+        latest.setdefault(job.id, (job, embedding))
+    if not latest:
+        return [], _empty_matrix(), _empty_matrix()
+
+    jobs = list(latest.values())
+    education_embeddings = vector_store.generate_batch_embeddings(
+        [job_recommender.job_education_text(job.education_required or {}) for job, _ in jobs],
+        batch_size=settings.EMBEDDING_BATCH_SIZE
+    )
+    records = [
+        JobRecord(
+            id=job.id,
+            category=job.company_industry,
+            skills_lower=tuple(s.lower() for s in job.skills_required or ()),
+            experience_years=tuple(job.experience_years),
+            job_json=JobResponse.model_validate(job).model_dump_json().encode(),
+        )
+        for job, _ in jobs
+    ]
+    embeddings = np.vstack([_normalized(embedding) for _, embedding in jobs])
+    education = np.vstack([_normalized(embedding) for embedding in education_embeddings])
+    return records, embeddings, education
+
+
+class JobCatalog:
+    """
+    Per-category snapshots of the active job catalog for the recommender.
+
+    Job events from this process mark jobs dirty; the next read rebuilds only
+    the affected rows. Writes made by other processes are caught by comparing
+    a per-category watermark (max updated_at, count, reload generation) with
+    the database at most every check_interval seconds. version increases with
+    every new snapshot.
+    """
+
+    def __init__(self, check_interval: float, record_cache_size: int):
+        self.check_interval = check_interval
+        self.record_cache_size = record_cache_size
+        self.version = 0
+        self._snapshots: Dict[str, CategorySnapshot] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._dirty: Set[int] = set()
+        self._dirty_lock = threading.Lock()
+        self._refresh_lock = asyncio.Lock()
+        # Hybrid retrieval: jobs of any category by id, and the watermark of
+        # the whole active catalog (checked under the None key)
+        self._records: "OrderedDict[int, Tuple[datetime, JobRecord, np.ndarray]]" = OrderedDict()
+        self._global_watermark: Optional[Tuple] = None
+        job_events.subscribe(self._on_job_event)
+
+    def _on_job_event(self, event: str, job_ids: List[int]):
+        with self._dirty_lock:
+            self._dirty.update(job_ids)
+        self._checked_at.pop(None, None)
+
+    def _check_due(self, category: str) -> bool:
+        return time.monotonic() - self._checked_at.get(category, 0.0) >= self.check_interval
+
+    def invalidate(self, category: Optional[str] = None):
+        """Drop one category's snapshot, or all of them"""
+        if category is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(category, None)
+
+    def shards(self) -> Dict[str, CategorySnapshot]:
+        """The loaded snapshots by category"""
+        return dict(self._snapshots)
+
+    async def reload(self, db: AsyncSession, category: str) -> CategorySnapshot:
+        """
+        Build one category's snapshot from the database now, leaving the
+        others alone.
+
+        The category's reload generation is bumped first, so the other
+        processes see a new watermark and rebuild it on their next check.
+        """
+        await db.execute(bump_job_catalog_reload(category))
+        await db.commit()
+        async with self._refresh_lock:
+            snapshot = await self._build(db, category)
+            self._checked_at[category] = time.monotonic()
+            return snapshot
+
+    async def get(self, db: AsyncSession, category: str) -> CategorySnapshot:
+        """
+        Current snapshot of a category, building or refreshing it if needed.
+
+        The common case (fresh snapshot, nothing dirty) returns without
+        touching the database.
+        """
+        snapshot = self._snapshots.get(category)
+        if snapshot is not None and not self._dirty and not self._check_due(category):
+            return snapshot
+
+        async with self._refresh_lock:
+            await self._apply_dirty(db)
+            snapshot = self._snapshots.get(category)
+            if snapshot is not None and self._check_due(category):
+                watermarks = await self._watermarks(db, [category])
+                if watermarks[category] != snapshot.watermark:
+                    snapshot = None
+            if snapshot is None:
+                snapshot = await self._build(db, category)
+            self._checked_at[category] = time.monotonic()
+            return snapshot
+
+    async def watermark(self, db: AsyncSession) -> Tuple:
+        """(max updated_at, count) of every active job, queried at most every check_interval seconds"""
+        if self._global_watermark is None or self._check_due(None):
+            row = (await db.execute(
+                select(func.max(Job.updated_at), func.count(Job.id)).where(Job.is_expired == False)
+            )).one()
+            self._global_watermark = tuple(row)
+            self._checked_at[None] = time.monotonic()
+        return self._global_watermark
+
+    async def records(self, db: AsyncSession, versions: Dict[int, datetime]) -> Tuple[List[JobRecord], np.ndarray]:
+        """
+        Records and education embeddings of given active jobs of any category.
+
+        versions maps job id to its updated_at (as returned with ANN
+        candidates); results follow its order. Records are kept in an LRU
+        cache checked against updated_at, so only new or changed jobs are
+        loaded and their education embedded. Jobs gone or expired meanwhile
+        are left out.
+        """
+        missing = [
+            job_id for job_id, updated_at in versions.items()
+            if job_id not in self._records or self._records[job_id][0] != updated_at
+        ]
+        if missing:
+            rows = (await db.execute(ACTIVE_JOBS.where(Job.id.in_(missing)))).all()
+            updated = {job.id: job.updated_at for job, _ in rows}
+            built, _, education = await run_in_threadpool(build_records, rows)
+            for record, education_embedding in zip(built, education):
+                self._records[record.id] = (updated[record.id], record, education_embedding)
+
+        records, education = [], []
+        for job_id in versions:
+            entry = self._records.get(job_id)
+            if entry is None:
+                continue
+            self._records.move_to_end(job_id)
+            records.append(entry[1])
+            education.append(entry[2])
+        while len(self._records) > self.record_cache_size:
+            self._records.popitem(last=False)
+        return records, np.vstack(education) if education else _empty_matrix()
+
+    async def _watermarks(self, db: AsyncSession, categories: List[str]) -> Dict[str, Tuple]:
+        rows = (await db.execute(
+            select(Job.company_industry, func.max(Job.updated_at), func.count(Job.id))
+            .where(Job.is_expired == False, Job.company_industry.in_(categories))
+            .group_by(Job.company_industry)
+        )).all()
+        generations = dict((await db.execute(
+            select(JobCatalogReload.category, JobCatalogReload.generation)
+            .where(JobCatalogReload.category.in_(categories))
+        )).all())
+        jobs = {category: (updated_at, count) for category, updated_at, count in rows}
+        return {category: (*jobs.get(category, (None, 0)), generations.get(category, 0)) for category in categories}
+
+    def _publish(self, category: str, records: List[JobRecord], embeddings: np.ndarray, education: np.ndarray, watermark: Tuple) -> CategorySnapshot:
+        self.version += 1
+        snapshot = CategorySnapshot(category, self.version, tuple(records), embeddings, education, watermark)
+        self._snapshots[category] = snapshot
+        return snapshot
+
+    async def _build(self, db: AsyncSession, category: str) -> CategorySnapshot:
+        # Read the watermark first: a write landing in between makes the next
+        # check rebuild again rather than be missed.
+        watermark = (await self._watermarks(db, [category]))[category]
+        rows = (await db.execute(ACTIVE_JOBS.where(Job.company_industry == category))).all()
+        records, embeddings, education = await run_in_threadpool(build_records, rows)
+        return self._publish(category, records, embeddings, education, watermark)
+
+    async def _apply_dirty(self, db: AsyncSession):
+        """Replace the rows of dirty jobs in the loaded snapshots"""
+        with self._dirty_lock:
+            job_ids, self._dirty = self._dirty, set()
+        if not job_ids or not self._snapshots:
+            return
+
+        try:
+            watermarks = await self._watermarks(db, list(self._snapshots))
+            rows = (await db.execute(ACTIVE_JOBS.where(Job.id.in_(job_ids)))).all()
+            changed, changed_embeddings, changed_education = await run_in_threadpool(build_records, rows)
+        except Exception:
+            with self._dirty_lock:
+                self._dirty.update(job_ids)
+            raise
+
+        for category, snapshot in list(self._snapshots.items()):
+            keep = [i for i, record in enumerate(snapshot.records) if record.id not in job_ids]
+            added = [i for i, record in enumerate(changed) if record.category == category]
+            if len(keep) == len(snapshot.records) and not added:
+                continue
+            self._publish(
+                category,
+                [snapshot.records[i] for i in keep] + [changed[i] for i in added],
+                np.vstack([snapshot.embeddings[keep], changed_embeddings[added]]),
+                np.vstack([snapshot.education_embeddings[keep], changed_education[added]]),
+                watermarks[category],
+            )
+
+
+job_catalog = JobCatalog(settings.JOB_CATALOG_CHECK_INTERVAL_SECONDS, settings.HYBRID_RECORD_CACHE_SIZE)
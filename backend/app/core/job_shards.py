@@ -0,0 +1,148 @@
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Sequence, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.core.extractor import CV_CATEGORIES
+from app.database.db import engine, sql_literal
+from app.utils.background import PeriodicTask
+
+SHARD_LOCK_ID = 4244
+# Shard name of the index over the active jobs of every category, used by
+# hybrid retrieval
+GLOBAL_SHARD = "all"
+
+INDEX_STATUS_QUERY = text("""
+SELECT c.relname, i.indisvalid, pg_relation_size(c.oid), p.phase
+FROM pg_class c
+JOIN pg_index i ON i.indexrelid = c.oid
+LEFT JOIN pg_stat_progress_create_index p ON p.index_relid = c.oid
+WHERE c.relname = ANY(:names)
+""")
+
+
+def shard_index_name(shard: str, model_name: str) -> str:
+    """Readable and unique per (shard, model), within Postgres' 63 characters"""
+    slug = re.sub(r"[^a-z0-9]+", "_", shard.lower()).strip("_")[:30]
+    return f"ix_job_embeddings_hnsw_{slug}_{zlib.crc32(f'{shard}|{model_name}'.encode()):08x}"
+
+
+class JobShardIndexer(PeriodicTask):
+    """
+    Keeps one partial HNSW index on job_embeddings per job category, plus
+    one over every category (GLOBAL_SHARD).
+
+    Each index covers the active embeddings of the configured model in one
+    category, so a vector search scoped to a category only walks that
+    category's graph, and each can be built or rebuilt on its own. Missing
+    indexes are built CONCURRENTLY, so writes go on meanwhile, one at a time
+    and by one worker at a time (advisory lock). A concurrent build that
+    failed leaves an invalid index behind, which is dropped and built again.
+    """
+
+    name = "job-shard-indexer"
+
+    def __init__(self, interval: float, categories: Sequence[str], model_name: str, m: int, ef_construction: int):
+        super().__init__(interval)
+        self.categories = tuple(categories)
+        self.shards = (GLOBAL_SHARD, *self.categories)
+        self.model_name = model_name
+        self.m = m
+        self.ef_construction = ef_construction
+        self._reindex: Set[str] = set()
+        self._lock = threading.Lock()
+        self.last_error: Optional[str] = None
+
+    def index_name(self, shard: str) -> str:
+        return shard_index_name(shard, self.model_name)
+
+    def create_statement(self, shard: str) -> str:
+        predicate = f"model_name = {sql_literal(self.model_name)} AND NOT is_expired"
+        if shard != GLOBAL_SHARD:
+            predicate = f"company_industry = {sql_literal(shard)} AND {predicate}"
+        return (
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.index_name(shard)} ON job_embeddings "
+            f"USING hnsw (embedding vector_cosine_ops) WITH (m = {self.m}, ef_construction = {self.ef_construction}) "
+            f"WHERE {predicate}"
+        )
+
+    def request_reindex(self, shard: str):
+        """Rebuild one shard's index on the next run, which starts now"""
+        with self._lock:
+            self._reindex.add(shard)
+        self.notify()
+
+    def tick(self):
+        try:
+            self.run()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            raise
+
+    def _index_status(self, connection: Connection) -> Dict[str, tuple]:
+        names = [self.index_name(shard) for shard in self.shards]
+        return {row[0]: row[1:] for row in connection.execute(INDEX_STATUS_QUERY, {"names": names})}
+
+    def run(self):
+        """Build missing or invalid indexes and the requested rebuilds"""
+        # CREATE/REINDEX ... CONCURRENTLY cannot run inside a transaction
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            if not connection.scalar(text(f"SELECT pg_try_advisory_lock({SHARD_LOCK_ID})")):
+                return
+            try:
+                indexes = self._index_status(connection)
+                with self._lock:
+                    reindex, self._reindex = self._reindex, set()
+                for shard in self.shards:
+                    name = self.index_name(shard)
+                    status = indexes.get(name)
+                    if status is None:
+                        statements = [self.create_statement(shard)]
+                    elif not status[0]:
+                        if status[2] is not None:
+                            # Still being built by another session
+                            continue
+                        statements = [f"DROP INDEX CONCURRENTLY IF EXISTS {name}", self.create_statement(shard)]
+                    elif shard in reindex:
+                        statements = [f"REINDEX INDEX CONCURRENTLY {name}"]
+                    else:
+                        continue
+                    for statement in statements:
+                        connection.exec_driver_sql(statement)
+            finally:
+                connection.scalar(text(f"SELECT pg_advisory_unlock({SHARD_LOCK_ID})"))
+
+    def status(self) -> List[Dict]:
+        """Index state per shard, as seen by the database"""
+        with engine.connect() as connection:
+            indexes = self._index_status(connection)
+        with self._lock:
+            pending = set(self._reindex)
+        report = []
+        for shard in self.shards:
+            name = self.index_name(shard)
+            valid, size, phase = indexes.get(name, (None, None, None))
+            report.append({
+                "shard": shard,
+                "index": name,
+                "exists": name in indexes,
+                "valid": valid,
+                "bytes": size,
+                "build_phase": phase,
+                "reindex_pending": shard in pending,
+            })
+        return report
+
+
+job_shard_indexer = JobShardIndexer(
+    settings.JOB_SHARD_INDEX_CHECK_INTERVAL_SECONDS,
+    CV_CATEGORIES,
+    settings.EMBEDDING_MODEL,
+    settings.JOB_SHARD_HNSW_M,
+    settings.JOB_SHARD_HNSW_EF_CONSTRUCTION,
+)
@@ -0,0 +1,124 @@
+import json
+import math
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.core.config import settings
+from app.utils.hashing import text_hash
+
+LLM_PROVIDERS = ("google", "fake")
+
+
+class FakeCVChatModel(BaseChatModel):
+    """
+    Offline chat model that replays stored CV extractions.
+
+    Extraction prompts are answered with the JSON of a sample CV (chosen by a
+    hash of the prompt so the same CV always gets the same answer) and
+    categorization prompts with that sample's category. Latency follows a
+    log-normal distribution and a fraction of calls fail on purpose.
+    """
+
+    samples: List[Dict[str, Any]]
+    latency_median_ms: float = 0.0
+    latency_sigma: float = 0.0
+    error_rate: float = 0.0
+    seed: Optional[int] = None
+
+    def model_post_init(self, __context: Any):
+        self._rng = random.Random(self.seed)
+        self._rng_lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-cv"
+
+    def _sample_latency(self) -> float:
+        if self.latency_median_ms <= 0:
+            return 0.0
+        with self._rng_lock:
+            return self._rng.lognormvariate(math.log(self.latency_median_ms), self.latency_sigma) / 1000
+
+    def _should_fail(self) -> bool:
+        with self._rng_lock:
+            return self._rng.random() < self.error_rate
+
+    def _pick_sample(self, prompt: str) -> Dict[str, Any]:
+        if prompt.rstrip().endswith("Category:"):
+            # Categorization prompts only carry skills, so match on those
+            return max(
+                self.samples,
+                key=lambda sample: sum(skill in prompt for skill in sample.get("skills") or [])
+            )
+        return self.samples[int(text_hash(prompt), 16) % len(self.samples)]
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self._sample_latency())
+        if self._should_fail():
+            raise RuntimeError("Fake LLM injected failure")
+
+        prompt = messages[-1].content if messages else ""
+        sample = self._pick_sample(prompt)
+        if prompt.rstrip().endswith("Category:"):
+            content = sample.get("category") or "Other"
+        else:
+            content = json.dumps(sample)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+
+def load_fake_samples(path: str) -> List[Dict[str, Any]]:
+    """Load stored extractions, dropping DB-only keys"""
+    samples = json.loads(Path(path).read_text())
+    return [
+        {key: value for key, value in sample.items() if key not in ("id", "user_id")}
+        for sample in samples
+    ]
+
+
+def get_llm(provider: str, model: str) -> BaseChatModel:
+    """
+    Build the chat model for the configured provider.
+
+    Args:
+        provider: One of LLM_PROVIDERS
+        model: Provider specific model name
+
+    Returns:
+        BaseChatModel: LangChain chat model
+    """
+    if provider == "google":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        return ChatGoogleGenerativeAI(
+            model=model,
+            temperature=1.0,
+            max_tokens=None,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_retries=settings.LLM_MAX_RETRIES,
+        )
+
+    if provider == "fake":
+        if not settings.FAKE_LLM_SAMPLES_PATH:
+            raise ValueError("The fake LLM provider needs FAKE_LLM_SAMPLES_PATH, e.g. ../sample_data/extracted_data.json")
+        return FakeCVChatModel(
+            samples=load_fake_samples(settings.FAKE_LLM_SAMPLES_PATH),
+            latency_median_ms=settings.FAKE_LLM_LATENCY_MEDIAN_MS,
+            latency_sigma=settings.FAKE_LLM_LATENCY_SIGMA,
+            error_rate=settings.FAKE_LLM_ERROR_RATE,
+            seed=settings.FAKE_LLM_SEED,
+        )
+
+    raise ValueError(f"Unknown LLM provider: {provider}. Expected one of {LLM_PROVIDERS}")
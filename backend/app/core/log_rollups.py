@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.db import SessionLocal
+from app.models.system_logs import SystemLog, SystemLogRollup
+from app.utils.background import PeriodicTask
+
+ROLLUP_LOCK_ID = 4243
+RESOLUTIONS = ("minute", "hour")
+
+ROLLUP_QUERY = text("""
+INSERT INTO system_log_rollups (
+    resolution, bucket_start, function_name, log_name, log_type,
+    count, timed_count, total_time, p50, p95, p99, max_time
+)
+SELECT
+    :resolution,
+    -- UTC buckets, so chunk boundaries never split one
+    date_trunc(:resolution, created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+    function_name,
+    log_name,
+    log_type,
+    count(*),
+    count(time_taken),
+    sum(time_taken),
+    percentile_cont(0.5) WITHIN GROUP (ORDER BY time_taken),
+    percentile_cont(0.95) WITHIN GROUP (ORDER BY time_taken),
+    percentile_cont(0.99) WITHIN GROUP (ORDER BY time_taken),
+    max(time_taken)
+FROM system_logs
+WHERE created_at >= :start AND created_at < :end
+GROUP BY 2, 3, 4, 5
+ON CONFLICT ON CONSTRAINT uq_system_log_rollups_bucket DO UPDATE SET
+    count = EXCLUDED.count,
+    timed_count = EXCLUDED.timed_count,
+    total_time = EXCLUDED.total_time,
+    p50 = EXCLUDED.p50,
+    p95 = EXCLUDED.p95,
+    p99 = EXCLUDED.p99,
+    max_time = EXCLUDED.max_time
+""")
+
+
+def _truncate(moment: datetime, resolution: str) -> datetime:
+    if resolution == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(second=0, microsecond=0)
+
+
+class LogRollupTask(PeriodicTask):
+    """
+    Rolls system_logs up into per-minute and per-hour rows of
+    system_log_rollups and applies the retention periods.
+
+    Buckets are rolled up once they are closed (plus a delay for rows still
+    in the log writer's queue). The last rolled bucket is always computed
+    again, so rows that land in it late are counted; the upsert makes that,
+    and several workers doing the same, harmless. A transaction-level
+    advisory lock lets only one worker at a time do the work.
+    """
+
+    name = "system-log-rollups"
+
+    def __init__(self, interval: float, delay: float, chunk: timedelta, retention: Dict[str, timedelta], delete_batch_size: int):
+        super().__init__(interval)
+        self.delay = delay
+        self.chunk = chunk
+        self.retention = retention
+        self.delete_batch_size = delete_batch_size
+        self.last_run: Optional[Dict] = None
+
+    def tick(self):
+        self.run()
+
+    def run(self) -> Dict:
+        """Roll up closed buckets and delete expired rows. Returns the counts"""
+        report = {"rolled_up": {}, "deleted": {}}
+        for resolution in RESOLUTIONS:
+            report["rolled_up"][resolution] = self.rollup(resolution)
+        report["deleted"] = self.apply_retention()
+        report["finished_at"] = datetime.now(timezone.utc)
+        self.last_run = report
+        return report
+
+    def _locked(self, db: Session) -> bool:
+        return db.scalar(text(f"SELECT pg_try_advisory_xact_lock({ROLLUP_LOCK_ID})"))
+
+    def rollup(self, resolution: str) -> int:
+        """Upsert the rollups of every closed bucket since the last one. Returns the rows written"""
+        db = SessionLocal()
+        try:
+            start = db.scalar(
+                select(func.max(SystemLogRollup.bucket_start))
+                .where(SystemLogRollup.resolution == resolution)
+            ) or db.scalar(select(func.min(SystemLog.created_at)))
+            if start is None:
+                return 0
+            start = _truncate(start.astimezone(timezone.utc), resolution)
+            end = _truncate(datetime.now(timezone.utc) - timedelta(seconds=self.delay), resolution)
+
+            written = 0
+            while start < end:
+                chunk_end = min(start + self.chunk, end)
+                if not self._locked(db):
+                    db.rollback()
+                    return written
+                written += db.execute(
+                    ROLLUP_QUERY,
+                    {"resolution": resolution, "start": start, "end": chunk_end}
+                ).rowcount
+                db.commit()
+                start = chunk_end
+            return written
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def apply_retention(self) -> Dict[str, int]:
+        """
+        Delete raw rows and rollups past their retention period.
+
+        Raw rows are only deleted once their hour is rolled up, in batches so
+        each transaction stays short.
+        """
+        now = datetime.now(timezone.utc)
+        deleted = {"raw": 0}
+        db = SessionLocal()
+        try:
+            rolled_up_until = db.scalar(
+                select(func.max(SystemLogRollup.bucket_start))
+                .where(SystemLogRollup.resolution == "hour")
+            )
+            if rolled_up_until is not None:
+                cutoff = min(now - self.retention["raw"], rolled_up_until)
+                while True:
+                    if not self._locked(db):
+                        db.rollback()
+                        return deleted
+                    expired = (
+                        select(SystemLog.id)
+                        .where(SystemLog.created_at < cutoff)
+                        .order_by(SystemLog.created_at)
+                        .limit(self.delete_batch_size)
+                        .scalar_subquery()
+                    )
+                    count = db.execute(delete(SystemLog).where(SystemLog.id.in_(expired))).rowcount
+                    db.commit()
+                    deleted["raw"] += count
+                    if count < self.delete_batch_size:
+                        break
+
+            for resolution in RESOLUTIONS:
+                deleted[resolution] = db.execute(
+                    delete(SystemLogRollup).where(
+                        SystemLogRollup.resolution == resolution,
+                        SystemLogRollup.bucket_start < now - self.retention[resolution]
+                    )
+                ).rowcount
+            db.commit()
+            return deleted
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+log_rollups = LogRollupTask(
+    settings.LOG_ROLLUP_INTERVAL_SECONDS,
+    settings.LOG_ROLLUP_DELAY_SECONDS,
+    timedelta(hours=settings.LOG_ROLLUP_CHUNK_HOURS),
+    {
+        "raw": timedelta(days=settings.LOG_RETENTION_DAYS),
+        "minute": timedelta(days=settings.LOG_MINUTE_ROLLUP_RETENTION_DAYS),
+        "hour": timedelta(days=settings.LOG_HOUR_ROLLUP_RETENTION_DAYS),
+    },
+    settings.LOG_RETENTION_BATCH_SIZE,
+)
@@ -0,0 +1,145 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.profiling import current_profile
+from app.utils.background import PeriodicTask
+
+# Set by gunicorn.conf.py: every worker writes its samples to files there
+# and /metrics aggregates them
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+STAGES = (
+    "pdf_text",
+    "ocr",
+    "llm_extract",
+    "llm_categorize",
+    "embedding",
+    "db_query",
+    "recommendation_scoring",
+    "serialization",
+)
+
+stage_duration = Histogram(
+    "cvjm_stage_duration_seconds",
+    "Duration of one processing stage",
+    ["stage"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+embedding_batch_size = Histogram(
+    "cvjm_embedding_batch_size",
+    "Number of texts encoded per embedding call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024),
+)
+uploads_in_flight = Gauge(
+    "cvjm_uploads_in_flight",
+    "CV uploads currently being processed",
+    ["mode"],
+    multiprocess_mode="livesum",
+)
+db_pool_connections = Gauge(
+    "cvjm_db_pool_connections",
+    "Connections of a SQLAlchemy pool by state",
+    ["engine", "state"],
+    multiprocess_mode="livesum",
+)
+db_query_errors = Counter(
+    "cvjm_db_query_errors_total",
+    "Statements that raised an error",
+    ["engine"],
+)
+
+for stage in STAGES:
+    # Export every series from the start, even before the stage first runs
+    stage_duration.labels(stage)
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """
+    Context manager / decorator timing one stage.
+
+    Inside a profiled request the time is also added to the profile, and the
+    running thread is sampled while the stage lasts.
+    """
+    profile = current_profile.get()
+    if profile is not None:
+        profile.attach_thread()
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start_time
+        stage_duration.labels(stage).observe(elapsed)
+        if profile is not None:
+            profile.record_stage(stage, elapsed)
+            profile.detach_thread()
+
+
+def instrument_engine(engine: Engine, name: str):
+    """Time every statement of an engine and export its pool usage"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        stage_duration.labels("db_query").observe(elapsed)
+        profile = current_profile.get()
+        if profile is not None:
+            profile.record_stage("db_query", elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _count_error(exception_context):
+        db_query_errors.labels(name).inc()
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start_time"):
+            connection.info["query_start_time"].pop()
+
+    if not hasattr(engine.pool, "checkedout"):
+        return
+    # Read engine.pool on every call: dispose() (e.g. after a fork) replaces it
+    readers = {
+        "checked_out": lambda: engine.pool.checkedout(),
+        "idle": lambda: engine.pool.checkedin(),
+        "overflow": lambda: max(engine.pool.overflow(), 0),
+        "size": lambda: engine.pool.size(),
+    }
+    for state, read in readers.items():
+        if MULTIPROCESS:
+            pool_gauges.add(db_pool_connections.labels(name, state), read)
+        else:
+            db_pool_connections.labels(name, state).set_function(read)
+
+
+class GaugeUpdater(PeriodicTask):
+    """
+    Sets gauges from callbacks every interval seconds.
+
+    In multiprocess mode only values written to the shared files are
+    exported, so gauges cannot use set_function() and are refreshed by this
+    thread instead.
+    """
+
+    name = "gauge-updater"
+
+    def __init__(self, interval: float):
+        super().__init__(interval)
+        self._gauges: List[Tuple[Gauge, Callable[[], float]]] = []
+
+    def add(self, gauge: Gauge, read: Callable[[], float]):
+        self._gauges.append((gauge, read))
+
+    def tick(self):
+        for gauge, read in self._gauges:
+            gauge.set(read())
+
+
+pool_gauges = GaugeUpdater(5.0)
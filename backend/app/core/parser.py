@@ -2,57 +2,69 @@ import fitz
 from PIL import Image
 import io
 import pytesseract
-from typing import Dict
+from typing import Dict, Optional
 from tempfile import NamedTemporaryFile
 from pathlib import Path
 
+from app.core.deadline import Deadline, DeadlineExceeded
+from app.core.metrics import stage_timer
+
 
 class PDFParser:
     """"PDF Parser to extract text from PDF files."""
 
-    def _extract_text(self, file_path: str) -> str:
+    def _extract_text(self, file_path: str, deadline: Optional[Deadline] = None) -> str:
         """Extract text from a PDF file.
 
         Args:
             file_path (str): Path to the PDF file.
+            deadline (Deadline, optional): Request deadline.
         Returns:
             str: Extracted text.    
         """
         text = ""
         try:
-            doc = fitz.open(file_path)
-            for page in doc:
-                text += page.get_text() or ""
+            with stage_timer("pdf_text"):
+                doc = fitz.open(file_path)
+                for page in doc:
+                    text += page.get_text() or ""
         except Exception as e:
             print(f"Error reading PDF with PyMuPDF: {e}")
-            text = self._extract_text_with_ocr(file_path)
+            text = self._extract_text_with_ocr(file_path, deadline)
         return text
 
-    def _extract_text_with_ocr(self, file_path: str) -> str:    
+    def _extract_text_with_ocr(self, file_path: str, deadline: Optional[Deadline] = None) -> str:    
         """Extract text from a PDF file using OCR.
 
         Args:
             file_path (str): Path to the PDF file.  
+            deadline (Deadline, optional): Checked before each page is OCRed.
         Returns:
             str: Extracted text.
         """
         text = ""
         try:
-            doc = fitz.open(file_path)
-            for page in doc:
-                pix = page.get_pixmap(dpi=300)
-                img_bytes = pix.tobytes("png")
-                image = Image.open(io.BytesIO(img_bytes))
-                text += pytesseract.image_to_string(image)
+            with stage_timer("ocr"):
+                doc = fitz.open(file_path)
+                for page in doc:
+                    if deadline is not None:
+                        deadline.check("ocr")
+                    pix = page.get_pixmap(dpi=300)
+                    img_bytes = pix.tobytes("png")
+                    image = Image.open(io.BytesIO(img_bytes))
+                    text += pytesseract.image_to_string(image)
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f"Error during OCR extraction: {e}")
         return text
     
-    def parse_pdf(self, pdf_bytes: bytes, filename: str) -> Dict[str, any]:
+    def parse_pdf(self, pdf_bytes: bytes, filename: str, deadline: Optional[Deadline] = None) -> Dict[str, any]:
         """Parse PDF bytes and extract text.
         Args:
             pdf_bytes (bytes): PDF file content in bytes.
             filename (str): Original filename of the PDF.
+            deadline (Deadline, optional): Request deadline, mostly relevant for OCR.
         Returns:
             Dict[str, any]: Dictionary containing filename, raw_text, text_length, and success status.
         """
@@ -62,10 +74,12 @@ class PDFParser:
             tmp.flush()
             pdf_path = Path(tmp.name)
             try:
-                text = self._extract_text(str(pdf_path))
+                text = self._extract_text(str(pdf_path), deadline)
+            except DeadlineExceeded:
+                raise
             except Exception as e:
                 print(f"Error extracting text: {e}")    
-                text = self._extract_text_with_ocr(str(pdf_path))
+                text = self._extract_text_with_ocr(str(pdf_path), deadline)
 
         if len(text) < 50:
             raise ValueError("Text extraction failed")
@@ -0,0 +1,41 @@
+"""
+Hooks for serving the app from workers forked off a preloaded master, as
+gunicorn.conf.py does.
+
+The master imports the app once, which loads the embedding model, runs the
+migrations and builds every singleton. Forked workers share those pages
+copy-on-write: the model weights are never written to, so they stay shared
+between all workers. What must not cross the fork is reset in after_fork().
+"""
+import gc
+
+from app.core.config import settings
+from app.core.embedding_providers import limit_torch_threads
+from app.core.extraction_cache import extraction_cache
+from app.database.db import async_engine, engine
+from app.utils.logging import log_writer
+
+
+def freeze_heap():
+    """
+    Move every object of the master to the permanent generation.
+
+    The garbage collector then never visits them in the workers, so it does
+    not dirty (and copy) the pages holding them.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def after_fork():
+    """Run first thing in each worker"""
+    # Pooled connections of the master (migrations) belong to it: drop them
+    # from the worker's pools without closing the sockets under the master
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    if extraction_cache is not None:
+        extraction_cache.reopen()
+    # Re-applied in case torch started its thread pool in the master
+    limit_torch_threads(settings.EMBEDDING_THREADS)
+    # Threads do not survive the fork: the master's log writer is gone
+    log_writer.start()
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.users import User
+
+
+class Principal:
+    """Read-only copy of an authenticated user's columns, safe to share between requests"""
+    __slots__ = ("id", "username", "email", "full_name", "role", "is_active", "created_at")
+
+    def __init__(self, id: int, username: str, email: str, full_name: Optional[str], role: str, is_active: bool, created_at: Optional[datetime]):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.full_name = full_name
+        self.role = role
+        self.is_active = is_active
+        self.created_at = created_at
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(user.id, user.username, user.email, user.full_name, user.role, user.is_active, user.created_at)
+
+
+class PrincipalCache:
+    """
+    TTL + LRU cache of active principals keyed by token subject (username).
+
+    Changes to a user made through the ORM in this process invalidate it
+    right away (see _invalidate_user below); other processes pick them up
+    within ttl seconds.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, subject: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[subject]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, subject: str, principal: Principal):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[subject] = (principal, time.monotonic() + self.ttl)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, subject: Optional[str] = None):
+        """Drop one subject, or every entry"""
+        with self._lock:
+            if subject is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(subject, None)
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for subject in [s for s, (principal, _) in self._entries.items() if principal.id == user_id]:
+                del self._entries[subject]
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+principal_cache = PrincipalCache(settings.AUTH_CACHE_MAX_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target):
+    # Covers renames too: entries are matched by id, not by the new username
+    principal_cache.invalidate_user(target.id)
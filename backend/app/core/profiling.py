@@ -0,0 +1,140 @@
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+# Profile of the request being handled, if it asked for one. Copied into
+# run_in_threadpool calls and SQLAlchemy's greenlets with the rest of the context.
+current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class RequestProfile:
+    """
+    Sampling profile and per-stage timings of one request.
+
+    A sampler thread records the stacks of the threads attached to the
+    request: the event loop thread for the whole request, and worker threads
+    while they run one of its stages. The event loop is shared, so its samples
+    can include other requests served at the same time.
+    """
+
+    def __init__(self, path: str, sample_interval: float, max_depth: int):
+        self.id = uuid.uuid4().hex
+        self.path = path
+        self.started_at = datetime.now(timezone.utc)
+        self.duration = None
+        self.sample_interval = sample_interval
+        self.max_depth = max_depth
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self.stages: Dict[str, List[float]] = {}
+        self._threads: Counter = Counter()
+        self._lock = threading.Lock()
+        self._start_time = time.perf_counter()
+        self._stopped = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name=f"profile-{self.id[:8]}", daemon=True)
+
+    def start(self):
+        self.attach_thread()
+        self._sampler.start()
+
+    def stop(self):
+        self.duration = time.perf_counter() - self._start_time
+        self._stopped.set()
+        self._sampler.join()
+        self.detach_thread()
+
+    def attach_thread(self):
+        with self._lock:
+            self._threads[threading.get_ident()] += 1
+
+    def detach_thread(self):
+        with self._lock:
+            thread_id = threading.get_ident()
+            self._threads[thread_id] -= 1
+            if self._threads[thread_id] <= 0:
+                del self._threads[thread_id]
+
+    def record_stage(self, stage: str, elapsed: float):
+        with self._lock:
+            totals = self.stages.setdefault(stage, [0, 0.0])
+            totals[0] += 1
+            totals[1] += elapsed
+
+    def _sample(self):
+        while not self._stopped.wait(self.sample_interval):
+            with self._lock:
+                thread_ids = list(self._threads)
+            frames = sys._current_frames()
+            for thread_id in thread_ids:
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if stack:
+                    self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Stacks in collapsed format (flamegraph.pl, speedscope)"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def summary(self) -> Dict:
+        with self._lock:
+            stages = {
+                stage: {"count": count, "total_ms": round(total * 1000, 3)}
+                for stage, (count, total) in sorted(self.stages.items(), key=lambda item: -item[1][1])
+            }
+        return {
+            "id": self.id,
+            "path": self.path,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "samples": self.samples,
+            "sample_interval_ms": self.sample_interval * 1000,
+            "stages": stages,
+        }
+
+    def to_dict(self, top: int) -> Dict:
+        data = self.summary()
+        data["top_stacks"] = [
+            {"stack": stack.split(";"), "samples": count}
+            for stack, count in self.stacks.most_common(top)
+        ]
+        return data
+
+
+class ProfileStore:
+    """The most recent request profiles, oldest dropped first"""
+
+    def __init__(self, max_size: int):
+        self._profiles = deque(maxlen=max_size)
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile):
+        with self._lock:
+            self._profiles.append(profile)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            return next((profile for profile in self._profiles if profile.id == profile_id), None)
+
+    def list(self) -> List[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._profiles))
+
+
+request_profiles = ProfileStore(settings.PROFILE_STORE_SIZE)
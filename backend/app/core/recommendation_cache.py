@@ -0,0 +1,52 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+
+class RecommendationCache:
+    """
+    LRU cache of encoded recommendation responses.
+
+    Each entry is stored with the ETag it was computed for. The ETag covers
+    the CV and the catalog snapshot of its category, so an entry whose ETag
+    no longer matches is stale and simply recomputed and replaced.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, etag: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, etag: str, body: bytes):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+recommendation_cache = RecommendationCache(settings.RECOMMENDATION_CACHE_SIZE)
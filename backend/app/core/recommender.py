@@ -1,6 +1,11 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.metrics import stage_timer
 from app.core.vector_store import vector_store
 from app.schemas.jobs import JobResponse
+from app.utils.serialization import json_fragment
 
 class JobRecommender:
     """Match CVs with relevant jobs"""
@@ -39,11 +44,8 @@ class JobRecommender:
             return max(0, 1 - (candidate_exp - max_exp) / (max_exp))
 
 
-    def calculate_education_match(self, cv_education: List[Dict], required_edu: dict) -> tuple:
-        """Calculate education match with detailed explanation"""
-
-        score = 0.0
-
+    def candidate_education_text(self, cv_education: List[Dict]) -> str:
+        """Text of the candidate's education used for the education embedding"""
         lines = []
 
         for edu in cv_education:
@@ -58,8 +60,10 @@ class JobRecommender:
             line = " ".join(filter(None, [institution, degree, field, gpa, date_range]))
             lines.append(line)
             
-        candidate_education = "\n".join(lines)
+        return "\n".join(lines)
 
+    def job_education_text(self, required_edu: dict) -> str:
+        """Text of a job's education requirements used for the education embedding"""
         required_degree = required_edu.get("required_degree", "")
         restriction = required_edu.get("degree_restriction", "")
         required_field = required_edu.get("required_field", "")
@@ -75,7 +79,12 @@ class JobRecommender:
         if required_field:
             job_parts.append(f"Required Field {required_field}")
 
-        job_education = " ".join(job_parts)
+        return " ".join(job_parts)
+
+    def calculate_education_match(self, cv_education: List[Dict], required_edu: dict) -> tuple:
+        """Calculate education match with detailed explanation"""
+        candidate_education = self.candidate_education_text(cv_education)
+        job_education = self.job_education_text(required_edu)
 
         candidate_education_embeddings = vector_store.generate_embedding(candidate_education)
         job_education_embeddings = vector_store.generate_embedding(job_education)
@@ -84,14 +93,21 @@ class JobRecommender:
 
         return score
 
-    def match_cv_to_jobs(self, cv_data: Dict, jobs: List[Dict], top_k: int = 10) -> List[Dict]:
-        """Generate job recommendations for a CV"""
+    @stage_timer("recommendation_scoring")
+    def match_cv_to_jobs(self, cv_data: Dict, jobs: List[Dict], top_k: int = 10, semantic_scores: Optional[List[Tuple[int, float]]] = None) -> List[Dict]:
+        """
+        Generate job recommendations for a CV.
+
+        semantic_scores may be fetched by the caller (e.g. on an async
+        session); otherwise they are queried here.
+        """
         try:
             recommendations = []
-            semantic_scores = vector_store.find_similar_jobs_for_cv(
-                    cv_id = cv_data['id'],
-                    job_ids = [job['id'] for job in jobs]
-                )
+            if semantic_scores is None:
+                semantic_scores = vector_store.find_similar_jobs_for_cv(
+                        cv_id = cv_data['id'],
+                        job_ids = [job['id'] for job in jobs]
+                    )
             
             for job in jobs:
                 skills_match = self.calculate_skills_match(
@@ -143,6 +159,122 @@ class JobRecommender:
             print("Error in matching CV to jobs:", str(e))
             return []
         
+    @stage_timer("recommendation_scoring")
+    def match_cv_to_snapshot(self, cv_data: Dict, cv_embedding, snapshot, top_k: int = 10) -> List[Dict]:
+        """
+        Generate job recommendations for a CV from a job catalog snapshot.
+
+        Scores are the same as match_cv_to_jobs, but semantic and education
+        similarities are single matrix products against the snapshot's
+        precomputed embeddings, so no per-job database or model work is done.
+
+        Args:
+            cv_data: CV columns
+            cv_embedding: Stored CV embedding, or None
+            snapshot: CategorySnapshot of the CV's category
+            top_k: Number of recommendations to return
+        """
+        if not len(snapshot):
+            return []
+
+        if cv_embedding is not None:
+            cv_vector = np.asarray(cv_embedding, dtype=np.float32)
+            norm = np.linalg.norm(cv_vector)
+            semantic_scores = snapshot.embeddings @ (cv_vector / norm if norm else cv_vector)
+        else:
+            semantic_scores = np.zeros(len(snapshot), dtype=np.float32)
+
+        candidate_education = vector_store.generate_embedding(
+            self.candidate_education_text(cv_data.get('education') or [])
+        )
+        edu_scores = snapshot.education_embeddings @ np.asarray(candidate_education, dtype=np.float32)
+
+        return self._rank(cv_data, snapshot.records, semantic_scores, edu_scores, top_k)
+
+    @stage_timer("recommendation_scoring")
+    def match_cv_to_candidates(self, cv_data: Dict, records, semantic_scores: np.ndarray, education_embeddings: np.ndarray, top_k: int = 10, category_boost: Optional[float] = None) -> List[Dict]:
+        """
+        Generate job recommendations for a CV from nearest neighbour candidates.
+
+        The candidates come from an ANN search, with their semantic
+        similarity already computed by the database. In hybrid retrieval the
+        search spans every category, and jobs in the CV's category get
+        category_boost added to their score instead of the others being
+        filtered out.
+
+        Args:
+            cv_data: CV columns
+            records: JobRecords of the candidates
+            semantic_scores: Cosine similarity of each candidate to the CV
+            education_embeddings: Normalized education embedding per candidate
+            top_k: Number of recommendations to return
+            category_boost: Added to the score of jobs in cv_data["category"] (hybrid retrieval only)
+        """
+        if not len(records):
+            return []
+
+        candidate_education = vector_store.generate_embedding(
+            self.candidate_education_text(cv_data.get('education') or [])
+        )
+        edu_scores = education_embeddings @ np.asarray(candidate_education, dtype=np.float32)
+        return self._rank(cv_data, records, semantic_scores, edu_scores, top_k, cv_data.get("category"), category_boost)
+
+    def _rank(self, cv_data: Dict, records, semantic_scores: np.ndarray, edu_scores: np.ndarray, top_k: int, category: Optional[str] = None, category_boost: Optional[float] = None) -> List[Dict]:
+        """
+        Score records[i] with semantic_scores[i] and edu_scores[i] and shape
+        the top_k. With a category_boost (hybrid retrieval), jobs in category
+        get it added to their score.
+        """
+        cv_skills_lower = {s.lower() for s in cv_data.get('skills') or []}
+        cv_years = cv_data.get("total_experience", 0)
+        hybrid = category_boost is not None
+
+        scored = []
+        for index, record in enumerate(records):
+            matched = [s for s in record.skills_lower if s in cv_skills_lower]
+            missing = [s for s in record.skills_lower if s not in cv_skills_lower]
+            skills_match = {
+                "score": round(len(matched) / len(record.skills_lower), 3) if record.skills_lower else 0,
+                "matched_skills": matched,
+                "missing_skills": missing
+            }
+            exp_score = self.calculate_experience_match(cv_years, record.experience_years)
+            semantic_score = float(semantic_scores[index])
+            edu_score = float(edu_scores[index])
+
+            match_score = (
+                0.45 * semantic_score +
+                0.30 * skills_match['score'] +
+                0.15 * exp_score +
+                0.10 * edu_score
+            )
+            category_match = 1.0 if record.category == category else 0.0
+            if hybrid:
+                match_score += category_boost * category_match
+            scored.append((match_score, record, skills_match, exp_score, edu_score, semantic_score, category_match))
+
+        scored.sort(key=lambda x: x[0], reverse=True)
+        recommendations = []
+        # Shaped and typed like JobRecommendationResponse (floats stay floats)
+        # so it can be encoded directly; "job" is the pre-encoded JobResponse
+        for match_score, record, skills_match, exp_score, edu_score, semantic_score, category_match in scored[:top_k]:
+            matching_factors = {
+                "skills_match": round(float(skills_match['score']), 3),
+                "experience_match": round(float(exp_score), 3),
+                "education_match": round(edu_score, 3),
+                "semantic_similarity": round(semantic_score, 3),
+                "category_match": category_match if hybrid else None
+            }
+            recommendations.append({
+                "job": json_fragment(record.job_json),
+                "match_score": round(float(match_score), 3),
+                "matching_factors": matching_factors,
+                "matched_skills": skills_match['matched_skills'],
+                "missing_skills": skills_match['missing_skills'],
+                "explanation": self._generate_explanation(match_score, skills_match, cv_years)
+            })
+        return recommendations
+
     def _generate_explanation(self, match_score: float, skills_match: Dict,
                             cv_years: int) -> str:
         """Generate human-readable explanation"""
@@ -0,0 +1,125 @@
+import threading
+from typing import Iterable, List, Set
+
+from app.core.config import settings
+from app.core.events import job_events
+from app.core.vector_store import vector_store
+from app.database.db import SessionLocal
+from app.models.jobs import Job, upsert_job_embeddings
+from app.schemas.jobs import JobCreate
+from app.utils.background import PeriodicTask
+from app.utils.logging import create_log
+
+
+class JobReembedder(PeriodicTask):
+    """
+    Refreshes embeddings of updated jobs off the request path.
+
+    Job ids are collected in a set (so repeated updates of one job are embedded
+    once) and flushed in batches when the batch is full or the flush interval
+    has passed.
+    """
+
+    name = "job-reembedder"
+
+    def __init__(self, batch_size: int, flush_interval: float):
+        super().__init__(flush_interval)
+        self.batch_size = batch_size
+        self._pending: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the background thread and flush what is still pending"""
+        super().stop(timeout)
+        self.flush()
+
+    def enqueue(self, job_ids: Iterable[int]):
+        """Schedule jobs for re-embedding"""
+        with self._lock:
+            self._pending.update(job_ids)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.notify()
+
+    def _take_batch(self) -> List[int]:
+        with self._lock:
+            batch = sorted(self._pending)[:self.batch_size]
+            self._pending.difference_update(batch)
+            return batch
+
+    def tick(self):
+        self.flush()
+
+    def flush(self):
+        """Re-embed everything pending, one batch at a time"""
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            try:
+                self.reembed(batch)
+            except Exception as e:
+                print(f"Job re-embedding error: {e}")
+
+    def reembed(self, job_ids: List[int]) -> List[int]:
+        """
+        Re-embed the given jobs whose text changed since their last embedding.
+
+        Args:
+            job_ids: Candidate job ids
+
+        Returns:
+            List[int]: Ids of the jobs that were re-embedded
+        """
+        db = SessionLocal()
+        try:
+            jobs = db.query(Job).filter(Job.id.in_(job_ids)).all()
+            changed = []
+            for job in jobs:
+                job_data = JobCreate.model_validate(job)
+                digest = job_data.embedding_hash()
+                if digest != job.embedding_hash:
+                    changed.append((job, job_data.to_embedding_text(), digest))
+
+            if not changed:
+                return []
+
+            embeddings = vector_store.generate_batch_embeddings(
+                [job_text for _, job_text, _ in changed],
+                batch_size=settings.EMBEDDING_BATCH_SIZE
+            )
+
+            db.execute(upsert_job_embeddings([
+                {
+                    "job_id": job.id,
+                    "embedding": embedding,
+                    "model_name": settings.EMBEDDING_MODEL,
+                    "is_expired": bool(job.is_expired),
+                }
+                for (job, _, _), embedding in zip(changed, embeddings)
+            ]))
+            for job, _, digest in changed:
+                # The stored hash is the one of the text actually embedded, so
+                # an update racing with this batch is picked up again later.
+                job.embedding_hash = digest
+            db.commit()
+
+            reembedded = [job.id for job, _, _ in changed]
+            job_events.publish("reembedded", reembedded)
+            return reembedded
+
+        except Exception as e:
+            db.rollback()
+            create_log(
+                db=db,
+                log_name="job_reembed_failed",
+                log_type="ERROR",
+                function_name="JobReembedder.reembed",
+                description=str(e)
+            )
+            raise
+        finally:
+            db.close()
+
+
+job_reembedder = JobReembedder(settings.REEMBED_BATCH_SIZE, settings.REEMBED_FLUSH_INTERVAL_SECONDS)
@@ -0,0 +1,321 @@
+import re
+from typing import Dict, List, Optional
+
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(
+    r"(?<![\w+])\+?\d{0,3}[\s.\-‐‑–]?\(?\d{2,4}\)?[\s.\-‐‑–]?\d{3,4}[\s.\-‐‑–]?\d{3,5}(?!\w)"
+)
+SECTION_HEADING_RE = re.compile(r"^[A-Z][A-Za-z &/]{2,40}:?$")
+
+# Canonical skill name -> aliases as they commonly appear in CVs (case-insensitive)
+SKILL_DICTIONARY = {
+    "Python": ["python"],
+    "Java": ["java"],
+    "JavaScript": ["javascript", "js"],
+    "TypeScript": ["typescript"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp"],
+    "Go": ["golang"],
+    "Rust": ["rust"],
+    "Ruby": ["ruby"],
+    "PHP": ["php"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swift"],
+    "Scala": ["scala"],
+    "MATLAB": ["matlab"],
+    "SQL": ["sql"],
+    "NoSQL": ["nosql"],
+    "MySQL": ["mysql"],
+    "PostgreSQL": ["postgresql", "postgres"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "Elasticsearch": ["elasticsearch"],
+    "Neo4j": ["neo4j"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3"],
+    "HTML/CSS": ["html/css"],
+    "React": ["react", "react.js"],
+    "ReactJS": ["reactjs"],
+    "React Native": ["react native"],
+    "Angular": ["angular"],
+    "AngularJS": ["angularjs"],
+    "Vue.js": ["vue", "vue.js", "vuejs"],
+    "Node.js": ["node.js", "node"],
+    "NodeJS": ["nodejs"],
+    "Express": ["express.js"],
+    "ExpressJS": ["expressjs"],
+    "jQuery": ["jquery"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi"],
+    "Spring": ["spring boot", "spring framework", "spring mvc", "spring rest"],
+    ".NET": [".net", "asp.net"],
+    "GraphQL": ["graphql"],
+    "REST APIs": ["rest api", "rest apis", "restful api", "restful apis"],
+    "Docker": ["docker"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Terraform": ["terraform"],
+    "Ansible": ["ansible"],
+    "Jenkins": ["jenkins"],
+    "CircleCI": ["circleci"],
+    "GitHub Actions": ["github actions"],
+    "CI/CD": ["ci/cd"],
+    "Git": ["git"],
+    "Linux": ["linux"],
+    "AWS": ["aws", "amazon web services"],
+    "Microsoft Azure": ["azure", "microsoft azure"],
+    "Google Cloud": ["gcp", "google cloud"],
+    "Heroku": ["heroku"],
+    "Maven": ["maven"],
+    "Tomcat": ["tomcat"],
+    "Grunt": ["grunt"],
+    "Webpack": ["webpack"],
+    "Socket.io": ["socket.io"],
+    "Machine Learning": ["machine learning"],
+    "Deep Learning": ["deep learning"],
+    "Generative AI": ["generative ai"],
+    "Natural Language Processing": ["natural language processing", "nlp"],
+    "Computer Vision": ["computer vision"],
+    "TensorFlow": ["tensorflow"],
+    "Keras": ["keras"],
+    "PyTorch": ["pytorch"],
+    "Scikit-Learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "Matplotlib": ["matplotlib"],
+    "Seaborn": ["seaborn"],
+    "Plotly": ["plotly"],
+    "OpenCV": ["opencv"],
+    "NLTK": ["nltk"],
+    "Hugging Face Transformers": ["hugging face", "huggingface"],
+    "LangChain": ["langchain"],
+    "PySpark": ["pyspark"],
+    "Apache Spark": ["spark", "apache spark"],
+    "Hadoop": ["hadoop"],
+    "Airflow": ["airflow"],
+    "Streamlit": ["streamlit"],
+    "ETL": ["etl"],
+    "Statistics": ["statistics"],
+    "Data Visualization": ["data visualization"],
+    "Data Analysis": ["data analysis"],
+    "Tableau": ["tableau"],
+    "Power BI": ["power bi", "powerbi"],
+    "Microsoft Excel": ["microsoft excel", "ms excel", "excel spreadsheets"],
+    "Microsoft Office": ["microsoft office", "ms office"],
+    "Google Sheets": ["google sheets"],
+    "SSIS": ["ssis"],
+    "SSRS": ["ssrs"],
+    "Postman": ["postman"],
+    "API Testing": ["api testing"],
+    "Selenium": ["selenium"],
+    "JIRA": ["jira"],
+    "Confluence": ["confluence"],
+    "Lucidchart": ["lucidchart"],
+    "Agile Methodologies": ["agile", "scrum", "kanban"],
+    "Project Management": ["project management"],
+    "Product Management": ["product management"],
+    "Figma": ["figma"],
+    "Adobe Photoshop": ["photoshop", "adobe photoshop"],
+    "Adobe Illustrator": ["illustrator", "adobe illustrator"],
+    "UI/UX Design": ["ui/ux", "ux design", "ui design"],
+    "SEO": ["seo"],
+    "Google Analytics": ["google analytics"],
+    "Salesforce": ["salesforce"],
+    "HubSpot": ["hubspot"],
+    "CRM": ["crm"],
+    "Digital Marketing": ["digital marketing"],
+    "Business Development": ["business development"],
+    "QuickBooks": ["quickbooks"],
+    "SAP": ["sap"],
+    "Financial Analysis": ["financial analysis"],
+    "Bookkeeping": ["bookkeeping"],
+    "Accounting": ["accounting"],
+    "Budgeting": ["budgeting"],
+    "Talent Acquisition": ["talent acquisition"],
+    "Recruitment": ["recruitment", "recruiting"],
+    "Employee Relations": ["employee relations"],
+    "Payroll": ["payroll"],
+    "Onboarding": ["onboarding"],
+    "Change Management": ["change management"],
+    "Workforce Planning": ["workforce planning"],
+    "Customer Service": ["customer service"],
+    "Zendesk": ["zendesk"],
+    "Inventory Management": ["inventory management", "stock management"],
+    "Supply Chain Management": ["supply chain"],
+    "Logistics": ["logistics"],
+    "Six Sigma": ["six sigma"],
+    "Quality Assurance": ["quality assurance"],
+    "Patient Care": ["patient care"],
+    "Curriculum Development": ["curriculum development"],
+    "Legal Research": ["legal research"],
+    "Compliance": ["compliance"],
+}
+
+KNOWN_LANGUAGES = [
+    "English", "Spanish", "French", "German", "Italian", "Portuguese", "Dutch",
+    "Russian", "Ukrainian", "Polish", "Turkish", "Arabic", "Hebrew", "Persian",
+    "Urdu", "Hindi", "Bengali", "Punjabi", "Tamil", "Nepali", "Chinese",
+    "Mandarin", "Cantonese", "Japanese", "Korean", "Vietnamese", "Thai",
+    "Indonesian", "Malay", "Filipino", "Tagalog", "Swahili", "Greek", "Swedish",
+    "Norwegian", "Danish", "Finnish",
+]
+
+# Keywords (matched against lowercased skills and text) that vote for a category
+CATEGORY_KEYWORDS = {
+    "Software Engineering": [
+        "software engineer", "developer", "programmer", "java", "javascript", "react",
+        "node", "spring", "docker", "kubernetes", "api", "backend", "frontend", "full stack",
+    ],
+    "Data Science & AI": [
+        "data scientist", "machine learning", "deep learning", "data analyst", "tensorflow",
+        "pytorch", "pandas", "statistics", "nlp", "generative ai", "tableau", "power bi",
+    ],
+    "Product Management": ["product manager", "product management", "roadmap", "product owner"],
+    "Design & UX": ["designer", "ui/ux", "figma", "photoshop", "illustrator", "user research"],
+    "Marketing & Sales": [
+        "marketing", "sales", "seo", "campaign", "business development", "revenue", "brand",
+    ],
+    "Finance & Accounting": ["accountant", "accounting", "finance", "audit", "bookkeeping", "quickbooks", "tax"],
+    "Human Resources": [
+        "human resources", "hr ", "talent acquisition", "recruitment", "recruiting",
+        "employee relations", "payroll", "onboarding", "sphr", "shrm",
+    ],
+    "Customer Support": ["customer service", "customer support", "call center", "zendesk", "client support"],
+    "Operations & Logistics": [
+        "operations", "logistics", "supply chain", "inventory", "store manager", "store operations",
+        "warehouse", "procurement",
+    ],
+    "Healthcare & Medical": ["nurse", "patient", "clinical", "medical", "hospital", "physician", "healthcare"],
+    "Education & Training": ["teacher", "teaching", "curriculum", "tutor", "lecturer", "instructor", "training"],
+    "Legal & Compliance": ["lawyer", "attorney", "legal", "compliance", "paralegal", "litigation"],
+    "Research & Development": ["research", "laboratory", "r&d", "publication", "thesis", "phd"],
+}
+
+
+def _alias_pattern(aliases: List[str]) -> str:
+    return "|".join(re.escape(alias) for alias in sorted(aliases, key=len, reverse=True))
+
+
+class RuleBasedExtractor:
+    """Deterministic regex and dictionary based CV field extraction"""
+
+    def __init__(self, skill_dictionary: Dict[str, List[str]] = SKILL_DICTIONARY):
+        self.alias_to_skill = {
+            alias.lower(): skill
+            for skill, aliases in skill_dictionary.items()
+            for alias in aliases
+        }
+        self.skill_re = re.compile(
+            r"(?<![\w+#./-])(" + _alias_pattern(list(self.alias_to_skill)) + r")(?![\w+#]|\.\w)",
+            re.IGNORECASE
+        )
+        self.language_re = re.compile(r"\b(" + "|".join(KNOWN_LANGUAGES) + r")\b", re.IGNORECASE)
+
+    def extract_email(self, cv_text: str) -> Optional[str]:
+        """Return the first email address in the text"""
+        match = EMAIL_RE.search(cv_text)
+        return match.group(0) if match else None
+
+    def extract_phone(self, cv_text: str) -> Optional[str]:
+        """Return the first phone-number-looking token with 9 to 15 digits"""
+        for match in PHONE_RE.finditer(cv_text):
+            candidate = match.group(0).strip()
+            digits = re.sub(r"\D", "", candidate)
+            if 9 <= len(digits) <= 15:
+                return candidate
+        return None
+
+    def extract_name(self, cv_text: str) -> Optional[str]:
+        """Guess the candidate name from the first lines of the CV"""
+        for line in cv_text.splitlines()[:5]:
+            # Drop post-nominals such as "JANE DOE, MBA, SPHR"
+            line = line.split(",")[0]
+            words = line.split()
+            if not 2 <= len(words) <= 4:
+                continue
+            if any(char.isdigit() for char in line) or "@" in line:
+                continue
+            if all(word.replace(".", "").replace("-", "").isalpha() for word in words):
+                return " ".join(words)
+        return None
+
+    def extract_skills(self, cv_text: str) -> List[str]:
+        """Return dictionary skills in order of first appearance"""
+        skills = []
+        for match in self.skill_re.finditer(cv_text):
+            skill = self.alias_to_skill[match.group(1).lower()]
+            if skill not in skills:
+                skills.append(skill)
+        return skills
+
+    def extract_languages(self, cv_text: str) -> List[str]:
+        """Return spoken languages listed under a 'Languages' section"""
+        lines = cv_text.splitlines()
+        section = []
+        in_section = False
+        for line in lines:
+            stripped = line.strip()
+            if stripped.lower().rstrip(":") in ("languages", "language", "language skills"):
+                in_section = True
+                continue
+            if in_section:
+                if SECTION_HEADING_RE.match(stripped) and not self.language_re.search(stripped):
+                    break
+                section.append(stripped)
+
+        languages = []
+        for match in self.language_re.finditer("\n".join(section)):
+            language = match.group(1).capitalize()
+            if language not in languages:
+                languages.append(language)
+        return languages
+
+    def categorize(self, skills: List[str], cv_text: str) -> str:
+        """Keyword-vote category; 'Other' when nothing matches"""
+        haystack = (" ".join(skills) + "\n" + cv_text).lower()
+        scores = {
+            category: sum(haystack.count(keyword) for keyword in keywords)
+            for category, keywords in CATEGORY_KEYWORDS.items()
+        }
+        category, score = max(scores.items(), key=lambda item: item[1])
+        return category if score > 0 else "Other"
+
+    def extract(self, cv_text: str) -> Dict:
+        """
+        Extract the fields that can be found deterministically.
+
+        Args:
+            cv_text: Raw CV text from the PDF parser
+
+        Returns:
+            Dict: Only the fields that were found
+        """
+        fields = {
+            "name": self.extract_name(cv_text),
+            "email": self.extract_email(cv_text),
+            "phone": self.extract_phone(cv_text),
+            "skills": self.extract_skills(cv_text),
+            "languages": self.extract_languages(cv_text),
+        }
+        return {key: value for key, value in fields.items() if value}
+
+    def to_cv_data(self, fields: Dict, cv_text: str) -> Dict:
+        """Complete rule-based fields into a CVData-shaped dictionary"""
+        skills = fields.get("skills", [])
+        return {
+            "name": fields.get("name") or "Unknown",
+            "email": fields.get("email"),
+            "phone": fields.get("phone"),
+            "location": None,
+            "summary": None,
+            "work": [],
+            "education": [],
+            "skills": skills,
+            "languages": fields.get("languages", []),
+            "certifications": [],
+            "category": self.categorize(skills, cv_text),
+        }
+
+
+rule_extractor = RuleBasedExtractor()
@@ -1,54 +1,116 @@
-from sentence_transformers import SentenceTransformer
 import numpy as np
-from typing import List, Dict, Tuple
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 
 from app.core.config import settings
+from app.core.embedding_providers import get_embedding_model
+from app.core.metrics import embedding_batch_size, stage_timer
 from sqlalchemy import select
 from sqlalchemy.sql import text
-from app.database.db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.db import get_db, sql_literal
+
+SIMILAR_JOBS_QUERY = text("""
+SELECT
+    j.job_id,
+    1 - (c.embedding <=> j.embedding) AS similarity_score
+FROM cv_embeddings c
+JOIN job_embeddings j
+    ON j.job_id = ANY(:job_ids) AND j.model_name = :model_name
+WHERE c.cv_id = :cv_id AND c.model_name = :model_name
+ORDER BY similarity_score DESC
+""")
+
+# Nearest active jobs to a CV, of one category or of any. The CV's vector is
+# a scalar subquery so the ORDER BY ... LIMIT runs as an HNSW index scan, and
+# the model name and category are literals so the planner can match the
+# predicate of that shard's partial index (see app.core.job_shards).
+NEAREST_JOBS_QUERY = """
+SELECT e.job_id, 1 - e.distance AS similarity, j.updated_at
+FROM (
+    SELECT job_id, embedding <=> (
+        SELECT embedding FROM cv_embeddings WHERE cv_id = :cv_id AND model_name = :model_name
+    ) AS distance
+    FROM job_embeddings
+    WHERE {predicate}
+    ORDER BY distance
+    LIMIT :limit
+) e
+JOIN jobs j ON j.id = e.job_id
+ORDER BY e.distance
+"""
+
+
+@lru_cache(maxsize=64)
+def nearest_jobs_query(category: Optional[str] = None):
+    predicate = f"model_name = {sql_literal(settings.EMBEDDING_MODEL)} AND NOT is_expired"
+    if category is not None:
+        predicate = f"company_industry = {sql_literal(category)} AND {predicate}"
+    return text(NEAREST_JOBS_QUERY.format(predicate=predicate))
+
+
 class VectorStore:
     """Manage embeddings and vector similarity search with cosine similarity"""
 
 
-    def __init__(self, embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(self, embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2", provider: str = "sentence-transformers"):
         model_name = embedding_model
-        self.model = SentenceTransformer(model_name)
+        self.model = get_embedding_model(provider, model_name, settings.EMBEDDING_DIMENSIONS, settings.EMBEDDING_THREADS)
         self.dimension = self.model.get_sentence_embedding_dimension()
 
     def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text"""
-        embedding = self.model.encode(text, normalize_embeddings=True)
+        embedding_batch_size.observe(1)
+        with stage_timer("embedding"):
+            embedding = self.model.encode(text, normalize_embeddings=True)
         return embedding.tolist()
 
-    def generate_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def generate_batch_embeddings(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
         """Generate embeddings for multiple texts"""
-        embeddings = self.model.encode(texts, normalize_embeddings=True, batch_size=32)
+        embedding_batch_size.observe(len(texts))
+        with stage_timer("embedding"):
+            embeddings = self.model.encode(texts, normalize_embeddings=True, batch_size=batch_size)
         return embeddings.tolist()
     
     def find_similar_jobs_for_cv(self, cv_id: int, job_ids:List[int]) -> List[Tuple[int, float]]:
         """Find most similarity between vectors in the vector store"""
-        query = text("""
-        SELECT
-            j.job_id,
-            1 - (c.embedding <=> j.embedding) AS similarity_score
-        FROM cv_embeddings c
-        JOIN job_embeddings j
-            ON j.job_id = ANY(:job_ids)
-        WHERE c.cv_id = :cv_id
-        ORDER BY similarity_score DESC
-        """)
-
         db = next(get_db())
         result = db.execute(
-            query,
+            SIMILAR_JOBS_QUERY,
             {
                 "cv_id": cv_id,
-                "job_ids": job_ids
+                "job_ids": job_ids,
+                "model_name": settings.EMBEDDING_MODEL
             }
         ).fetchall()
 
         return result
 
+    async def afind_similar_jobs_for_cv(self, db: AsyncSession, cv_id: int, job_ids: List[int]) -> List[Tuple[int, float]]:
+        """Async variant of find_similar_jobs_for_cv on the request's session"""
+        result = await db.execute(
+            SIMILAR_JOBS_QUERY,
+            {"cv_id": cv_id, "job_ids": job_ids, "model_name": settings.EMBEDDING_MODEL}
+        )
+        return [tuple(row) for row in result.fetchall()]
+
+    async def anearest_jobs_for_cv(self, db: AsyncSession, cv_id: int, limit: int, category: Optional[str] = None) -> List[Tuple[int, float, object]]:
+        """
+        Approximate nearest active jobs to a CV, of one category or of every
+        category (None).
+
+        Returns (job_id, cosine similarity, job updated_at) rows, most similar
+        first, or none if the CV has no embedding. hnsw.ef_search is raised to
+        limit (up to pgvector's maximum of 1000) for the transaction, as the
+        index scan returns at most ef_search rows.
+        """
+        await db.execute(text("SELECT set_config('hnsw.ef_search', :ef_search, true)"), {"ef_search": str(min(max(limit, 40), 1000))})
+        result = await db.execute(
+            nearest_jobs_query(category),
+            {"cv_id": cv_id, "model_name": settings.EMBEDDING_MODEL, "limit": limit}
+        )
+        # A CV without an embedding has no distance to anything
+        return [tuple(row) for row in result.fetchall() if row.similarity is not None]
 
     def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors"""
@@ -60,4 +122,4 @@ class VectorStore:
     
 
 
-vector_store = VectorStore(settings.EMBEDDING_MODEL)
\ No newline at end of file
+vector_store = VectorStore(settings.EMBEDDING_MODEL, settings.EMBEDDING_PROVIDER)
\ No newline at end of file
@@ -1,12 +1,37 @@
+from pathlib import Path
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_engine
 
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine for the request path; background threads keep using SessionLocal.
+# pgvector's Vector type binds and reads vectors in their text form, so asyncpg
+# needs no codec for them (its binary one would reject the bound text).
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    pool_size=settings.ASYNC_DB_POOL_SIZE,
+    max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+)
+# expire_on_commit=False: expired attributes would need a lazy load, which is
+# not allowed outside an await in async sessions.
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "async")
+
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+MIGRATIONS_LOCK_ID = 4242
+
 
 def get_db():
     db = SessionLocal()
@@ -16,5 +41,31 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def sql_literal(value: str) -> str:
+    """Quoted SQL string literal, for partial index predicates and the queries that must match them"""
+    return "'" + value.replace("'", "''") + "'"
+
+
 def create_tables():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+
+
+def run_migrations():
+    """
+    Apply the idempotent SQL files in migrations/ in name order.
+
+    create_all only creates missing tables, so new columns and indexes on
+    existing tables are added here. An advisory lock keeps several workers
+    starting at once from running them concurrently.
+    """
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f"SELECT pg_advisory_xact_lock({MIGRATIONS_LOCK_ID})")
+        # Readable in migrations as current_setting('app.embedding_model')
+        connection.exec_driver_sql("SELECT set_config('app.embedding_model', %s, true)", (settings.EMBEDDING_MODEL,))
+        for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+            connection.exec_driver_sql(path.read_text())
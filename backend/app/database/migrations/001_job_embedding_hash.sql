@@ -0,0 +1,2 @@
+-- Hash of JobBase.to_embedding_text() the stored embedding was computed from
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS embedding_hash VARCHAR(64);
@@ -0,0 +1,20 @@
+-- Keyset pagination on (created_at, id) and pushed down listing filters
+CREATE INDEX IF NOT EXISTS ix_jobs_created_at_id ON jobs (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_jobs_industry_created_at_id ON jobs (company_industry, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_jobs_location ON jobs (location);
+CREATE INDEX IF NOT EXISTS ix_jobs_salary ON jobs (salary);
+CREATE INDEX IF NOT EXISTS ix_cvs_created_at_id ON cvs (created_at, id);
+
+-- The keyset (cursor) needs a created_at on every row: rows without one
+-- sort as the oldest. Checked first so the backfill runs only once
+DO $$
+BEGIN
+    IF NOT (SELECT attnotnull FROM pg_attribute WHERE attrelid = 'jobs'::regclass AND attname = 'created_at') THEN
+        UPDATE jobs SET created_at = 'epoch' WHERE created_at IS NULL;
+        ALTER TABLE jobs ALTER COLUMN created_at SET DEFAULT now(), ALTER COLUMN created_at SET NOT NULL;
+    END IF;
+    IF NOT (SELECT attnotnull FROM pg_attribute WHERE attrelid = 'cvs'::regclass AND attname = 'created_at') THEN
+        UPDATE cvs SET created_at = 'epoch' WHERE created_at IS NULL;
+        ALTER TABLE cvs ALTER COLUMN created_at SET DEFAULT now(), ALTER COLUMN created_at SET NOT NULL;
+    END IF;
+END $$;
@@ -0,0 +1,10 @@
+-- Partial indexes over the active (not expired) job catalog
+CREATE INDEX IF NOT EXISTS ix_jobs_active_industry ON jobs (company_industry) WHERE NOT is_expired;
+CREATE INDEX IF NOT EXISTS ix_jobs_active_expires_at ON jobs (expires_at) WHERE NOT is_expired;
+
+-- job_embeddings mirrors jobs.is_expired so vector scans can skip expired jobs
+ALTER TABLE job_embeddings ADD COLUMN IF NOT EXISTS is_expired BOOLEAN NOT NULL DEFAULT false;
+UPDATE job_embeddings e SET is_expired = true
+FROM jobs j
+WHERE j.id = e.job_id AND j.is_expired AND NOT e.is_expired;
+CREATE INDEX IF NOT EXISTS ix_job_embeddings_active_job_id ON job_embeddings (job_id) WHERE NOT is_expired;
@@ -0,0 +1,22 @@
+-- One embedding per (entity, model). Legacy rows are labelled with the
+-- configured model and duplicates (keeping the newest) are removed once,
+-- before the unique indexes exist.
+ALTER TABLE cv_embeddings ADD COLUMN IF NOT EXISTS model_name VARCHAR;
+UPDATE cv_embeddings SET model_name = current_setting('app.embedding_model') WHERE model_name IS NULL;
+ALTER TABLE cv_embeddings ALTER COLUMN model_name SET NOT NULL;
+
+DO $$
+BEGIN
+    IF to_regclass('uq_job_embeddings_job_model') IS NULL THEN
+        UPDATE job_embeddings SET model_name = current_setting('app.embedding_model') WHERE model_name = '';
+        DELETE FROM job_embeddings a USING job_embeddings b
+        WHERE a.job_id = b.job_id AND a.model_name = b.model_name AND a.id < b.id;
+    END IF;
+    IF to_regclass('uq_cv_embeddings_cv_model') IS NULL THEN
+        DELETE FROM cv_embeddings a USING cv_embeddings b
+        WHERE a.cv_id = b.cv_id AND a.model_name = b.model_name AND a.id < b.id;
+    END IF;
+END $$;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_job_embeddings_job_model ON job_embeddings (job_id, model_name);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_cv_embeddings_cv_model ON cv_embeddings (cv_id, model_name);
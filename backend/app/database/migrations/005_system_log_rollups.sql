@@ -0,0 +1,2 @@
+-- Range scans of system_logs by time for rollups and retention
+CREATE INDEX IF NOT EXISTS ix_system_logs_created_at ON system_logs (created_at);
@@ -0,0 +1,34 @@
+-- job_embeddings mirrors jobs.company_industry so vector scans can be
+-- scoped to one category and use that category's partial HNSW index
+-- (created by app.core.job_shards). Triggers keep the copy in sync on every
+-- write path.
+ALTER TABLE job_embeddings ADD COLUMN IF NOT EXISTS company_industry VARCHAR;
+UPDATE job_embeddings e SET company_industry = j.company_industry
+FROM jobs j
+WHERE j.id = e.job_id AND e.company_industry IS NULL;
+
+CREATE OR REPLACE FUNCTION job_embeddings_copy_industry() RETURNS trigger AS $$
+BEGIN
+    -- Bulk writers that know the category (the COPY import) set it themselves
+    IF TG_OP = 'UPDATE' OR NEW.company_industry IS NULL THEN
+        SELECT company_industry INTO NEW.company_industry FROM jobs WHERE id = NEW.job_id;
+    END IF;
+    RETURN NEW;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER job_embeddings_copy_industry
+BEFORE INSERT OR UPDATE OF job_id ON job_embeddings
+FOR EACH ROW EXECUTE FUNCTION job_embeddings_copy_industry();
+
+CREATE OR REPLACE FUNCTION jobs_propagate_industry() RETURNS trigger AS $$
+BEGIN
+    UPDATE job_embeddings SET company_industry = NEW.company_industry WHERE job_id = NEW.id;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER jobs_propagate_industry
+AFTER UPDATE OF company_industry ON jobs
+FOR EACH ROW WHEN (OLD.company_industry IS DISTINCT FROM NEW.company_industry)
+EXECUTE FUNCTION jobs_propagate_industry();
+
+CREATE INDEX IF NOT EXISTS ix_job_embeddings_active_industry ON job_embeddings (company_industry, model_name) WHERE NOT is_expired;
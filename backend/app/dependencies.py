@@ -1,18 +1,27 @@
 from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Query, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database.db import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.db import get_async_db
 from app.models.users import User
 from app.core.auth import auth_handler
+from app.core.config import settings
+from app.core.principals import Principal, principal_cache
+from app.core.profiling import RequestProfile, current_profile, request_profiles
 
 security = HTTPBearer()
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token"""
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """
+    Get current authenticated user from JWT token.
+
+    Active users are served from principal_cache, so most requests skip the
+    users lookup (the session then never takes a connection).
+    """
     token = credentials.credentials
     payload = auth_handler.decode_token(token)
     username = payload.get("sub")
@@ -22,8 +31,12 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
+
+    principal = principal_cache.get(username)
+    if principal is not None:
+        return principal
     
-    user = db.query(User).filter(User.username == username).first()
+    user = await db.scalar(select(User).where(User.username == username))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,10 +48,12 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user"
         )
-    
-    return user
 
-def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    principal = Principal.from_user(user)
+    principal_cache.set(username, principal)
+    return principal
+
+def get_current_admin(current_user: Principal = Depends(get_current_user)) -> Principal:
     """Verify that current user is an admin"""
     if current_user.role != "admin":
         raise HTTPException(
@@ -48,8 +63,41 @@ def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 async def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
 ):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
\ No newline at end of file
+    return current_user
+
+async def profile_request(
+    request: Request,
+    response: Response,
+    profile: bool = Query(False, description="Profile this request (admins only)"),
+    x_profile: bool = Header(False, description="Profile this request (admins only)"),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Profile the request when asked to with ?profile=true or X-Profile: true.
+    Both are parsed as booleans, so false or 0 leave profiling off. The
+    profile id is returned in X-Profile-Id (except by routes that return
+    their own Response) and every profile is listed at /system/profiles.
+    """
+    if not profile and not x_profile:
+        yield None
+        return
+
+    get_current_admin(current_user)
+    request_profile = RequestProfile(
+        request.url.path,
+        settings.PROFILE_SAMPLE_INTERVAL_SECONDS,
+        settings.PROFILE_MAX_STACK_DEPTH
+    )
+    response.headers["X-Profile-Id"] = request_profile.id
+    token = current_profile.set(request_profile)
+    request_profile.start()
+    try:
+        yield request_profile
+    finally:
+        request_profile.stop()
+        current_profile.reset(token)
+        request_profiles.add(request_profile)
@@ -5,10 +5,20 @@ from app.api.routes import job
 from app.api.routes import auth 
 from app.api.routes import cv 
 from app.api.routes import recommendation
+from app.api.routes import system
+from app.api.routes import metrics
 from app.core.config import settings
-from app.database.db import create_tables
+from app.core.expiry import job_expiry_sweeper
+from app.core.ingestion import ingestion_workers
+from app.core.job_shards import job_shard_indexer
+from app.core.log_rollups import log_rollups
+from app.core.metrics import MULTIPROCESS, pool_gauges
+from app.core.reembedding import job_reembedder
+from app.database.db import create_tables, run_migrations
+from app.utils.logging import log_writer
 
 create_tables()
+run_migrations()
 
 app = FastAPI(
     title="CV-Job Matching System API",
@@ -25,10 +35,39 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def start_background_workers():
+    log_writer.start()
+    ingestion_workers.start()
+    job_reembedder.start()
+    job_expiry_sweeper.start()
+    log_rollups.start()
+    if settings.JOB_SHARD_INDEXES_ENABLED:
+        job_shard_indexer.start()
+        # Build missing indexes now rather than after the first interval
+        job_shard_indexer.notify()
+    if MULTIPROCESS:
+        pool_gauges.start()
+
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    ingestion_workers.stop()
+    job_reembedder.stop()
+    job_expiry_sweeper.stop()
+    log_rollups.stop()
+    job_shard_indexer.stop()
+    pool_gauges.stop()
+    log_writer.stop()
+
+
 app.include_router(auth.router, prefix=settings.API_PREFIX, tags=["auth"])
 app.include_router(cv.router, prefix=settings.API_PREFIX, tags=["cvs"])
 app.include_router(job.router, prefix=settings.API_PREFIX, tags=["jobs"])
 app.include_router(recommendation.router, prefix=settings.API_PREFIX, tags=["recommendations"])
+app.include_router(system.router, prefix=settings.API_PREFIX, tags=["system"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+from uuid import uuid4
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, LargeBinary, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.database.db import Base
+
+
+class CVProcessingJob(Base):
+    """Queued CV upload processed by the ingestion worker pool"""
+    __tablename__ = "cv_processing_jobs"
+    __table_args__ = (
+        UniqueConstraint("user_id", "idempotency_key", name="uq_cv_processing_jobs_user_key"),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    idempotency_key = Column(String(128), nullable=False)
+    filename = Column(String)
+    pdf_bytes = Column(LargeBinary, nullable=True)
+
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    stage = Column(String(30), nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    timings = Column(JSONB, nullable=False, default=dict)
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+    cv_id = Column(Integer, ForeignKey("cvs.id", ondelete="SET NULL"), nullable=True)
+
+    next_attempt_at = Column(DateTime, server_default=func.now(), index=True)
+    locked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f'<CVProcessingJob {self.id}, {self.status}, {self.stage}>'
@@ -1,5 +1,5 @@
 from sqlalchemy.sql import func
-from sqlalchemy import Text, Column, Integer, String, Boolean, DateTime, Float, JSON, ForeignKey
+from sqlalchemy import Text, Column, Index, UniqueConstraint, Integer, String, Boolean, DateTime, Float, JSON, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB
 from app.database.db import Base  
@@ -8,6 +8,9 @@ from app.core.config import settings
 
 class CV(Base):
     __tablename__ = 'cvs'
+    __table_args__ = (
+        Index("ix_cvs_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
@@ -22,7 +25,8 @@ class CV(Base):
     languages = Column(JSONB)  
     certifications = Column(JSONB) 
     category = Column(String, index=True)
-    created_at = Column(DateTime, default=func.now())
+    # NOT NULL: part of the listing keyset (migration 002)
+    created_at = Column(DateTime, nullable=False, default=func.now(), server_default=func.now())
     
 
     user = relationship('User', back_populates='cvs')
@@ -38,11 +42,15 @@ class CV(Base):
 
 class CVEmbedding(Base):
     __tablename__ = "cv_embeddings"
+    __table_args__ = (
+        UniqueConstraint("cv_id", "model_name", name="uq_cv_embeddings_cv_model"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     cv_id = Column(Integer, ForeignKey("cvs.id", ondelete="CASCADE"), nullable=False)
 
     embedding = Column(Vector(settings.EMBEDDING_DIMENSIONS), nullable=False) 
+    model_name = Column(String, nullable=False)
     created_at = Column(DateTime, default=func.now())
 
     cv = relationship("CV", back_populates="embeddings")
@@ -1,6 +1,9 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, Boolean, DateTime, Float, JSON, ARRAY
+from typing import Dict, List
+
+from sqlalchemy import Column, ForeignKey, Index, UniqueConstraint, Integer, String, Boolean, DateTime, Float, JSON, ARRAY
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, false, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from pgvector.sqlalchemy import Vector
 
 from app.core.config import settings
@@ -8,13 +11,22 @@ from app.database.db import Base
 
 class Job(Base):
     __tablename__ = "jobs"
-    
+    __table_args__ = (
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        Index("ix_jobs_industry_created_at_id", "company_industry", "created_at", "id"),
+        Index("ix_jobs_location", "location"),
+        Index("ix_jobs_salary", "salary"),
+        Index("ix_jobs_active_industry", "company_industry", postgresql_where=text("NOT is_expired")),
+        Index("ix_jobs_active_expires_at", "expires_at", postgresql_where=text("NOT is_expired")),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(String, index=True, nullable=False)
     experience_years = Column(ARRAY(Integer), nullable=False)
     is_expired = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=func.now())
+    # NOT NULL: part of the listing keyset (migration 002)
+    created_at = Column(DateTime, nullable=False, default=func.now(), server_default=func.now())
     expires_at = Column(DateTime)
     salary = Column(Float)
     location = Column(String, nullable=False)
@@ -24,6 +36,7 @@ class Job(Base):
     company_industry = Column(String, nullable=False)
     company_size = Column(String)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    embedding_hash = Column(String(64), nullable=True)
 
     embeddings = relationship(
         "JobEmbedding",
@@ -38,13 +51,68 @@ class Job(Base):
 
 class JobEmbedding(Base):
     __tablename__ = "job_embeddings"
+    __table_args__ = (
+        Index("ix_job_embeddings_active_job_id", "job_id", postgresql_where=text("NOT is_expired")),
+        Index("ix_job_embeddings_active_industry", "company_industry", "model_name", postgresql_where=text("NOT is_expired")),
+        UniqueConstraint("job_id", "model_name", name="uq_job_embeddings_job_model"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
 
     embedding = Column(Vector(settings.EMBEDDING_DIMENSIONS), nullable=False)
     model_name = Column(String, nullable=False)
+    # Mirrors Job.is_expired, kept in sync by the expiry sweeper
+    is_expired = Column(Boolean, nullable=False, default=False, server_default=false())
+    # Mirrors Job.company_industry, set by database triggers (migration 006)
+    # unless the writer sets it. Category-mode recommendations search by it
+    company_industry = Column(String, nullable=True)
 
     created_at = Column(DateTime, default=func.now())
 
-    job = relationship("Job", back_populates="embeddings")
\ No newline at end of file
+    job = relationship("Job", back_populates="embeddings")
+
+
+def upsert_job_embeddings(rows: List[Dict]):
+    """INSERT ... ON CONFLICT (job_id, model_name) DO UPDATE for job embedding rows"""
+    stmt = pg_insert(JobEmbedding).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[JobEmbedding.job_id, JobEmbedding.model_name],
+        set_={
+            "embedding": stmt.excluded.embedding,
+            "is_expired": stmt.excluded.is_expired,
+            "created_at": func.now(),
+        }
+    )
+
+
+class JobImportCheckpoint(Base):
+    """Progress of a job feed import, committed together with each imported chunk"""
+    __tablename__ = "job_import_checkpoints"
+
+    source = Column(String, primary_key=True)
+    records_done = Column(Integer, nullable=False, default=0)
+    imported = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class JobCatalogReload(Base):
+    """
+    Reload generation per job category. Part of the catalog watermark, so
+    bumping it makes every worker rebuild that category's snapshot.
+    """
+    __tablename__ = "job_catalog_reloads"
+
+    category = Column(String, primary_key=True)
+    generation = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+def bump_job_catalog_reload(category: str):
+    """INSERT ... ON CONFLICT (category) DO UPDATE incrementing the category's reload generation"""
+    stmt = pg_insert(JobCatalogReload).values(category=category, generation=1, updated_at=func.now())
+    return stmt.on_conflict_do_update(
+        index_elements=[JobCatalogReload.category],
+        set_={"generation": JobCatalogReload.generation + 1, "updated_at": func.now()}
+    )
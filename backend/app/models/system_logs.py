@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text
+from sqlalchemy import Column, Index, Integer, String, Float, DateTime, Text, UniqueConstraint
 from sqlalchemy.sql import func
 from app.database.db import Base
 
 class SystemLog(Base):
     __tablename__ = "system_logs"
+    __table_args__ = (
+        Index("ix_system_logs_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -17,3 +20,32 @@ class SystemLog(Base):
     time_taken = Column(Float, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class SystemLogRollup(Base):
+    """Per-minute or per-hour aggregate of system_logs rows with the same names"""
+    __tablename__ = "system_log_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "resolution", "bucket_start", "function_name", "log_name", "log_type",
+            name="uq_system_log_rollups_bucket"
+        ),
+        Index("ix_system_log_rollups_function_bucket", "resolution", "function_name", "bucket_start"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    resolution = Column(String(10), nullable=False)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+
+    function_name = Column(String(150), nullable=False)
+    log_name = Column(String(100), nullable=False)
+    log_type = Column(String(50), nullable=False)
+
+    count = Column(Integer, nullable=False)
+    # Over the rows with a time_taken, in seconds
+    timed_count = Column(Integer, nullable=False)
+    total_time = Column(Float)
+    p50 = Column(Float)
+    p95 = Column(Float)
+    p99 = Column(Float)
+    max_time = Column(Float)
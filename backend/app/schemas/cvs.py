@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
+from datetime import datetime
 
 
 class Location(BaseModel):
@@ -58,3 +59,26 @@ class CVCreate(CVBase):
 class CVResponse(CVBase):
     id: int
 
+
+
+class CVProcessingAccepted(BaseModel):
+    processing_id: str
+    status: str
+    status_url: str
+
+
+class CVProcessingJobResponse(BaseModel):
+    id: str
+    status: str
+    stage: str
+    attempts: int
+    max_attempts: int
+    timings: Dict[str, float]
+    cv_id: Optional[int] = None
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
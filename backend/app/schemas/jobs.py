@@ -1,6 +1,8 @@
 from typing import List, Optional, Dict
-from datetime import datetime
-from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+from pydantic import BaseModel, Field, field_validator
+
+from app.utils.hashing import text_hash
 
 
 class JobBase(BaseModel):
@@ -16,6 +18,14 @@ class JobBase(BaseModel):
     company_industry: str
     company_size: Optional[str]
 
+    @field_validator("expires_at")
+    @classmethod
+    def naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """The columns are timestamp without time zone, which asyncpg only accepts naive datetimes for"""
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
     def to_embedding_text(self) -> str:
         """Text representation of job for embedding generation"""
 
@@ -38,6 +48,10 @@ class JobBase(BaseModel):
         {self.description}
         """.strip()
 
+    def embedding_hash(self) -> str:
+        """Hash of the embedding text, used to skip re-embedding unchanged jobs"""
+        return text_hash(self.to_embedding_text())
+
 
 class JobCreate(JobBase):
     class Config:
@@ -55,3 +69,16 @@ class JobResponse(JobBase):
     class Config:
         from_attributes = True
 
+
+
+class BulkJobInsertItem(BaseModel):
+    index: int
+    status: str
+    job: Optional[JobResponse] = None
+    error: Optional[str] = None
+
+
+class BulkJobInsertResponse(BaseModel):
+    created: int
+    failed: int
+    items: List[BulkJobInsertItem]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 from app.schemas.jobs import JobResponse
@@ -10,6 +10,8 @@ class MatchingFactors(BaseModel):
     experience_match: float
     education_match: float
     semantic_similarity: float
+    # Hybrid retrieval only: 1.0 when the job is in the CV's category
+    category_match: Optional[float] = None
 
 class JobRecommendationBase(BaseModel):
     job: JobResponse
@@ -0,0 +1,331 @@
+"""
+Benchmark job recommendation end to end on synthetic data.
+
+For every scale, synthetic jobs and CVs (app.scripts.synthetic_data) are
+embedded and every CV is matched with three paths:
+
+    snapshot    JobRecommender.match_cv_to_snapshot on the category snapshot
+    similarity  the CV / job cosine similarity query
+    jobs        JobRecommender.match_cv_to_jobs (the per-job path), limited
+                to --jobs-path-limit jobs because it embeds every job's
+                education on each call
+
+In memory mode everything runs in process: snapshots are built like the job
+catalog builds them and similarity is a numpy stand-in for the pgvector
+query. In postgres mode the jobs, CVs and embeddings are written to the
+configured database, snapshots come from job_catalog and similarity runs the
+real query; the rows are deleted afterwards unless --keep is given.
+
+Latency percentiles and throughput are measured without tracing. Peak memory
+(tracemalloc) is measured separately for the setup and for one extra pass of
+--memory-cvs CVs, since tracing slows Python code down (setup_s is measured
+under tracing).
+
+Reports can be saved with --output and compared with a previous report with
+--baseline: the exit code is 1 when a latency, throughput or memory figure is
+worse than the baseline by more than --tolerance.
+
+Usage (from backend/):
+    EMBEDDING_PROVIDER=hashing EMBEDDING_MODEL=hashing-384 \\
+        python -m app.scripts.benchmark_recommender --scales 1000,10000,100000 --output bench.json
+    python -m app.scripts.benchmark_recommender --mode postgres --scales 10000 --baseline bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.job_catalog import CategorySnapshot, build_records, job_catalog
+from app.core.recommender import job_recommender
+from app.core.vector_store import vector_store
+from app.database.db import AsyncSessionLocal, SessionLocal, create_tables, run_migrations
+from app.models.cvs import CV, CVEmbedding
+from app.models.jobs import Job
+from app.models.users import User
+from app.schemas.jobs import JobCreate
+from app.scripts.import_jobs import write_chunk
+from app.scripts.synthetic_data import SAMPLE_DATA_DIR, SyntheticData
+
+MODES = ("memory", "postgres")
+PATHS = ("snapshot", "similarity", "jobs")
+# Report keys where a smaller value is a regression; for the others
+# (latencies, durations, memory) a larger value is
+HIGHER_IS_BETTER = ("_per_s",)
+
+
+def cv_text(cv: Dict) -> str:
+    """Stand-in for the parsed PDF text that real CV embeddings are made from"""
+    work = " ".join(
+        f"{item.get('position', '')} {item.get('company', '')} {item.get('summary') or ''} {' '.join(item.get('highlights') or [])}"
+        for item in cv["work"]
+    )
+    return "\n".join([cv["name"], cv.get("summary") or "", work, ", ".join(cv["skills"]), job_recommender.candidate_education_text(cv["education"])])
+
+
+def _traced(function, *args):
+    """Run function and return its result with the tracemalloc peak in MB"""
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        return result, tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+class MemoryBackend:
+    """Synthetic data held in process"""
+
+    def __init__(self, jobs: List[Dict], cvs: List[Dict], batch_size: int):
+        self.jobs = jobs
+        self.cvs = cvs
+        self.batch_size = batch_size
+
+    def setup(self):
+        job_embeddings = vector_store.generate_batch_embeddings(
+            [JobCreate.model_validate(job).to_embedding_text() for job in self.jobs],
+            batch_size=self.batch_size
+        )
+        now = datetime.now()
+        rows_by_category: Dict[str, List[Tuple]] = {}
+        for job_id, (job, embedding) in enumerate(zip(self.jobs, job_embeddings), start=1):
+            orm_job = Job(id=job_id, is_expired=False, created_at=now, updated_at=now, **{**job, "expires_at": datetime.fromisoformat(job["expires_at"])})
+            rows_by_category.setdefault(job["company_industry"], []).append((orm_job, embedding))
+
+        self.snapshots = {}
+        for version, (category, rows) in enumerate(rows_by_category.items(), start=1):
+            records, embeddings, education = build_records(rows)
+            self.snapshots[category] = CategorySnapshot(category, version, tuple(records), embeddings, education, (now, len(records), 0))
+
+        self.cv_embeddings = vector_store.generate_batch_embeddings([cv_text(cv) for cv in self.cvs], batch_size=self.batch_size)
+        self.cv_data = [{**cv, "id": cv_id} for cv_id, cv in enumerate(self.cvs, start=1)]
+
+    async def snapshot(self, index: int) -> CategorySnapshot:
+        return self.snapshots[self.cv_data[index]["category"]]
+
+    async def similarity(self, index: int, snapshot: CategorySnapshot) -> List[Tuple[int, float]]:
+        if not len(snapshot):
+            return []
+        cv_vector = np.asarray(self.cv_embeddings[index], dtype=np.float32)
+        scores = snapshot.embeddings @ (cv_vector / (np.linalg.norm(cv_vector) or 1.0))
+        order = np.argsort(-scores)
+        return [(snapshot.records[i].id, float(scores[i])) for i in order]
+
+    async def cleanup(self, keep: bool):
+        pass
+
+
+class PostgresBackend(MemoryBackend):
+    """Synthetic data written to the configured database"""
+
+    def setup(self):
+        create_tables()
+        run_migrations()
+        self.run_id = uuid.uuid4().hex[:12]
+        self.source = f"benchmark:{self.run_id}"
+
+        db = SessionLocal()
+        try:
+            user = User(username=f"benchmark-{self.run_id}", email=f"benchmark-{self.run_id}@example.com", hashed_password="!", role="user")
+            db.add(user)
+            db.commit()
+            self.user_id = user.id
+        finally:
+            db.close()
+
+        self.job_ids = []
+        for start in range(0, len(self.jobs), 5000):
+            chunk = [JobCreate.model_validate(job) for job in self.jobs[start:start + 5000]]
+            embeddings = vector_store.generate_batch_embeddings([job.to_embedding_text() for job in chunk], batch_size=self.batch_size)
+            self.job_ids += write_chunk(self.source, chunk, embeddings, start + len(chunk), 0)
+
+        self.cv_embeddings = vector_store.generate_batch_embeddings([cv_text(cv) for cv in self.cvs], batch_size=self.batch_size)
+        db = SessionLocal()
+        try:
+            rows = []
+            for cv, embedding in zip(self.cvs, self.cv_embeddings):
+                row = CV(user_id=self.user_id, **cv)
+                row.embeddings.append(CVEmbedding(embedding=embedding, model_name=settings.EMBEDDING_MODEL))
+                rows.append(row)
+            db.add_all(rows)
+            db.commit()
+            self.cv_data = [
+                {column.key: getattr(row, column.key) for column in CV.__table__.columns}
+                for row in rows
+            ]
+        finally:
+            db.close()
+
+        job_catalog.invalidate()
+        self.db = AsyncSessionLocal()
+
+    async def snapshot(self, index: int) -> CategorySnapshot:
+        return await job_catalog.get(self.db, self.cv_data[index]["category"])
+
+    async def similarity(self, index: int, snapshot: CategorySnapshot) -> List[Tuple[int, float]]:
+        return await vector_store.afind_similar_jobs_for_cv(
+            self.db, self.cv_data[index]["id"], [record.id for record in snapshot.records]
+        )
+
+    async def cleanup(self, keep: bool):
+        await self.db.close()
+        if keep:
+            return
+        db = SessionLocal()
+        try:
+            db.execute(text("DELETE FROM cvs WHERE user_id = :user_id"), {"user_id": self.user_id})
+            db.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": self.user_id})
+            db.execute(text("DELETE FROM jobs WHERE id = ANY(:job_ids)"), {"job_ids": self.job_ids})
+            db.execute(text("DELETE FROM job_import_checkpoints WHERE source = :source"), {"source": self.source})
+            db.commit()
+        finally:
+            db.close()
+
+
+async def match_cv(backend: MemoryBackend, index: int, top_k: int, jobs_path_limit: int, timings: Dict[str, List[float]]):
+    """Run every path for one CV, appending their latencies to timings"""
+    start_time = time.perf_counter()
+    snapshot = await backend.snapshot(index)
+    cv_data = backend.cv_data[index]
+    job_recommender.match_cv_to_snapshot(cv_data, backend.cv_embeddings[index], snapshot, top_k)
+    timings["snapshot"].append(time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    semantic_scores = await backend.similarity(index, snapshot)
+    timings["similarity"].append(time.perf_counter() - start_time)
+
+    jobs = [json.loads(record.job_json) for record in snapshot.records[:jobs_path_limit]]
+    start_time = time.perf_counter()
+    # match_cv_to_jobs prints every score; keep the cost but not the output
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        job_recommender.match_cv_to_jobs(cv_data, jobs, top_k, semantic_scores=semantic_scores)
+    timings["jobs"].append(time.perf_counter() - start_time)
+
+
+def _summarize(values: List[float]) -> Dict[str, float]:
+    milliseconds = np.asarray(values) * 1000
+    return {
+        "p50_ms": float(np.percentile(milliseconds, 50)),
+        "p95_ms": float(np.percentile(milliseconds, 95)),
+        "p99_ms": float(np.percentile(milliseconds, 99)),
+        "mean_ms": float(milliseconds.mean()),
+        "throughput_per_s": float(len(values) / (milliseconds.sum() / 1000)) if milliseconds.sum() else 0.0,
+    }
+
+
+async def run_scale(mode: str, job_count: int, cv_count: int, seed: int, top_k: int, jobs_path_limit: int, memory_cvs: int, keep: bool, sample_dir: Path = SAMPLE_DATA_DIR) -> Dict:
+    data = SyntheticData(seed, sample_dir)
+    jobs, cvs = list(data.jobs(job_count)), list(data.cvs(cv_count))
+    backend = (PostgresBackend if mode == "postgres" else MemoryBackend)(jobs, cvs, settings.EMBEDDING_BATCH_SIZE)
+
+    start_time = time.perf_counter()
+    _, setup_peak = _traced(backend.setup)
+    setup_seconds = time.perf_counter() - start_time
+
+    try:
+        # Warm up: first snapshot reads build the catalog in postgres mode
+        for index in range(min(len(cvs), len(data.industries))):
+            await match_cv(backend, index, top_k, jobs_path_limit, {path: [] for path in PATHS})
+
+        timings = {path: [] for path in PATHS}
+        start_time = time.perf_counter()
+        for index in range(len(cvs)):
+            await match_cv(backend, index, top_k, jobs_path_limit, timings)
+        elapsed = time.perf_counter() - start_time
+
+        tracemalloc.start()
+        for index in range(min(memory_cvs, len(cvs))):
+            await match_cv(backend, index, top_k, jobs_path_limit, {path: [] for path in PATHS})
+        query_peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    finally:
+        await backend.cleanup(keep)
+
+    report = {
+        "mode": mode,
+        "jobs": job_count,
+        "cvs": cv_count,
+        "setup_s": setup_seconds,
+        "setup_peak_mb": setup_peak,
+        "query_peak_mb": query_peak,
+        "cvs_per_s": len(cvs) / elapsed if elapsed else 0.0,
+    }
+    for path in PATHS:
+        for key, value in _summarize(timings[path]).items():
+            report[f"{path}_{key}"] = value
+    return report
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Figures of report worse than baseline by more than tolerance"""
+    regressions = []
+    for key, value in report.items():
+        base = baseline.get(key)
+        if not isinstance(value, float) or not isinstance(base, (int, float)) or not base:
+            continue
+        if key.endswith(HIGHER_IS_BETTER):
+            change = (base - value) / base
+        else:
+            change = (value - base) / base
+        if change > tolerance:
+            regressions.append(f"{key}: {base:.3f} -> {value:.3f} ({change:+.0%})")
+    return regressions
+
+
+async def run(args, baselines: Dict) -> Tuple[List[Dict], List[str]]:
+    # One event loop for every scale: pooled asyncpg connections belong to it
+    reports, regressions = [], []
+    for scale in (int(value) for value in args.scales.split(",")):
+        report = await run_scale(args.mode, scale, args.cvs, args.seed, args.top_k, args.jobs_path_limit, args.memory_cvs, args.keep, args.sample_dir)
+        reports.append(report)
+        print(f"--- {args.mode} {scale} jobs ({settings.EMBEDDING_PROVIDER})")
+        for key, value in report.items():
+            print(f"{key:28} {value:.3f}" if isinstance(value, float) else f"{key:28} {value}")
+
+        baseline = baselines.get((args.mode, scale))
+        if baseline:
+            for regression in compare(report, baseline, args.tolerance):
+                regressions.append(f"{args.mode} {scale}: {regression}")
+    return reports, regressions
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--mode", choices=MODES, default="memory")
+    argument_parser.add_argument("--scales", default="1000,10000", help="Comma separated job counts")
+    argument_parser.add_argument("--cvs", type=int, default=50)
+    argument_parser.add_argument("--seed", type=int, default=42)
+    argument_parser.add_argument("--sample-dir", type=Path, default=SAMPLE_DATA_DIR)
+    argument_parser.add_argument("--top-k", type=int, default=10)
+    argument_parser.add_argument("--jobs-path-limit", type=int, default=200)
+    argument_parser.add_argument("--memory-cvs", type=int, default=10)
+    argument_parser.add_argument("--keep", action="store_true", help="Keep the rows written in postgres mode")
+    argument_parser.add_argument("--output", type=Path, help="Write the reports to this JSON file")
+    argument_parser.add_argument("--baseline", type=Path, help="Compare with reports saved by --output")
+    argument_parser.add_argument("--tolerance", type=float, default=0.25)
+    args = argument_parser.parse_args()
+
+    baselines = {}
+    if args.baseline:
+        baselines = {(r["mode"], r["jobs"]): r for r in json.loads(args.baseline.read_text())["reports"]}
+
+    reports, regressions = asyncio.run(run(args, baselines))
+    if args.output:
+        args.output.write_text(json.dumps({"provider": settings.EMBEDDING_PROVIDER, "model": settings.EMBEDDING_MODEL, "reports": reports}, indent=2))
+
+    if regressions:
+        print("\nRegressions beyond tolerance:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
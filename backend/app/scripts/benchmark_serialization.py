@@ -0,0 +1,116 @@
+"""
+Benchmark response serialization of recommendations and job listings.
+
+Compares, per item, the validated path (build the Pydantic models, then
+validate and dump them against the response_model like FastAPI does) with
+the fast path the routes use (pre-encoded catalog jobs and plain row dicts
+encoded with orjson). Both outputs are decoded and compared first, so the
+fast path is checked to produce the same JSON.
+
+Usage (from backend/):
+    python -m app.scripts.benchmark_serialization --items 10,100,500
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from pydantic import TypeAdapter
+
+from app.models.jobs import Job
+from app.schemas.jobs import JobResponse
+from app.schemas.recommendations import JobRecommendationResponse
+from app.scripts.synthetic_data import SyntheticData
+from app.utils.serialization import dumps, json_fragment, objects_to_dicts
+
+JOB_FIELDS = tuple(JobResponse.model_fields)
+recommendations_adapter = TypeAdapter(List[JobRecommendationResponse])
+jobs_adapter = TypeAdapter(List[JobResponse])
+
+
+def make_jobs(count: int, seed: int) -> List[Job]:
+    now = datetime.now().replace(microsecond=123456)
+    return [
+        Job(id=job_id, is_expired=False, created_at=now, updated_at=now, **{**job, "expires_at": datetime.fromisoformat(job["expires_at"]).replace(tzinfo=None)})
+        for job_id, job in enumerate(SyntheticData(seed).jobs(count), start=1)
+    ]
+
+
+def make_scores(job: Job) -> Dict:
+    skills = [skill.lower() for skill in job.skills_required]
+    return {
+        "match_score": 0.734,
+        "matching_factors": {"skills_match": 0.5, "experience_match": 1.0, "education_match": 0.612, "semantic_similarity": 0.701, "category_match": None},
+        "matched_skills": skills[: len(skills) // 2],
+        "missing_skills": skills[len(skills) // 2:],
+        "explanation": "Strong match with 3 core skills aligned",
+    }
+
+
+def validated_recommendations(jobs: List[Job]) -> bytes:
+    """JobResponse per job, JobRecommendationResponse per item, then response_model validation and dump"""
+    recommendations = [
+        JobRecommendationResponse(**{"job": JobResponse(**objects_to_dicts([job], JOB_FIELDS)[0]), **make_scores(job)})
+        for job in jobs
+    ]
+    return recommendations_adapter.dump_json(recommendations_adapter.validate_python(recommendations, from_attributes=True))
+
+
+def fast_recommendations(job_json: List[bytes], jobs: List[Job]) -> bytes:
+    """Pre-encoded jobs (built once per catalog snapshot) embedded into plain dicts"""
+    return dumps([{"job": json_fragment(encoded), **make_scores(job)} for encoded, job in zip(job_json, jobs)])
+
+
+def validated_listing(jobs: List[Job]) -> bytes:
+    return jobs_adapter.dump_json(jobs_adapter.validate_python(jobs, from_attributes=True))
+
+
+def fast_listing(jobs: List[Job]) -> bytes:
+    return dumps(objects_to_dicts(jobs, JOB_FIELDS))
+
+
+def time_per_item(function: Callable[[], bytes], items: int, repeat: int) -> float:
+    """Median microseconds per item over repeat runs"""
+    samples = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start_time) / items * 1e6)
+    return statistics.median(samples)
+
+
+def run(items: int, repeat: int, seed: int) -> Dict:
+    jobs = make_jobs(items, seed)
+    # Done once per snapshot by the job catalog, not per request
+    job_json = [JobResponse.model_validate(job).model_dump_json().encode() for job in jobs]
+
+    cases = {
+        "recommendations": (lambda: validated_recommendations(jobs), lambda: fast_recommendations(job_json, jobs)),
+        "listing": (lambda: validated_listing(jobs), lambda: fast_listing(jobs)),
+    }
+    report = {"items": items}
+    for name, (validated, fast) in cases.items():
+        if json.loads(validated()) != json.loads(fast()):
+            raise AssertionError(f"{name}: fast path output differs from the validated path")
+        validated_us = time_per_item(validated, items, repeat)
+        fast_us = time_per_item(fast, items, repeat)
+        report[f"{name}_validated_us"] = validated_us
+        report[f"{name}_fast_us"] = fast_us
+        report[f"{name}_speedup"] = validated_us / fast_us if fast_us else 0.0
+    return report
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--items", default="10,100,500", help="Comma separated response sizes")
+    argument_parser.add_argument("--repeat", type=int, default=50)
+    argument_parser.add_argument("--seed", type=int, default=42)
+    args = argument_parser.parse_args()
+
+    for items in (int(value) for value in args.items.split(",")):
+        report = run(items, args.repeat, args.seed)
+        print(f"--- {items} items (microseconds per item)")
+        for key, value in report.items():
+            print(f"{key:28} {value:.2f}" if isinstance(value, float) else f"{key:28} {value}")
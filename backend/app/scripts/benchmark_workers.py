@@ -0,0 +1,180 @@
+"""
+Benchmark memory and throughput of the multi-worker server modes.
+
+    uvicorn   uvicorn --workers N: every worker imports the app and loads its
+              own copy of the embedding model, with torch's default threads
+    preload   gunicorn -c gunicorn.conf.py: the app is loaded once in the
+              master and the workers are forked from it, sharing the model's
+              weights copy-on-write, with the cores divided between them
+
+Each mode is started against the local database with the fake LLM, left to
+settle, and measured idle and after a load_test run. Memory is summed over
+the server's process tree from /proc (Linux only): RSS counts shared pages
+once per process, PSS splits them between the processes sharing them, and
+USS only counts private pages, so PSS is the real footprint.
+
+Usage (from backend/):
+    python -m app.scripts.benchmark_workers --workers 4 --duration 60 \\
+        --mix upload=1,jobs=2,recommendations=2
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from app.scripts.load_test import OFFLINE_ENV, parse_mix, run as run_load_test
+
+MODES = ("uvicorn", "preload")
+MEMORY_FIELDS = {"Rss": "rss_mb", "Pss": "pss_mb", "Private_Clean": "uss_mb", "Private_Dirty": "uss_mb"}
+
+
+def server_command(mode: str, workers: int, port: int) -> List[str]:
+    if mode == "uvicorn":
+        return [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    return [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--log-level", "warning", "app.main:app"]
+
+
+def process_tree(root: int) -> List[int]:
+    """root and all its descendants"""
+    parents = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            # The command name in parentheses may contain spaces
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        parents.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+
+    tree, pending = [], [root]
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        pending.extend(parents.get(pid, []))
+    return tree
+
+
+def tree_memory(root: int) -> Dict[str, float]:
+    """Summed RSS, PSS and USS in MB of a process tree"""
+    pids = process_tree(root)
+    memory = {"processes": len(pids), "rss_mb": 0.0, "pss_mb": 0.0, "uss_mb": 0.0}
+    for pid in pids:
+        try:
+            lines = Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            name, _, value = line.partition(":")
+            if name in MEMORY_FIELDS:
+                memory[MEMORY_FIELDS[name]] += int(value.split()[0]) / 1024
+    return memory
+
+
+def start(mode: str, workers: int, port: int, settle: float) -> subprocess.Popen:
+    """Start a server in its own process group and wait until its memory is stable"""
+    env = {
+        **os.environ,
+        **{key: os.environ.get(key, value) for key, value in OFFLINE_ENV.items()},
+        "WEB_CONCURRENCY": str(workers),
+        "BIND": f"127.0.0.1:{port}",
+    }
+    server = subprocess.Popen(server_command(mode, workers, port), env=env, start_new_session=True)
+    deadline = time.monotonic() + 300
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"{mode} server exited with code {server.returncode}")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/docs", timeout=1).raise_for_status()
+            break
+        except httpx.HTTPError:
+            time.sleep(0.5)
+    else:
+        stop(server)
+        raise RuntimeError(f"{mode} server did not start within 300 seconds")
+
+    # Workers still loading the model answer later than the first one:
+    # wait until the tree has stopped growing
+    previous = tree_memory(server.pid)["rss_mb"]
+    while time.monotonic() < deadline:
+        time.sleep(settle)
+        current = tree_memory(server.pid)["rss_mb"]
+        if abs(current - previous) < previous * 0.01:
+            break
+        previous = current
+    return server
+
+
+def stop(server: subprocess.Popen):
+    os.killpg(server.pid, signal.SIGTERM)
+    try:
+        server.wait(30)
+    except subprocess.TimeoutExpired:
+        os.killpg(server.pid, signal.SIGKILL)
+        server.wait()
+
+
+def benchmark(mode: str, args: argparse.Namespace) -> Dict:
+    server = start(mode, args.workers, args.port, args.settle)
+    try:
+        idle = tree_memory(server.pid)
+        load = asyncio.run(run_load_test(
+            f"http://127.0.0.1:{args.port}",
+            sorted(args.pdf_dir.glob("*.pdf")),
+            parse_mix(args.mix),
+            args.concurrency,
+            args.duration,
+            None,
+            "sync",
+            args.page_size,
+            args.top_k,
+            args.timeout,
+        ))
+        loaded = tree_memory(server.pid)
+    finally:
+        stop(server)
+
+    report = {"mode": mode, "workers": args.workers, "processes": idle["processes"]}
+    for key in ("rss_mb", "pss_mb", "uss_mb"):
+        report[f"idle_{key}"] = idle[key]
+        report[f"loaded_{key}"] = loaded[key]
+    report["throughput_rps"] = load["throughput_rps"]
+    for operation, stats in load["endpoints"].items():
+        report[f"{operation}_p95_ms"] = stats["p95_ms"]
+        report[f"{operation}_error_rate"] = stats["error_rate"]
+    return report
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--modes", default=",".join(MODES), help="Comma separated, from " + ", ".join(MODES))
+    argument_parser.add_argument("--workers", type=int, default=4)
+    argument_parser.add_argument("--port", type=int, default=8766)
+    argument_parser.add_argument("--settle", type=float, default=5, help="Seconds between memory checks while workers start")
+    argument_parser.add_argument("--pdf-dir", type=Path, default=Path("../sample_data"))
+    argument_parser.add_argument("--mix", default="upload=1,jobs=2,recommendations=2")
+    argument_parser.add_argument("--concurrency", type=int, default=16)
+    argument_parser.add_argument("--duration", type=float, default=60, help="Seconds of load per mode")
+    argument_parser.add_argument("--page-size", type=int, default=50)
+    argument_parser.add_argument("--top-k", type=int, default=10)
+    argument_parser.add_argument("--timeout", type=float, default=120)
+    argument_parser.add_argument("--output", type=Path, help="Also write the reports to this JSON file")
+    args = argument_parser.parse_args()
+
+    reports = []
+    for mode in args.modes.split(","):
+        if mode not in MODES:
+            argument_parser.error(f"Unknown mode {mode}")
+        report = benchmark(mode, args)
+        reports.append(report)
+        print(f"--- {mode}")
+        for key, value in report.items():
+            print(f"{key:32} {value:.2f}" if isinstance(value, float) else f"{key:32} {value}")
+    if args.output:
+        args.output.write_text(json.dumps(reports, indent=2))
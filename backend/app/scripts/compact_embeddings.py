@@ -0,0 +1,89 @@
+"""
+Remove duplicate CV/job embedding rows and reclaim their space.
+
+Rows without a model name are labelled with --model, then every (entity,
+model) pair keeps only its newest row. The tables are vacuumed afterwards
+(VACUUM FULL with --full, which rewrites the table and locks it meanwhile)
+and the size change of each table including its indexes is reported.
+
+Usage (from backend/):
+    python -m app.scripts.compact_embeddings --dry-run
+    python -m app.scripts.compact_embeddings --full
+"""
+import argparse
+from typing import Dict
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.database.db import engine
+
+TABLES = {
+    "job_embeddings": "job_id",
+    "cv_embeddings": "cv_id",
+}
+
+
+def _size(connection, table: str) -> int:
+    return connection.execute(text("SELECT pg_total_relation_size(CAST(:table AS regclass))"), {"table": table}).scalar()
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1024 / 1024:.2f} MB"
+
+
+def compact_table(table: str, key: str, model: str, dry_run: bool, full: bool) -> Dict:
+    with engine.begin() as connection:
+        size_before = _size(connection, table)
+        unlabelled = connection.execute(
+            text(f"SELECT count(*) FROM {table} WHERE model_name IS NULL OR model_name = ''")
+        ).scalar()
+        duplicates = connection.execute(text(f"""
+            SELECT coalesce(sum(copies - 1), 0) FROM (
+                SELECT count(*) AS copies
+                FROM {table}
+                GROUP BY {key}, coalesce(nullif(model_name, ''), :model)
+            ) grouped
+        """), {"model": model}).scalar()
+
+        if not dry_run:
+            connection.execute(
+                text(f"UPDATE {table} SET model_name = :model WHERE model_name IS NULL OR model_name = ''"),
+                {"model": model}
+            )
+            connection.execute(text(f"""
+                DELETE FROM {table} a USING {table} b
+                WHERE a.{key} = b.{key} AND a.model_name = b.model_name AND a.id < b.id
+            """))
+
+    if not dry_run:
+        # VACUUM cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text(f"VACUUM ({'FULL, ' if full else ''}ANALYZE) {table}"))
+
+    with engine.connect() as connection:
+        size_after = _size(connection, table)
+
+    return {
+        "table": table,
+        "unlabelled": unlabelled,
+        "duplicates": duplicates,
+        "size_before": size_before,
+        "size_after": size_after,
+    }
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--model", default=settings.EMBEDDING_MODEL, help="Model name for unlabelled rows")
+    argument_parser.add_argument("--dry-run", action="store_true", help="Only count what would be removed")
+    argument_parser.add_argument("--full", action="store_true", help="VACUUM FULL to return space to the OS")
+    args = argument_parser.parse_args()
+
+    for table, key in TABLES.items():
+        report = compact_table(table, key, args.model, args.dry_run, args.full)
+        print(
+            f"{report['table']:16} {report['duplicates']:>8} duplicates  {report['unlabelled']:>8} unlabelled  "
+            f"{_mb(report['size_before'])} -> {_mb(report['size_after'])}  "
+            f"(reclaimed {_mb(report['size_before'] - report['size_after'])})"
+        )
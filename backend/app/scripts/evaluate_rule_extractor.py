@@ -0,0 +1,112 @@
+"""
+Compare the rule-based extractor against stored LLM extractions.
+
+Usage (from backend/):
+    python -m app.scripts.evaluate_rule_extractor \
+        --pdf-dir ../sample_data --reference ../sample_data/extracted_data.json
+"""
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.core.parser import parser
+from app.core.rule_extractor import rule_extractor
+
+
+def _digits(value: Optional[str]) -> str:
+    return re.sub(r"\D", "", value or "")
+
+
+def _match_reference(fields: Dict, references: List[Dict]) -> Optional[Dict]:
+    """Pair a parsed CV with its LLM extraction by email, falling back to name"""
+    email = (fields.get("email") or "").lower()
+    name = (fields.get("name") or "").lower()
+    for reference in references:
+        if email and email == (reference.get("email") or "").lower():
+            return reference
+    for reference in references:
+        if name and name == (reference.get("name") or "").lower():
+            return reference
+    return None
+
+
+def _skill_scores(predicted: List[str], expected: List[str]) -> Dict:
+    """
+    Lenient precision/recall: LLM skills are free text, so a dictionary skill
+    counts as a hit when it equals or is contained in an LLM skill.
+    """
+    predicted_lower = [s.lower() for s in predicted]
+    expected_lower = [s.lower() for s in expected]
+    correct = [p for p in predicted_lower if any(p in e for e in expected_lower)]
+    recovered = [e for e in expected_lower if any(p in e for p in predicted_lower)]
+    return {
+        "precision": len(correct) / len(predicted_lower) if predicted_lower else 0.0,
+        "recall": len(recovered) / len(expected_lower) if expected_lower else 0.0,
+    }
+
+
+def evaluate(pdf_dir: Path, reference_path: Path) -> List[Dict]:
+    references = json.loads(reference_path.read_text())
+    rows = []
+    for pdf_path in sorted(pdf_dir.glob("*.pdf")):
+        cv_text = parser.parse_pdf(pdf_path.read_bytes(), pdf_path.name)["raw_text"]
+
+        start_time = time.perf_counter()
+        fields = rule_extractor.extract(cv_text)
+        cv_data = rule_extractor.to_cv_data(fields, cv_text)
+        elapsed_us = (time.perf_counter() - start_time) * 1e6
+
+        reference = _match_reference(fields, references)
+        if reference is None:
+            print(f"{pdf_path.name}: no matching LLM extraction, skipped")
+            continue
+
+        skills = _skill_scores(cv_data["skills"], reference.get("skills") or [])
+        rows.append({
+            "file": pdf_path.name,
+            "time_us": elapsed_us,
+            "email": (cv_data["email"] or "").lower() == (reference.get("email") or "").lower(),
+            "phone": _digits(cv_data["phone"]) == _digits(reference.get("phone")),
+            "name": cv_data["name"].lower() == (reference.get("name") or "").lower(),
+            "languages": set(cv_data["languages"]) == set(reference.get("languages") or []),
+            "category": cv_data["category"] == reference.get("category"),
+            "skills_precision": skills["precision"],
+            "skills_recall": skills["recall"],
+        })
+    return rows
+
+
+def print_report(rows: List[Dict]):
+    header = f"{'file':40} {'us':>8} email phone name  lang  cat   skill_p skill_r"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        flags = " ".join(
+            f"{'ok' if row[key] else 'miss':5}" for key in ("email", "phone", "name", "languages", "category")
+        )
+        print(
+            f"{row['file'][:40]:40} {row['time_us']:8.0f} {flags} "
+            f"{row['skills_precision']:7.2f} {row['skills_recall']:7.2f}"
+        )
+
+    if not rows:
+        return
+    print("-" * len(header))
+    for key in ("email", "phone", "name", "languages", "category"):
+        accuracy = sum(row[key] for row in rows) / len(rows)
+        print(f"{key:18} accuracy {accuracy:.0%}")
+    for key in ("skills_precision", "skills_recall"):
+        print(f"{key:18} mean     {sum(row[key] for row in rows) / len(rows):.2f}")
+    print(f"{'time_us':18} mean     {sum(row['time_us'] for row in rows) / len(rows):.0f}")
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--pdf-dir", type=Path, default=Path("../sample_data"))
+    argument_parser.add_argument("--reference", type=Path, default=Path("../sample_data/extracted_data.json"))
+    args = argument_parser.parse_args()
+
+    print_report(evaluate(args.pdf_dir, args.reference))
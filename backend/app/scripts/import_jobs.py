@@ -0,0 +1,330 @@
+"""
+Stream a job feed (JSON array, NDJSON or CSV) into the database.
+
+Records are validated with JobCreate in chunks, embedded in large batches and
+written with Postgres COPY. Each chunk is committed together with a checkpoint
+row in job_import_checkpoints, so an interrupted import resumes after the last
+committed chunk when run again with the same source.
+
+CSV feeds use the JobCreate field names as headers; experience_years,
+education_required and skills_required cells hold JSON.
+
+Usage (from backend/):
+    python -m app.scripts.import_jobs ../sample_data/sample_job_data.json
+    python -m app.scripts.import_jobs feed.ndjson --chunk-size 5000 --rejects rejects.ndjson
+"""
+import argparse
+import csv
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.vector_store import vector_store
+from app.database.db import create_tables, engine, run_migrations
+from app.models.jobs import JobImportCheckpoint
+# Registered so create_tables() creates every table the migrations touch
+from app.models import cvs, system_logs, users  # noqa: F401
+from app.schemas.jobs import JobCreate
+
+FORMATS = ("json", "ndjson", "csv")
+JSON_CSV_FIELDS = ("experience_years", "education_required", "skills_required")
+NULL = r"\N"
+
+JOB_COLUMNS = (
+    "id", "title", "description", "experience_years", "is_expired", "created_at", "expires_at",
+    "salary", "location", "education_required", "skills_required", "company_name",
+    "company_industry", "company_size", "updated_at", "embedding_hash",
+)
+EMBEDDING_COLUMNS = ("job_id", "embedding", "model_name", "is_expired", "created_at", "company_industry")
+
+
+def detect_format(path: Path) -> str:
+    suffix = path.suffix.lower().lstrip(".")
+    if suffix in ("ndjson", "jsonl"):
+        return "ndjson"
+    if suffix in FORMATS:
+        return suffix
+    raise ValueError(f"Cannot detect the format of {path}, pass --format")
+
+
+def iter_json_array(handle, read_size: int = 1 << 16) -> Iterator[Dict]:
+    """Yield the elements of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+    started = False
+
+    while True:
+        buffer = buffer.lstrip()
+        if started:
+            if buffer.startswith(","):
+                buffer = buffer[1:].lstrip()
+            if buffer.startswith("]"):
+                return
+        elif buffer:
+            if not buffer.startswith("["):
+                raise ValueError("Expected a JSON array")
+            buffer = buffer[1:]
+            started = True
+            continue
+
+        if buffer:
+            try:
+                record, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # An element ending exactly at the buffer end may be cut short
+                if end < len(buffer) or eof:
+                    buffer = buffer[end:]
+                    yield record
+                    continue
+
+        if eof:
+            if not started:
+                return
+            raise ValueError("Unterminated JSON array")
+        data = handle.read(read_size)
+        eof = not data
+        buffer += data
+
+
+def iter_csv(handle) -> Iterator[Dict]:
+    for row in csv.DictReader(handle):
+        record = {}
+        for key, value in row.items():
+            if value == "":
+                record[key] = None
+            elif key in JSON_CSV_FIELDS:
+                record[key] = json.loads(value)
+            else:
+                record[key] = value
+        yield record
+
+
+def iter_records(path: Path, fmt: str) -> Iterator[Dict]:
+    """Yield raw job records of a feed one at a time"""
+    with open(path, newline="" if fmt == "csv" else None, encoding="utf-8") as handle:
+        if fmt == "json":
+            yield from iter_json_array(handle)
+        elif fmt == "ndjson":
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from iter_csv(handle)
+
+
+def chunked(records: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_chunk(chunk: List[Dict], first_index: int) -> Tuple[List[JobCreate], List[Dict]]:
+    """Split a chunk into valid jobs and reject entries"""
+    jobs, rejects = [], []
+    for index, raw_job in enumerate(chunk, start=first_index):
+        try:
+            jobs.append(JobCreate.model_validate(raw_job))
+        except ValidationError as e:
+            rejects.append({"index": index, "error": str(e), "record": raw_job})
+    return jobs, rejects
+
+
+def _pg_text_array(values: List) -> str:
+    items = []
+    for value in values:
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        items.append(f'"{escaped}"')
+    return "{" + ",".join(items) + "}"
+
+
+def _copy(cursor, table: str, columns: Tuple[str, ...], rows: List[Tuple]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(NULL if value is None else value for value in row)
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{NULL}')",
+        buffer
+    )
+
+
+def write_chunk(source: str, jobs: List[JobCreate], embeddings: List[List[float]], records_done: int, rejected: int) -> List[int]:
+    """COPY one chunk of jobs and embeddings and advance the checkpoint, in one transaction. Returns the new job ids"""
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT now()::timestamp")
+        now = cursor.fetchone()[0].isoformat()
+
+        ids = []
+        if jobs:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence('jobs', 'id')) FROM generate_series(1, %s)",
+                (len(jobs),)
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+
+        _copy(cursor, "jobs", JOB_COLUMNS, [
+            (
+                job_id, job.title, job.description, _pg_text_array(job.experience_years), False, now,
+                job.expires_at.isoformat() if job.expires_at else None, job.salary, job.location,
+                json.dumps(job.education_required), _pg_text_array(job.skills_required),
+                job.company_name, job.company_industry, job.company_size, now, job.embedding_hash(),
+            )
+            for job_id, job in zip(ids, jobs)
+        ])
+        _copy(cursor, "job_embeddings", EMBEDDING_COLUMNS, [
+            (job_id, "[" + ",".join(map(str, embedding)) + "]", settings.EMBEDDING_MODEL, False, now, job.company_industry)
+            for job_id, job, embedding in zip(ids, jobs, embeddings)
+        ])
+
+        cursor.execute(
+            f"""
+            INSERT INTO {JobImportCheckpoint.__tablename__} (source, records_done, imported, rejected, updated_at)
+            VALUES (%s, %s, %s, %s, now())
+            ON CONFLICT (source) DO UPDATE SET
+                records_done = EXCLUDED.records_done,
+                imported = {JobImportCheckpoint.__tablename__}.imported + EXCLUDED.imported,
+                rejected = {JobImportCheckpoint.__tablename__}.rejected + EXCLUDED.rejected,
+                updated_at = now()
+            """,
+            (source, records_done, len(jobs), rejected)
+        )
+        connection.commit()
+        return ids
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def read_checkpoint(source: str) -> int:
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            f"SELECT records_done FROM {JobImportCheckpoint.__tablename__} WHERE source = %s",
+            (source,)
+        )
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    finally:
+        connection.close()
+
+
+def embed_jobs(jobs: List[JobCreate], batch_size: int) -> Tuple[List[List[float]], float]:
+    start_time = time.perf_counter()
+    embeddings = vector_store.generate_batch_embeddings(
+        [job.to_embedding_text() for job in jobs],
+        batch_size=batch_size
+    ) if jobs else []
+    return embeddings, time.perf_counter() - start_time
+
+
+def run(path: Path, fmt: str, source: str, chunk_size: int, embed_batch_size: int, rejects_path: Optional[Path], restart: bool) -> Dict:
+    create_tables()
+    # The COPY column lists include columns added by migrations
+    run_migrations()
+    skip = 0 if restart else read_checkpoint(source)
+    if skip:
+        print(f"Resuming {source} after {skip} records")
+
+    records = iter_records(path, fmt)
+    for _ in islice(records, skip):
+        pass
+
+    totals = {"records": skip, "imported": 0, "rejected": 0, "embed_seconds": 0.0}
+    rejects_file = open(rejects_path, "a", encoding="utf-8") if rejects_path else None
+    start_time = time.perf_counter()
+
+    def prepare(chunk: List[Dict], first_index: int):
+        jobs, rejects = validate_chunk(chunk, first_index)
+        embeddings, embed_seconds = embed_jobs(jobs, embed_batch_size)
+        return len(chunk), jobs, rejects, embeddings, embed_seconds
+
+    # Validation and embedding of the next chunk overlap the COPY of the current one
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = None
+            next_index = skip
+            for chunk in chunked(records, chunk_size):
+                future = executor.submit(prepare, chunk, next_index)
+                next_index += len(chunk)
+                if pending is not None:
+                    _commit(pending.result(), source, totals, rejects_file, start_time)
+                pending = future
+            if pending is not None:
+                _commit(pending.result(), source, totals, rejects_file, start_time)
+    finally:
+        if rejects_file:
+            rejects_file.close()
+
+    elapsed = time.perf_counter() - start_time
+    return {
+        "source": source,
+        "records": totals["records"],
+        "imported": totals["imported"],
+        "rejected": totals["rejected"],
+        "elapsed_s": elapsed,
+        "rows_per_s": totals["imported"] / elapsed if elapsed else 0.0,
+        "embeddings_per_s": totals["imported"] / totals["embed_seconds"] if totals["embed_seconds"] else 0.0,
+    }
+
+
+def _commit(prepared, source: str, totals: Dict, rejects_file, start_time: float):
+    count, jobs, rejects, embeddings, embed_seconds = prepared
+    totals["records"] += count
+    write_chunk(source, jobs, embeddings, totals["records"], len(rejects))
+
+    totals["imported"] += len(jobs)
+    totals["rejected"] += len(rejects)
+    totals["embed_seconds"] += embed_seconds
+    if rejects_file:
+        for reject in rejects:
+            rejects_file.write(json.dumps(reject, default=str) + "\n")
+
+    elapsed = time.perf_counter() - start_time
+    print(
+        f"{totals['records']:>10} records  {totals['imported']:>10} imported  {totals['rejected']:>6} rejected  "
+        f"{totals['imported'] / elapsed:>9.1f} rows/s  "
+        f"{len(jobs) / embed_seconds if embed_seconds else 0.0:>9.1f} embeddings/s"
+    )
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("path", type=Path)
+    argument_parser.add_argument("--format", choices=FORMATS)
+    argument_parser.add_argument("--source", help="Checkpoint key, defaults to the absolute path")
+    argument_parser.add_argument("--chunk-size", type=int, default=2000)
+    argument_parser.add_argument("--embed-batch-size", type=int, default=settings.EMBEDDING_BATCH_SIZE)
+    argument_parser.add_argument("--rejects", type=Path, help="Append invalid records to this NDJSON file")
+    argument_parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and import from the start")
+    args = argument_parser.parse_args()
+
+    report = run(
+        args.path,
+        args.format or detect_format(args.path),
+        args.source or str(args.path.resolve()),
+        args.chunk_size,
+        args.embed_batch_size,
+        args.rejects,
+        args.restart,
+    )
+    for key, value in report.items():
+        print(f"{key:20} {value:.3f}" if isinstance(value, float) else f"{key:20} {value}")
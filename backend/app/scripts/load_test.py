@@ -0,0 +1,257 @@
+"""
+Load test the API with a weighted mix of logins, CV uploads, job listings and
+recommendations.
+
+A user is registered for the run. Workers then pick operations at random with
+the --mix weights until --duration has passed or --requests are sent. The
+uploads send the sample PDFs, and the recommendations ask for CVs already in
+the database or uploaded during the run. The report has throughput, error
+rate and latency percentiles per endpoint.
+
+To stay offline, point the test at a server started with the fake LLM and,
+optionally, the hashing embedder. --start-server does that against the local
+database:
+
+    python -m app.scripts.load_test --start-server --concurrency 16 --duration 60 \\
+        --mix login=1,upload=1,jobs=4,recommendations=4
+
+or start it yourself and pass --base-url:
+
+    LLM_PROVIDER=fake FAKE_LLM_SAMPLES_PATH=../sample_data/extracted_data.json \\
+        FAKE_LLM_LATENCY_MEDIAN_MS=800 uvicorn app.main:app --port 8000
+    python -m app.scripts.load_test --base-url http://localhost:8000 --upload-mode async
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from app.core.config import settings
+
+OPERATIONS = ("login", "upload", "jobs", "recommendations")
+OFFLINE_ENV = {
+    "LLM_PROVIDER": "fake",
+    "FAKE_LLM_SAMPLES_PATH": "../sample_data/extracted_data.json",
+    "FAKE_LLM_LATENCY_MEDIAN_MS": "800",
+    "FAKE_LLM_ERROR_RATE": "0.0",
+}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name}. Expected one of {OPERATIONS}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+class LoadTest:
+    """Shared state of one run: client, credentials, CV ids and results"""
+
+    def __init__(self, client: httpx.AsyncClient, pdfs: List[Path], upload_mode: str, page_size: int, top_k: int):
+        self.client = client
+        self.api = settings.API_PREFIX
+        self.pdfs = [(pdf.name, pdf.read_bytes()) for pdf in pdfs]
+        self.upload_mode = upload_mode
+        self.page_size = page_size
+        self.top_k = top_k
+        self.cv_ids: List[int] = []
+        self.results: Dict[str, List] = {operation: [] for operation in OPERATIONS}
+
+    async def setup(self):
+        run_id = uuid.uuid4().hex[:12]
+        self.credentials = {"email": f"load-{run_id}@example.com", "password": f"load-{run_id}"}
+        response = await self.client.post(f"{self.api}/auth/register", json={**self.credentials, "username": f"load-{run_id}"})
+        response.raise_for_status()
+        await self._login()
+
+        response = await self.client.get(f"{self.api}/cvs/", params={"fields": "id", "limit": 500}, headers=self.headers)
+        response.raise_for_status()
+        self.cv_ids = [cv["id"] for cv in response.json()]
+
+    async def _login(self):
+        response = await self.client.post(f"{self.api}/auth/login", json=self.credentials)
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def login(self) -> httpx.Response:
+        response = await self.client.post(f"{self.api}/auth/login", json=self.credentials)
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+    async def upload(self) -> httpx.Response:
+        filename, pdf_bytes = random.choice(self.pdfs)
+        return await self.client.post(
+            f"{self.api}/cvs/upload",
+            params={"mode": self.upload_mode},
+            # A fresh key so repeated sample files are processed again
+            headers={**self.headers, "Idempotency-Key": uuid.uuid4().hex},
+            files={"file": (filename, pdf_bytes, "application/pdf")},
+        )
+
+    async def jobs(self) -> httpx.Response:
+        return await self.client.get(f"{self.api}/jobs/", params={"limit": self.page_size}, headers=self.headers)
+
+    async def recommendations(self) -> Optional[httpx.Response]:
+        if not self.cv_ids:
+            return None
+        return await self.client.get(
+            f"{self.api}/recommendations/{random.choice(self.cv_ids)}",
+            params={"top_k": self.top_k},
+            headers=self.headers,
+        )
+
+    async def refresh_cv_ids(self):
+        """Pick up CVs created by sync uploads"""
+        response = await self.client.get(f"{self.api}/cvs/", params={"fields": "id", "limit": 500}, headers=self.headers)
+        if response.status_code == 200:
+            self.cv_ids = [cv["id"] for cv in response.json()] or self.cv_ids
+
+    async def worker(self, operations: List[str], weights: List[float], deadline: float, budget: Optional[List[int]]):
+        while time.perf_counter() < deadline:
+            if budget is not None:
+                if budget[0] <= 0:
+                    return
+                budget[0] -= 1
+            operation = random.choices(operations, weights)[0]
+            start_time = time.perf_counter()
+            try:
+                response = await getattr(self, operation)()
+                if response is None:
+                    continue
+                ok = response.status_code < 400
+                status = response.status_code
+            except httpx.HTTPError as e:
+                ok, status = False, type(e).__name__
+            self.results[operation].append((time.perf_counter() - start_time, ok, status))
+            if operation == "upload" and ok and self.upload_mode == "sync":
+                await self.refresh_cv_ids()
+
+
+def summarize(results: Dict[str, List], elapsed: float) -> Dict[str, Dict]:
+    report = {}
+    for operation, samples in results.items():
+        if not samples:
+            continue
+        latencies = np.asarray([latency for latency, _, _ in samples]) * 1000
+        errors = [status for _, ok, status in samples if not ok]
+        report[operation] = {
+            "requests": len(samples),
+            "throughput_rps": len(samples) / elapsed,
+            "error_rate": len(errors) / len(samples),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+            "max_ms": float(latencies.max()),
+            "errors": {str(status): errors.count(status) for status in set(errors)},
+        }
+    return report
+
+
+async def run(base_url: str, pdfs: List[Path], mix: Dict[str, float], concurrency: int, duration: float, requests: Optional[int], upload_mode: str, page_size: int, top_k: int, timeout: float) -> Dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        load_test = LoadTest(client, pdfs, upload_mode, page_size, top_k)
+        await load_test.setup()
+
+        operations, weights = list(mix), list(mix.values())
+        budget = [requests] if requests else None
+        start_time = time.perf_counter()
+        await asyncio.gather(*(
+            load_test.worker(operations, weights, start_time + duration, budget)
+            for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - start_time
+
+    total = sum(len(samples) for samples in load_test.results.values())
+    return {
+        "base_url": base_url,
+        "concurrency": concurrency,
+        "upload_mode": upload_mode,
+        "elapsed_s": elapsed,
+        "requests": total,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "endpoints": summarize(load_test.results, elapsed),
+    }
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """Start the API with the fake LLM and wait until it answers"""
+    env = {**os.environ, **{key: os.environ.get(key, value) for key, value in OFFLINE_ENV.items()}}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/docs", timeout=1).raise_for_status()
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError("Server did not start within 120 seconds")
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    argument_parser.add_argument("--start-server", action="store_true", help="Start an offline server on --port for the run")
+    argument_parser.add_argument("--port", type=int, default=8765)
+    argument_parser.add_argument("--pdf-dir", type=Path, default=Path("../sample_data"))
+    argument_parser.add_argument("--mix", default="login=1,upload=1,jobs=4,recommendations=4")
+    argument_parser.add_argument("--concurrency", type=int, default=8)
+    argument_parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    argument_parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    argument_parser.add_argument("--upload-mode", choices=("sync", "async"), default="sync")
+    argument_parser.add_argument("--page-size", type=int, default=50)
+    argument_parser.add_argument("--top-k", type=int, default=10)
+    argument_parser.add_argument("--timeout", type=float, default=120)
+    argument_parser.add_argument("--output", type=Path, help="Also write the report to this JSON file")
+    args = argument_parser.parse_args()
+
+    server = start_server(args.port) if args.start_server else None
+    try:
+        report = asyncio.run(run(
+            f"http://127.0.0.1:{args.port}" if server else args.base_url,
+            sorted(args.pdf_dir.glob("*.pdf")),
+            parse_mix(args.mix),
+            args.concurrency,
+            args.duration,
+            args.requests,
+            args.upload_mode,
+            args.page_size,
+            args.top_k,
+            args.timeout,
+        ))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    print(f"{report['requests']} requests in {report['elapsed_s']:.1f}s ({report['throughput_rps']:.1f} req/s), concurrency {report['concurrency']}")
+    print(f"{'endpoint':16} {'requests':>9} {'req/s':>8} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for operation, stats in report["endpoints"].items():
+        print(
+            f"{operation:16} {stats['requests']:>9} {stats['throughput_rps']:>8.1f} {stats['error_rate']:>7.1%} "
+            f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f}"
+        )
+        if stats["errors"]:
+            print(f"{'':16} errors: {stats['errors']}")
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
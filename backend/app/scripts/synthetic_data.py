@@ -0,0 +1,135 @@
+"""
+Generate synthetic jobs and CVs seeded from sample_data.
+
+Jobs are variations of sample_job_data.json (seniority, skills drawn from the
+same industry, experience, salary, location, company) and CVs variations of
+extracted_data.json, re-targeted at a job industry so every CV category has
+jobs to match. The same seed always produces the same records. Jobs validate
+as JobCreate and CVs as CVData.
+
+Usage (from backend/):
+    python -m app.scripts.synthetic_data --jobs 10000 --cvs 100 --out-dir /tmp/synthetic
+    python -m app.scripts.import_jobs /tmp/synthetic/jobs.ndjson
+"""
+import argparse
+import json
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from app.schemas.cvs import CVData
+from app.schemas.jobs import JobCreate
+
+# Relative to backend/, like the other scripts' defaults
+SAMPLE_DATA_DIR = Path("../sample_data")
+
+SENIORITY = (
+    ("Junior", (0, 2)),
+    ("", (2, 5)),
+    ("Senior", (5, 10)),
+    ("Lead", (8, 15)),
+)
+LOCATIONS = (
+    "New York, NY", "San Francisco, CA", "Chicago, IL", "Austin, TX", "Seattle, WA",
+    "Boston, MA", "Denver, CO", "Atlanta, GA", "Remote", "Los Angeles, CA",
+)
+COMPANY_WORDS = ("Apex", "Blue", "Summit", "Nova", "Vertex", "Harbor", "Pioneer", "Quantum", "Cedar", "Bright")
+COMPANY_SUFFIXES = ("Labs", "Group", "Systems", "Partners", "Solutions", "Works")
+COMPANY_SIZES = ("1-50 employees", "50-200 employees", "200-1000 employees", "1000+ employees")
+FIRST_NAMES = ("Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn")
+LAST_NAMES = ("Smith", "Garcia", "Chen", "Patel", "Kim", "Nguyen", "Brown", "Lopez", "Okafor", "Novak")
+
+
+class SyntheticData:
+    """Seeded generator of synthetic jobs and CVs"""
+
+    def __init__(self, seed: int = 42, sample_dir: Path = SAMPLE_DATA_DIR):
+        self.seed = seed
+        self.job_templates = json.loads((sample_dir / "sample_job_data.json").read_text())
+        self.cv_templates = json.loads((sample_dir / "extracted_data.json").read_text())
+        self.industries = sorted({job["company_industry"] for job in self.job_templates})
+
+        self.industry_skills: Dict[str, List[str]] = defaultdict(list)
+        for job in self.job_templates:
+            for skill in job["skills_required"]:
+                if skill not in self.industry_skills[job["company_industry"]]:
+                    self.industry_skills[job["company_industry"]].append(skill)
+        for cv in self.cv_templates:
+            for skill in cv.get("skills") or []:
+                if cv.get("category") in self.industry_skills and skill not in self.industry_skills[cv["category"]]:
+                    self.industry_skills[cv["category"]].append(skill)
+
+    def jobs(self, count: int) -> Iterator[Dict]:
+        """Yield count job records"""
+        rng = random.Random(f"{self.seed}:jobs")
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        for index in range(count):
+            template = rng.choice(self.job_templates)
+            industry = template["company_industry"]
+            level, (min_years, max_years) = rng.choice(SENIORITY)
+            pool = self.industry_skills[industry]
+            skills = rng.sample(pool, k=min(len(pool), rng.randint(3, 8)))
+            yield {
+                "title": f"{level} {template['title']}".strip(),
+                "description": template["description"],
+                "experience_years": [min_years, max_years],
+                "education_required": dict(template["education_required"]),
+                "expires_at": (now + timedelta(days=rng.randint(7, 120))).isoformat(),
+                "salary": round(template["salary"] * rng.uniform(0.8, 1.4) * (1 + 0.1 * min_years), -2) if template.get("salary") else None,
+                "location": rng.choice(LOCATIONS),
+                "skills_required": skills,
+                "company_name": f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} {index % 997}",
+                "company_industry": industry,
+                "company_size": rng.choice(COMPANY_SIZES),
+            }
+
+    def cvs(self, count: int) -> Iterator[Dict]:
+        """Yield count CV records"""
+        rng = random.Random(f"{self.seed}:cvs")
+        for index in range(count):
+            template = rng.choice(self.cv_templates)
+            category = rng.choice(self.industries)
+            pool = self.industry_skills[category]
+            skills = rng.sample(pool, k=min(len(pool), rng.randint(3, 10)))
+            skills += [skill for skill in rng.sample(template.get("skills") or [], k=min(3, len(template.get("skills") or []))) if skill not in skills]
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield {
+                "name": f"{first_name} {last_name}",
+                "email": f"{first_name.lower()}.{last_name.lower()}.{index}@example.com",
+                "phone": f"555-{index // 10000 % 1000:03d}-{index % 10000:04d}",
+                "location": template.get("location"),
+                "summary": template.get("summary"),
+                "work": template.get("work") or [],
+                "education": template.get("education") or [],
+                "skills": skills,
+                "languages": template.get("languages") or [],
+                "certifications": template.get("certifications") or [],
+                "category": category,
+            }
+
+
+def write_ndjson(path: Path, records: Iterator[Dict], schema) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as handle:
+        for record in records:
+            schema.model_validate(record)
+            handle.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--jobs", type=int, default=1000)
+    argument_parser.add_argument("--cvs", type=int, default=100)
+    argument_parser.add_argument("--seed", type=int, default=42)
+    argument_parser.add_argument("--out-dir", type=Path, default=Path("."))
+    argument_parser.add_argument("--sample-dir", type=Path, default=SAMPLE_DATA_DIR)
+    args = argument_parser.parse_args()
+
+    data = SyntheticData(args.seed, args.sample_dir)
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    print("jobs", write_ndjson(args.out_dir / "jobs.ndjson", data.jobs(args.jobs), JobCreate))
+    print("cvs ", write_ndjson(args.out_dir / "cvs.ndjson", data.cvs(args.cvs), CVData))
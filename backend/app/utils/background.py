@@ -0,0 +1,58 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class PeriodicTask(ABC):
+    """
+    Base class for background loops running on a daemon thread.
+
+    Subclasses implement tick(), which runs every interval seconds or as soon
+    as notify() is called. Errors are printed and the loop keeps going.
+    """
+
+    name = "periodic-task"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    @abstractmethod
+    def tick(self):
+        """One round of the loop's work"""
+
+    def start(self):
+        """Start the background thread (again, if it died, e.g. after a fork); a no-op while it runs"""
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Signal the loop to stop and wait for the current tick"""
+        self._stop.set()
+        self._wakeup.set()
+        with self._thread_lock:
+            if self._thread is not None:
+                self._thread.join(timeout)
+                self._thread = None
+
+    def notify(self):
+        """Run the next tick now instead of after the interval"""
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"{self.name} error: {e}")
@@ -0,0 +1,11 @@
+from hashlib import sha256
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so layout-only differences hash the same"""
+    return " ".join(text.split())
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 hex digest of the normalized text"""
+    return sha256(normalize_text(text).encode("utf-8")).hexdigest()
@@ -1,16 +1,117 @@
+import queue
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.database.db import SessionLocal
 from app.models.system_logs import SystemLog
+from app.utils.background import PeriodicTask
+
+
+class SystemLogWriter(PeriodicTask):
+    """
+    Buffers system_logs rows and inserts them in batches on its own session.
+
+    Entries are flushed when batch_size are queued or every flush_interval
+    seconds. The queue is bounded: when it is full new entries are dropped
+    and counted instead of blocking the request. The thread is started once
+    per process, at startup and after a fork (app.core.prefork).
+    """
+
+    name = "system-log-writer"
+
+    def __init__(self, max_queue_size: int, batch_size: int, flush_interval: float):
+        super().__init__(flush_interval)
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=max_queue_size)
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self._counters_lock = threading.Lock()
+
+    def submit(self, entry: Dict):
+        """Queue one log row without blocking"""
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._counters_lock:
+                self.dropped += 1
+            return
+        if self._queue.qsize() >= self.batch_size:
+            self.notify()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the background thread and write what is still queued"""
+        super().stop(timeout)
+        self.flush()
+
+    def tick(self):
+        self.flush()
+
+    def _take_batch(self) -> List[Dict]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self):
+        """Write all queued entries, one batch per transaction"""
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            db = SessionLocal()
+            try:
+                db.execute(insert(SystemLog), batch)
+                db.commit()
+                with self._counters_lock:
+                    self.written += len(batch)
+            except Exception as e:
+                db.rollback()
+                with self._counters_lock:
+                    self.failed += len(batch)
+                print(f"System log flush error: {e}")
+            finally:
+                db.close()
+
+    def stats(self) -> Dict:
+        with self._counters_lock:
+            return {
+                "queued": self._queue.qsize(),
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+            }
+
+
+log_writer = SystemLogWriter(settings.LOG_QUEUE_MAX_SIZE, settings.LOG_BATCH_SIZE, settings.LOG_FLUSH_INTERVAL_SECONDS)
+
+
+def create_log(db: Optional[Session], log_name: str, log_type: str, function_name: str, description: str = None, time_taken: float = None):
+    """
+    Create log of a task.
+
+    The row is queued for the background writer, so the caller's session is
+    not used (db is kept for existing callers).
+    """
+    log_writer.submit({
+        "log_name": log_name,
+        "log_type": log_type,
+        "function_name": function_name,
+        "description": description,
+        "time_taken": time_taken,
+        "created_at": datetime.now(timezone.utc),
+    })
 
 
-def create_log(db: Session, log_name: str, log_type: str, function_name: str, description: str = None, time_taken: float = None):
-    """Create log of a task"""
-    log = SystemLog(
-        log_name=log_name,
-        log_type=log_type,
-        function_name=function_name,
-        description=description,
-        time_taken=time_taken,
-    )
-    db.add(log)
-    db.commit()
+async def acreate_log(db: Optional[AsyncSession], log_name: str, log_type: str, function_name: str, description: str = None, time_taken: float = None):
+    """Create log of a task from an async route"""
+    create_log(db, log_name, log_type, function_name, description, time_taken)
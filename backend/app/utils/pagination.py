@@ -0,0 +1,75 @@
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, tuple_
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing after the row with the given sort key"""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str], required: Sequence[str] = ("id", "created_at")) -> Optional[List[str]]:
+    """
+    Parse a comma separated fields= projection.
+
+    The sort key columns are always included so the next cursor can be built.
+    Returns None when no projection was requested; raises ValueError for
+    unknown fields.
+    """
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys([*required, *requested]))
+
+
+def keyset_select(stmt: Select, model, cursor: Optional[str], limit: int) -> Select:
+    """
+    Restrict a select to one page ordered newest first on (created_at, id).
+
+    Rows after the cursor are selected with a row comparison, which the
+    (created_at, id) index serves directly instead of scanning and skipping
+    an offset. One extra row is fetched to tell whether a next page exists.
+
+    Args:
+        stmt: Filtered select of model rows or a column projection
+        model: Mapped class with created_at and id columns
+        cursor: Cursor from the previous page, None for the first page
+        limit: Page size
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def split_page(rows: List[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Split the result of keyset_select into the page and the next cursor.
+
+    Returns:
+        Tuple of the rows and the cursor of the next page (None on the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def rows_to_dicts(rows: List[Any]) -> List[Dict[str, Any]]:
+    """Convert projected result rows to plain dicts"""
+    return [dict(row._mapping) for row in rows]
@@ -0,0 +1,50 @@
+"""
+Gunicorn config: load the app once in the master, then fork uvicorn workers.
+
+The embedding model is loaded by the preload, so all workers share one copy
+of its weights instead of loading one each (as uvicorn --workers does), and
+every worker gets an equal share of the cores for torch.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+WEB_CONCURRENCY sets the number of workers (default 2) and BIND the address.
+Metrics of all workers are aggregated through the files in
+PROMETHEUS_MULTIPROC_DIR. Nothing may run the model in the master before the
+fork: torch's thread pools do not survive it.
+"""
+import os
+import shutil
+
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "uvicorn_worker.UvicornWorker"
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+preload_app = True
+timeout = 120
+graceful_timeout = 30
+
+# Read by the app's settings and prometheus_client, so they must be set
+# before the preload imports them
+os.environ.setdefault("EMBEDDING_THREADS", str(max(1, (os.cpu_count() or 1) // workers)))
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/cvjm-prometheus")
+# Files of a previous run would be counted as live workers
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+
+def when_ready(server):
+    from app.core.prefork import freeze_heap
+
+    freeze_heap()
+
+
+def post_fork(server, worker):
+    from app.core.prefork import after_fork
+
+    after_fork()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)